@@ -1,10 +1,19 @@
 from __future__ import annotations
 
 import re
-from collections import Counter
-
+import threading
+import time
+from collections import Counter, OrderedDict
+from dataclasses import dataclass, field, replace
+from types import MappingProxyType
+from typing import Any, Iterable, Mapping
+
+from . import tfidf_model
 from .roles import ROLES, RoleRequirements
 from .job_market_api import job_market_api
+from .skill_matcher import AliasMatcher, FuzzyIndex
+from .timing import stage, timed
+from .title_index import classify_title
 
 
 _STOPWORDS = {
@@ -48,60 +57,30 @@ _STOPWORDS = {
 }
 
 
+# Extra skills for titles outside ROLES, by title_index area. The specific
+# families (sales executive, UX designer, ...) have no entry and get a
+# title-only description.
+_AREA_SKILLS: dict[str, list[str]] = {
+    "analyst": ["sql", "excel", "python", "statistics", "power bi", "tableau", "data visualization"],
+    "frontend": ["javascript", "react", "html", "css", "typescript", "rest"],
+    "backend": ["python", "sql", "rest", "docker", "aws", "git"],
+    "full_stack": ["javascript", "react", "node", "python", "sql", "rest", "git"],
+    "sales": ["salesforce", "crm", "negotiation", "communication", "prospecting", "closing", "pipeline management", "salesforce automation", "microsoft office", "powerpoint"],
+    "marketing": ["seo", "sem", "content marketing", "social media", "analytics", "campaigns", "branding", "copywriting", "google analytics"],
+    "product": ["product roadmap", "agile", "scrum", "user stories", "prioritization", "market research", "jira", "confluence"],
+    "project": ["project planning", "risk management", "stakeholder management", "budgeting", "timeline", "ms project", "asana", "trello"],
+    "hr": ["recruiting", "onboarding", "performance management", "hris", "payroll", "benefits administration", "labor law"],
+    "designer": ["figma", "sketch", "adobe xd", "prototyping", "wireframing", "usability testing", "design systems"],
+}
+_DEFAULT_SKILLS = ["python", "javascript", "git", "sql", "rest"]
+
+
 def job_description_from_title(job_title: str) -> str:
     t = (job_title or "").strip().lower()
     if not t:
         return ""
 
-    slug: str | None = None
-    
-    # AI & Machine Learning roles
-    if "ai" in t and ("engineer" in t or "developer" in t):
-        slug = "ai_engineer"
-    elif "machine learning" in t or "ml" in t:
-        slug = "machine_learning_engineer"
-    elif "data scientist" in t or "data science" in t:
-        slug = "data_scientist"
-    
-    # Cloud & DevOps roles
-    elif "devops" in t:
-        slug = "devops_engineer"
-    elif "cloud architect" in t or "cloud" in t and "architect" in t:
-        slug = "cloud_architect"
-    elif "site reliability" in t or "sre" in t:
-        slug = "site_reliability_engineer"
-    
-    # Cybersecurity roles
-    elif "cybersecurity" in t or "cyber security" in t:
-        slug = "cybersecurity_analyst"
-    elif "security engineer" in t or "security" in t and "engineer" in t:
-        slug = "security_engineer"
-    
-    # Data Engineering roles
-    elif "data engineer" in t or "data" in t and "engineer" in t:
-        slug = "data_engineer"
-    
-    # Frontend Development roles
-    elif "frontend" in t and ("engineer" in t or "developer" in t):
-        slug = "frontend_engineer"
-    
-    # Backend Development roles
-    elif "backend" in t and ("engineer" in t or "developer" in t):
-        slug = "backend_engineer"
-    
-    # Product & Project Management roles
-    elif "product manager" in t or "product" in t and "manager" in t:
-        slug = "product_manager"
-    
-    # Original roles (keep for backward compatibility)
-    elif "data" in t and "analyst" in t:
-        slug = "data_analyst"
-    elif "web" in t and "developer" in t:
-        slug = "web_developer"
-    elif "software" in t and ("developer" in t or "engineer" in t):
-        slug = "software_developer"
-    elif "developer" in t or "engineer" in t:
-        slug = "software_developer"
+    slug = classify_title(t).slug
 
     role = ROLES.get(slug) if slug else None
     if role:
@@ -116,55 +95,7 @@ def job_description_from_title(job_title: str) -> str:
         )
 
     # Fallback for unmatched titles - generate generic description
-    extra_skills: list[str] = []
-    if "data" in t and "analyst" in t:
-        slug = "data_analyst"
-    elif "web" in t and "developer" in t:
-        slug = "web_developer"
-    elif "software" in t and ("developer" in t or "engineer" in t):
-        slug = "software_developer"
-    elif "developer" in t or "engineer" in t:
-        slug = "software_developer"
-    elif "sales" in t and ("executive" in t or "manager" in t or "representative" in t):
-        slug = "sales_executive"
-    elif "marketing" in t and ("manager" in t or "specialist" in t or "coordinator" in t):
-        slug = "marketing_manager"
-    elif "product" in t and ("manager" in t or "owner" in t):
-        slug = "product_manager"
-    elif "project" in t and ("manager" in t or "coordinator" in t):
-        slug = "project_manager"
-    elif "human" in t and ("resources" in t or "hr" in t):
-        slug = "hr_manager"
-    elif "consultant" in t or "advisor" in t:
-        slug = "consultant"
-    elif "designer" in t and ("ux" in t or "ui" in t):
-        slug = "designer"
-    elif "analyst" in t:
-        extra_skills = ["sql", "excel", "python", "statistics", "power bi", "tableau", "data visualization"]
-    elif "frontend" in t or "front-end" in t or "react" in t:
-        extra_skills = ["javascript", "react", "html", "css", "typescript", "rest"]
-    elif "backend" in t or "back-end" in t:
-        extra_skills = ["python", "sql", "rest", "docker", "aws", "git"]
-    elif "full" in t and "stack" in t:
-        extra_skills = ["javascript", "react", "node", "python", "sql", "rest", "git"]
-    elif "developer" in t or "engineer" in t:
-        extra_skills = ["python", "javascript", "git", "sql", "rest"]
-    elif "sales" in t:
-        extra_skills = ["salesforce", "crm", "negotiation", "communication", "prospecting", "closing", "pipeline management", "salesforce automation", "microsoft office", "powerpoint"]
-    elif "marketing" in t:
-        extra_skills = ["seo", "sem", "content marketing", "social media", "analytics", "campaigns", "branding", "copywriting", "google analytics"]
-    elif "product" in t:
-        extra_skills = ["product roadmap", "agile", "scrum", "user stories", "prioritization", "market research", "jira", "confluence"]
-    elif "project" in t:
-        extra_skills = ["project planning", "risk management", "stakeholder management", "budgeting", "timeline", "ms project", "asana", "trello"]
-    elif "human" in t or "hr" in t:
-        extra_skills = ["recruiting", "onboarding", "performance management", "hris", "payroll", "benefits administration", "labor law"]
-    elif "consultant" in t:
-        extra_skills = ["problem solving", "stakeholder management", "presentation", "excel", "powerpoint", "reporting", "data analysis"]
-    elif "designer" in t:
-        extra_skills = ["figma", "sketch", "adobe xd", "prototyping", "wireframing", "usability testing", "design systems"]
-    else:
-        extra_skills = ["python", "javascript", "git", "sql", "rest"]
+    extra_skills = _AREA_SKILLS.get(slug, []) if slug else _DEFAULT_SKILLS
 
     title_tokens = _tokenize(job_title)
     title_line = " ".join(title_tokens) if title_tokens else job_title.strip()
@@ -242,13 +173,115 @@ _SKILL_ALIASES: dict[str, set[str]] = {
 }
 
 
+# common technology tokens (keep lightweight and dependency-free)
+_KNOWN_SKILLS = {
+    "python",
+    "java",
+    "javascript",
+    "typescript",
+    "react",
+    "node",
+    "node.js",
+    "next.js",
+    "sql",
+    "excel",
+    "power bi",
+    "tableau",
+    "pandas",
+    "numpy",
+    "docker",
+    "kubernetes",
+    "aws",
+    "git",
+    "rest",
+    "rest api",
+    "linux",
+    "flask",
+    "fastapi",
+    "django",
+    "html",
+    "css",
+    "tailwind",
+}
+
+_KNOWN_TECH = {
+    "python", "java", "javascript", "typescript", "react", "node", "node.js", "next.js", "sql", "excel",
+    "power bi", "tableau", "pandas", "numpy", "docker", "kubernetes", "aws", "gcp", "azure", "git",
+    "rest", "rest api", "graphql", "flask", "fastapi", "django", "html", "css", "tailwind", "sass",
+    "mongodb", "postgresql", "mysql", "redis", "elasticsearch", "ci/cd", "jenkins", "github actions",
+    "terraform", "ansible", "linux", "ubuntu", "windows", "macos", "bash", "powershell", "shell"
+}
+
+
+def _skill_vocabulary() -> set[str]:
+    vocab: set[str] = set(_KNOWN_SKILLS) | set(_KNOWN_TECH)
+    for role in ROLES.values():
+        vocab |= role.required_skills | role.preferred_skills | role.keywords
+    for skill, aliases in _SKILL_ALIASES.items():
+        vocab.add(skill)
+        vocab |= aliases
+    return vocab
+
+
+# One automaton for every skill/alias we know about; arbitrary phrases pulled
+# from a job's skills block fall back to a regex scan in _has_any_alias.
+_SKILL_MATCHER = AliasMatcher(_skill_vocabulary())
+
+# The same vocabulary, indexed for the edit-distance-1 passes of
+# _extract_skills_enhanced.
+_FUZZY_INDEX = FuzzyIndex(_skill_vocabulary())
+
+
+def _has_any_alias(skill: str, text_l: str, hits: set[str]) -> bool:
+    """True if ``skill`` or one of its aliases occurs word-bounded in ``text_l``.
+
+    ``hits`` is the result of ``_SKILL_MATCHER.find(text_l)``.
+    """
+    for alias in _SKILL_ALIASES.get(skill, {skill}):
+        if not alias:
+            continue
+        alias = alias.lower()
+        if alias in _SKILL_MATCHER:
+            if alias in hits:
+                return True
+        elif re.search(rf"\b{re.escape(alias)}\b", text_l):
+            return True
+    return False
+
+
+# Highest level first; each entry is a whole-word alternation
 _DEGREE_PATTERNS = [
-    (r"\b(phd|doctor of philosophy|doctorate)\b", "PhD"),
-    (r"\b(masters?|master of science|m\.?sc|m\.?s|m\.?tech|m\.?eng|msc|m\.?s)\b", "Master"),
-    (r"\b(bachelor|b\.?tech|b\.?e|b\.?sc|b\.?a|bsc|b\.?s)\b", "Bachelor"),
-    (r"\b(associate|a\.?a|diploma)\b", "Associate"),
+    (r"phd|doctor of philosophy|doctorate", "PhD"),
+    (r"masters?|master of science|m\.?sc|m\.?s|m\.?tech|m\.?eng|msc|m\.?s", "Master"),
+    (r"bachelor|b\.?tech|b\.?e|b\.?sc|b\.?a|bsc|b\.?s", "Bachelor"),
+    (r"associate|a\.?a|diploma", "Associate"),
 ]
 
+# Every level in one pattern, so a line is scanned once; the named group that
+# matched gives the level.
+_DEGREE_RE = re.compile(r"\b(?:" + "|".join(f"(?P<{level}>{pat})" for pat, level in _DEGREE_PATTERNS) + r")\b")
+_DEGREE_RANK = {level: rank for rank, (_, level) in enumerate(_DEGREE_PATTERNS)}
+
+_EDUCATION_LINE_RE = re.compile(
+    r"\b(bachelor|b\.?tech|b\.?e|b\.?sc|master|m\.?tech|m\.?sc|mba|phd|doctorate)\b",
+    re.IGNORECASE,
+)
+
+# A date range or "present", or a role noun
+_EXPERIENCE_LINE_RE = re.compile(
+    r"\b(20\d{2}|19\d{2})\b.*\b(20\d{2}|present|current)\b|\b(present|current)\b|"
+    r"\b(intern|engineer|developer|analyst|assistant)\b",
+    re.IGNORECASE,
+)
+
+_TABS_RE = re.compile(r"[\t\r]+")
+_BLANK_LINES_RE = re.compile(r"\n{3,}")
+_TOKEN_RE = re.compile(r"[a-zA-Z][a-zA-Z0-9.+/#-]{1,}")
+_NON_ALPHA_RE = re.compile(r"[^a-zA-Z ]")
+_SKILL_SEPARATOR_RE = re.compile(r"[,|•\u2022]\s*")
+_MULTI_SPACE_RE = re.compile(r"\s{2,}")
+_DIGITS_RE = re.compile(r"\d+")
+
 _EXPERIENCE_TENURE_RE = re.compile(
     r"\b(\d{1,2})\s*(years?|yrs?|y)\b.*\b(\d{1,2}|present|current)\s*(years?|yrs?|y)\b|"
     r"\b(\d{1,2})\s*(years?|yrs?|y)\b|"
@@ -264,21 +297,53 @@ _SECTION_WEIGHTS = {
     "projects": 0.15,
 }
 
+# How the component scores blend into the overall score
+_SCORE_WEIGHTS = {
+    "similarity": 0.45,
+    "skills": 0.30,
+    "keywords": 0.15,
+    "sections": 0.10,
+}
+
+
+def _section_score(sections_present: dict[str, bool]) -> int:
+    """Weighted section completeness, 0-100."""
+    return int(
+        round(
+            sum(
+                _SECTION_WEIGHTS.get(k, 0) * 100
+                for k, present in sections_present.items()
+                if present
+            )
+        )
+    )
+
 
 def _normalize_text(text: str) -> str:
     text = text.replace("\u00a0", " ")
-    text = re.sub(r"[\t\r]+", " ", text)
-    text = re.sub(r"\n{3,}", "\n\n", text)
+    text = _TABS_RE.sub(" ", text)
+    text = _BLANK_LINES_RE.sub("\n\n", text)
     return text.strip()
 
 
 def _tokenize(text: str) -> list[str]:
-    tokens = re.findall(r"[a-zA-Z][a-zA-Z0-9.+/#-]{1,}", text.lower())
-    return [t for t in tokens if t not in _STOPWORDS and len(t) > 2]
+    return _tokenize_lower(text.lower())
+
+
+def _tokenize_lower(text_l: str) -> list[str]:
+    return [t for t in _TOKEN_RE.findall(text_l) if t not in _STOPWORDS and len(t) > 2]
 
 
 def _split_sections(text: str) -> dict[str, str]:
-    lines = [ln.strip() for ln in text.splitlines()]
+    return _join_sections(_section_lines([ln.strip() for ln in text.splitlines()]))
+
+
+def _join_sections(section_lines: dict[str, list[str]]) -> dict[str, str]:
+    return {k: "\n".join(v).strip() for k, v in section_lines.items()}
+
+
+def _section_lines(lines: list[str]) -> dict[str, list[str]]:
+    """Group stripped lines under the heading they follow ("__all__" gets every line)."""
     sections: dict[str, list[str]] = {"__all__": []}
     current = "__all__"
 
@@ -287,7 +352,7 @@ def _split_sections(text: str) -> dict[str, str]:
             sections.setdefault(current, []).append("")
             continue
 
-        cleaned = re.sub(r"[^a-zA-Z ]", "", ln).strip().lower()
+        cleaned = _NON_ALPHA_RE.sub("", ln).strip().lower()
         if cleaned in _SECTION_HEADINGS and len(cleaned.split()) <= 3:
             current = cleaned
             sections.setdefault(current, [])
@@ -296,25 +361,83 @@ def _split_sections(text: str) -> dict[str, str]:
         sections.setdefault(current, []).append(ln)
         sections["__all__"].append(ln)
 
-    return {k: "\n".join(v).strip() for k, v in sections.items()}
+    return sections
+
+
+@dataclass(frozen=True, eq=False)
+class ResumeDocument:
+    """Normalized text split once into everything the extractors read.
+
+    ``lines`` are stripped and ``line_offsets[i]`` is where ``lines[i]``
+    starts in ``text``. ``section_lines`` holds the lines behind each entry
+    of ``sections``.
+    """
+
+    text: str
+    lower: str
+    lines: tuple[str, ...]
+    line_offsets: tuple[int, ...]
+    sections: dict[str, str]
+    section_lines: dict[str, list[str]]
+    tokens: tuple[str, ...]
+    token_counts: Counter
+
+    @classmethod
+    def parse(cls, text: str, sections: dict[str, str] | None = None) -> ResumeDocument:
+        """``sections`` may carry a cached ``_split_sections`` result for ``text``."""
+        text = _normalize_text(text)
+        lines: list[str] = []
+        offsets: list[int] = []
+        pos = 0
+        for raw in text.splitlines(keepends=True):
+            lines.append(raw.strip())
+            offsets.append(pos)
+            pos += len(raw)
+
+        if sections is None:
+            section_lines = _section_lines(lines)
+            sections = _join_sections(section_lines)
+        else:
+            section_lines = {k: v.splitlines() for k, v in sections.items()}
+
+        lower = text.lower()
+        tokens = tuple(_tokenize_lower(lower))
+        return cls(
+            text=text,
+            lower=lower,
+            lines=tuple(lines),
+            line_offsets=tuple(offsets),
+            sections=sections,
+            section_lines=section_lines,
+            tokens=tokens,
+            token_counts=Counter(tokens),
+        )
 
+    def section(self, *names: str) -> str:
+        """Text of the first non-empty section among ``names``, or ""."""
+        for name in names:
+            if self.sections.get(name):
+                return self.sections[name]
+        return ""
 
-def _extract_education(text: str) -> list[str]:
-    edu_lines: list[str] = []
-    for ln in text.splitlines():
-        for pat, _ in _DEGREE_PATTERNS:
-            if re.search(pat, ln, re.IGNORECASE):
-                edu_lines.append(ln.strip())
-                break
-    return edu_lines[:8]
+    def lines_of(self, *names: str) -> list[str] | tuple[str, ...]:
+        """Lines of the first non-empty section among ``names``, else every line."""
+        for name in names:
+            if self.sections.get(name):
+                return self.section_lines[name]
+        return self.lines
 
 
 def _detect_education_level(education_lines: list[str]) -> str:
     for ln in education_lines:
-        ln_l = ln.lower()
-        for pat, level in _DEGREE_PATTERNS:
-            if re.search(pat, ln_l):
-                return level
+        # Highest-ranked level on the first line that mentions any degree
+        best: int | None = None
+        for m in _DEGREE_RE.finditer(ln.lower()):
+            rank = _DEGREE_RANK[m.lastgroup]
+            if best is None or rank < best:
+                best = rank
+        if best is not None:
+            return _DEGREE_PATTERNS[best][1]
     return "Unknown"
 
 
@@ -363,72 +486,73 @@ def _fuzzy_match(skill: str, candidate: str) -> bool:
     return edits <= 1
 
 
-def _extract_skills_enhanced(text: str, job_skills: set[str]) -> set[str]:
-    text_l = text.lower()
+def _job_skill_index(job_skills: set[str] | frozenset[str]) -> tuple[Mapping[str, frozenset[str]], FuzzyIndex]:
+    """Map every job skill and alias back to the job skills it stands for.
+
+    Also returns a fuzzy index over the terms missing from _FUZZY_INDEX.
+    """
+    owners: dict[str, set[str]] = {}
+    for skill in job_skills:
+        owners.setdefault(skill, set()).add(skill)
+        for alias in _SKILL_ALIASES.get(skill, {skill}):
+            owners.setdefault(alias, set()).add(skill)
+    extra_index = FuzzyIndex(t for t in owners if t not in _FUZZY_INDEX).freeze()
+    return MappingProxyType({t: frozenset(s) for t, s in owners.items()}), extra_index
+
+
+def _extract_skills_enhanced(
+    doc: ResumeDocument,
+    job_skills: set[str] | frozenset[str],
+    skill_index: tuple[Mapping[str, frozenset[str]], FuzzyIndex] | None = None,
+) -> set[str]:
+    text_l = doc.lower
     found: set[str] = set()
 
     # 1) Direct/alias match for known job skills
+    hits = _SKILL_MATCHER.find(text_l)
     for skill in job_skills:
-        aliases = _SKILL_ALIASES.get(skill, {skill})
-        for alias in aliases:
-            if alias and re.search(rf"\b{re.escape(alias.lower())}\b", text_l):
-                found.add(skill)
-                break
+        if _has_any_alias(skill, text_l, hits):
+            found.add(skill)
 
     # 2) Fuzzy match for short tokens
-    tokens = _tokenize(text)
-    for token in tokens:
-        for skill in job_skills:
-            if _fuzzy_match(token, skill):
-                found.add(skill)
+    owners, extra_index = skill_index or _job_skill_index(job_skills)
+
+    tokens = doc.tokens
+    for token in doc.token_counts:
+        for cand in _FUZZY_INDEX.candidates(token) | extra_index.candidates(token):
+            if cand in job_skills and _fuzzy_match(token, cand):
+                found.add(cand)
 
     # 3) Skills section parsing (comma/pipe/bullet)
-    sections = _split_sections(text)
-    skills_block = sections.get("skills") or sections.get("technical skills") or ""
+    skills_block = doc.section("skills", "technical skills")
     if skills_block:
-        parts = re.split(r"[,|•\u2022]\s*", skills_block.lower())
-        for p in parts:
-            p = p.strip(" -–:\t").strip()
+        parts = _SKILL_SEPARATOR_RE.split(skills_block.lower())
+        for p in {p.strip(" -–:\t").strip() for p in parts}:
             if 2 <= len(p) <= 40:
-                for skill in job_skills:
-                    if _fuzzy_match(p, skill) or any(_fuzzy_match(p, a) for a in _SKILL_ALIASES.get(skill, {skill})):
-                        found.add(skill)
+                for cand in _FUZZY_INDEX.candidates(p) | extra_index.candidates(p):
+                    if cand in owners and _fuzzy_match(p, cand):
+                        found |= owners[cand]
 
     # 4) Known tech keywords fallback
-    known_tech = {
-        "python", "java", "javascript", "typescript", "react", "node", "node.js", "next.js", "sql", "excel",
-        "power bi", "tableau", "pandas", "numpy", "docker", "kubernetes", "aws", "gcp", "azure", "git",
-        "rest", "rest api", "graphql", "flask", "fastapi", "django", "html", "css", "tailwind", "sass",
-        "mongodb", "postgresql", "mysql", "redis", "elasticsearch", "ci/cd", "jenkins", "github actions",
-        "terraform", "ansible", "linux", "ubuntu", "windows", "macos", "bash", "powershell", "shell"
-    }
     for token in tokens:
-        if token in known_tech:
+        if token in _KNOWN_TECH:
             found.add(token)
 
     return {s.lower() for s in found if 2 <= len(s) <= 40}
 
 
-def _extract_education(text: str) -> list[str]:
+def _extract_education(lines: Iterable[str]) -> list[str]:
     edu_lines: list[str] = []
-    degree_re = re.compile(
-        r"\b(bachelor|b\.?tech|b\.?e|b\.?sc|master|m\.?tech|m\.?sc|mba|phd|doctorate)\b",
-        re.IGNORECASE,
-    )
-    for ln in text.splitlines():
-        if degree_re.search(ln):
+    for ln in lines:
+        if _EDUCATION_LINE_RE.search(ln):
             edu_lines.append(ln.strip())
     return edu_lines[:8]
 
 
-def _extract_experience(text: str) -> list[str]:
+def _extract_experience(lines: Iterable[str]) -> list[str]:
     exp_lines: list[str] = []
-    date_re = re.compile(
-        r"\b(20\d{2}|19\d{2})\b.*\b(20\d{2}|present|current)\b|\b(present|current)\b",
-        re.IGNORECASE,
-    )
-    for ln in text.splitlines():
-        if date_re.search(ln) or re.search(r"\b(intern|engineer|developer|analyst|assistant)\b", ln, re.I):
+    for ln in lines:
+        if _EXPERIENCE_LINE_RE.search(ln):
             exp_lines.append(ln.strip())
     # de-dup while preserving order
     seen: set[str] = set()
@@ -441,25 +565,22 @@ def _extract_experience(text: str) -> list[str]:
     return out[:10]
 
 
-def _extract_skills(text: str, role: RoleRequirements) -> set[str]:
-    text_l = text.lower()
+def _extract_skills(doc: ResumeDocument, role: RoleRequirements) -> set[str]:
+    text_l = doc.lower
     found: set[str] = set()
 
     # 1) Direct match for role skills and keywords (handles multi-word)
     candidates = set(role.required_skills) | set(role.preferred_skills) | set(role.keywords)
 
+    hits = _SKILL_MATCHER.find(text_l)
     for skill in candidates:
-        aliases = _SKILL_ALIASES.get(skill, {skill})
-        for alias in aliases:
-            if alias and re.search(rf"\b{re.escape(alias.lower())}\b", text_l):
-                found.add(skill)
-                break
+        if _has_any_alias(skill, text_l, hits):
+            found.add(skill)
 
     # 2) Heuristic: parse skills section (comma / pipe separated)
-    sections = _split_sections(text)
-    skills_block = sections.get("skills") or sections.get("technical skills") or ""
+    skills_block = doc.section("skills", "technical skills")
     if skills_block:
-        parts = re.split(r"[,|•\u2022]\s*", skills_block.lower())
+        parts = _SKILL_SEPARATOR_RE.split(skills_block.lower())
         for p in parts:
             p = p.strip(" -–:\t").strip()
             if not p:
@@ -471,21 +592,19 @@ def _extract_skills(text: str, role: RoleRequirements) -> set[str]:
     # normalize: keep only reasonable items
     cleaned: set[str] = set()
     for s in found:
-        s2 = re.sub(r"\s{2,}", " ", s.strip().lower())
+        s2 = _MULTI_SPACE_RE.sub(" ", s.strip().lower())
         if 2 <= len(s2) <= 40:
             cleaned.add(s2)
     return cleaned
 
 
-def _top_keywords(text: str, limit: int = 20) -> list[str]:
-    tokens = _tokenize(text)
-    counts = Counter(tokens)
-    common = [w for w, _ in counts.most_common(limit * 2)]
+def _top_keywords(doc: ResumeDocument, limit: int = 20) -> list[str]:
+    common = [w for w, _ in doc.token_counts.most_common(limit * 2)]
 
     # Light de-noising: drop numeric-ish tokens
     out: list[str] = []
     for w in common:
-        if re.fullmatch(r"\d+", w):
+        if _DIGITS_RE.fullmatch(w):
             continue
         if w not in out:
             out.append(w)
@@ -495,13 +614,14 @@ def _top_keywords(text: str, limit: int = 20) -> list[str]:
 
 
 def analyze_resume(text: str, role: RoleRequirements) -> dict:
-    text = _normalize_text(text)
-    sections = _split_sections(text)
+    doc = ResumeDocument.parse(text)
+    text = doc.text
+    sections = doc.sections
 
-    education = _extract_education(sections.get("education", text))
-    experience = _extract_experience(sections.get("experience") or sections.get("work experience") or text)
+    education = _extract_education(doc.section_lines.get("education", doc.lines))
+    experience = _extract_experience(doc.lines_of("experience", "work experience"))
 
-    extracted_skills = _extract_skills(text, role)
+    extracted_skills = _extract_skills(doc, role)
 
     matched_required = sorted([s for s in role.required_skills if s.lower() in extracted_skills])
     matched_preferred = sorted([s for s in role.preferred_skills if s.lower() in extracted_skills])
@@ -509,7 +629,7 @@ def analyze_resume(text: str, role: RoleRequirements) -> dict:
     missing_required = sorted([s for s in role.required_skills if s.lower() not in extracted_skills])
     missing_preferred = sorted([s for s in role.preferred_skills if s.lower() not in extracted_skills])
 
-    top_keywords = _top_keywords(text, limit=20)
+    top_keywords = _top_keywords(doc, limit=20)
     matched_role_keywords = sorted([k for k in role.keywords if k.lower() in set(top_keywords)])
 
     # Scoring
@@ -589,64 +709,31 @@ def analyze_resume(text: str, role: RoleRequirements) -> dict:
     }
 
 
-def _extract_skill_like_phrases(text: str) -> set[str]:
-    text_l = text.lower()
+def _extract_skill_like_phrases(doc: ResumeDocument) -> set[str]:
+    text_l = doc.lower
     out: set[str] = set()
 
-    # common technology tokens (keep lightweight and dependency-free)
-    known = {
-        "python",
-        "java",
-        "javascript",
-        "typescript",
-        "react",
-        "node",
-        "node.js",
-        "next.js",
-        "sql",
-        "excel",
-        "power bi",
-        "tableau",
-        "pandas",
-        "numpy",
-        "docker",
-        "kubernetes",
-        "aws",
-        "git",
-        "rest",
-        "rest api",
-        "linux",
-        "flask",
-        "fastapi",
-        "django",
-        "html",
-        "css",
-        "tailwind",
-    }
 
-    for skill in known:
-        aliases = _SKILL_ALIASES.get(skill, {skill})
-        for alias in aliases:
-            if alias and re.search(rf"\b{re.escape(alias.lower())}\b", text_l):
-                out.add(skill)
-                break
+    hits = _SKILL_MATCHER.find(text_l)
+    for skill in _KNOWN_SKILLS:
+        if _has_any_alias(skill, text_l, hits):
+            out.add(skill)
 
     # pull from explicit "skills" section, if present
-    sections = _split_sections(text)
-    skills_block = sections.get("skills") or sections.get("technical skills") or ""
+    skills_block = doc.section("skills", "technical skills")
     if skills_block:
-        parts = re.split(r"[,|•\u2022]\s*", skills_block.lower())
+        parts = _SKILL_SEPARATOR_RE.split(skills_block.lower())
         for p in parts:
             p = p.strip(" -–:\t").strip()
             if not p:
                 continue
             if 2 <= len(p) <= 40:
-                out.add(re.sub(r"\s{2,}", " ", p))
+                out.add(_MULTI_SPACE_RE.sub(" ", p))
 
     return out
 
 
-def _tfidf_similarity(a: str, b: str) -> float:
+def _tfidf_similarity(a: str, b: str, b_vector: Any = None) -> float:
     # Guard: sklearn throws on empty vocab
     a = a.strip()
     b = b.strip()
@@ -654,38 +741,152 @@ def _tfidf_similarity(a: str, b: str) -> float:
         return 0.0
 
     try:
-        from sklearn.feature_extraction.text import TfidfVectorizer
-        from sklearn.metrics.pairwise import cosine_similarity
-
-        vectorizer = TfidfVectorizer(stop_words="english", ngram_range=(1, 2), min_df=1, max_features=10000)
-        tfidf = vectorizer.fit_transform([a, b])
-        return float(cosine_similarity(tfidf[0:1], tfidf[1:2])[0][0])
+        # Pre-fitted model: only transform per request, job vectors are cached
+        sim = tfidf_model.similarity(a, b, b_vector)
+        if sim is not None:
+            return sim
     except Exception:  # noqa: BLE001
-        # Fallback: token overlap similarity (less accurate than TF-IDF, but keeps API functional)
-        ta = set(_tokenize(a))
-        tb = set(_tokenize(b))
-        if not ta or not tb:
-            return 0.0
-        return len(ta & tb) / max(1, len(ta | tb))
+        pass
 
+    # Fallback: token overlap similarity (less accurate than TF-IDF, but keeps API functional)
+    ta = set(_tokenize(a))
+    tb = set(_tokenize(b))
+    if not ta or not tb:
+        return 0.0
+    return len(ta & tb) / max(1, len(ta | tb))
+
+
+@dataclass(frozen=True, eq=False)
+class JobProfile:
+    """Everything about a job that scoring needs, computed once by ``compile_job``.
+
+    Profiles compare and hash by their title and normalized description.
+    ``compile_job`` shares them between requests, so the fields hold
+    read-only data: tuples, frozensets, a frozen ``JobMarketData`` and a
+    skill index made of a ``MappingProxyType`` and a frozen ``FuzzyIndex``.
+    The TF-IDF row is a scipy matrix shared with ``tfidf_model``'s cache and
+    must not be modified in place.
+    """
+
+    title: str
+    description: str
+    keywords: tuple[str, ...]
+    skills: frozenset[str]
+    market_data: Any
+    tfidf_vector: Any = field(repr=False)
+    skill_index: tuple[Mapping[str, frozenset[str]], FuzzyIndex] = field(repr=False)
+
+    @property
+    def key(self) -> tuple[str, str]:
+        return (self.title, self.description)
 
-def analyze_resume_against_job(resume_text: str, job_description: str, job_title: str) -> dict:
-    resume_text = _normalize_text(resume_text)
-    job_description = _normalize_text(job_description)
-    if not job_description:
-        job_description = _normalize_text(job_description_from_title(job_title))
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, JobProfile) and self.key == other.key
 
-    resume_sections = _split_sections(resume_text)
-    _ = _split_sections(job_description)
+    def __hash__(self) -> int:
+        return hash(self.key)
 
-    resume_education = _extract_education(resume_sections.get("education", resume_text))
-    resume_experience = _extract_experience(resume_sections.get("experience") or resume_sections.get("work experience") or resume_text)
 
-    resume_keywords = _top_keywords(resume_text, limit=20)
-    job_keywords = _top_keywords(job_description, limit=20)
+_PROFILE_CACHE_SIZE = 256
+_profile_cache: OrderedDict[tuple[str, str], tuple[JobProfile, float]] = OrderedDict()
+_profile_lock = threading.Lock()
+
+
+def _build_job_profile(job_title: str, job_description: str) -> JobProfile:
+    doc = ResumeDocument.parse(job_description)
+    if not doc.text:
+        doc = ResumeDocument.parse(job_description_from_title(job_title))
+    job_description = doc.text
+
+    skills = frozenset(_extract_skill_like_phrases(doc))
+    try:
+        tfidf_vector = tfidf_model.job_vector(job_description)
+    except Exception:  # noqa: BLE001
+        tfidf_vector = None
+
+    return JobProfile(
+        title=job_title,
+        description=job_description,
+        keywords=tuple(_top_keywords(doc, limit=20)),
+        skills=skills,
+        market_data=job_market_api.get_job_market_data(job_title),
+        tfidf_vector=tfidf_vector,
+        skill_index=_job_skill_index(skills),
+    )
 
-    job_skills_set = set(_extract_skill_like_phrases(job_description))
-    resume_skills_set = _extract_skills_enhanced(resume_text, job_skills_set)
+
+@timed("compile_job")
+def compile_job(job_title: str, job_description: str = "") -> JobProfile:
+    """Compile a job into a reusable ``JobProfile``.
+
+    Profiles are memoized per (title, description) for as long as the job
+    market data they carry stays fresh; market data refreshed in the
+    background in the meantime is swapped into the memoized profile.
+    """
+    key = (job_title, job_description)
+    now = time.monotonic()
+    ttl = job_market_api.cache_duration.total_seconds()
+    with _profile_lock:
+        item = _profile_cache.get(key)
+        if item is not None and now - item[1] < ttl:
+            _profile_cache.move_to_end(key)
+            profile = item[0]
+        else:
+            profile = None
+
+    if profile is not None:
+        market_data = job_market_api.get_job_market_data(job_title)
+        if market_data is profile.market_data:
+            return profile
+        profile = replace(profile, market_data=market_data)
+        with _profile_lock:
+            if key in _profile_cache:
+                _profile_cache[key] = (profile, _profile_cache[key][1])
+        return profile
+
+    profile = _build_job_profile(job_title, job_description)
+    with _profile_lock:
+        _profile_cache[key] = (profile, now)
+        _profile_cache.move_to_end(key)
+        while len(_profile_cache) > _PROFILE_CACHE_SIZE:
+            _profile_cache.popitem(last=False)
+    return profile
+
+
+def analyze_resume_against_job(
+    resume_text: str,
+    job_description: str,
+    job_title: str,
+    resume_sections: dict[str, str] | None = None,
+) -> dict:
+    """Score a resume against a job.
+
+    ``resume_sections`` may carry a cached ``_split_sections`` result for the
+    already-normalized ``resume_text``.
+    """
+    return score(resume_text, compile_job(job_title, job_description), resume_sections=resume_sections)
+
+
+def score(resume_text: str, profile: JobProfile, resume_sections: dict[str, str] | None = None) -> dict:
+    """Score a resume against a compiled ``JobProfile``."""
+    job_title = profile.title
+    job_description = profile.description
+    with stage("parse"):
+        doc = ResumeDocument.parse(resume_text, resume_sections)
+    resume_text = doc.text
+    resume_sections = doc.sections
+
+    with stage("sections"):
+        resume_education = _extract_education(doc.section_lines.get("education", doc.lines))
+        resume_experience = _extract_experience(doc.lines_of("experience", "work experience"))
+
+    with stage("keywords"):
+        resume_keywords = _top_keywords(doc, limit=20)
+    job_keywords = list(profile.keywords)
+
+    job_skills_set = profile.skills
+    with stage("skills"):
+        resume_skills_set = _extract_skills_enhanced(doc, job_skills_set, profile.skill_index)
     resume_skills = sorted(resume_skills_set)
     job_skills = sorted(job_skills_set)
 
@@ -699,7 +900,8 @@ def analyze_resume_against_job(resume_text: str, job_description: str, job_title
     missing_skills = sorted([s for s in job_skills if s.lower() not in resume_skill_set])
 
     # Scores
-    sim = _tfidf_similarity(resume_text, job_description)
+    with stage("tfidf"):
+        sim = _tfidf_similarity(resume_text, job_description, profile.tfidf_vector)
     similarity_score = int(round(max(0.0, min(1.0, sim)) * 100))
 
     kw_overlap = len(resume_kw_set & job_kw_set) / max(1, len(job_kw_set))
@@ -718,19 +920,18 @@ def analyze_resume_against_job(resume_text: str, job_description: str, job_title
         "projects": bool(resume_sections.get("projects")),
     }
 
-    # Weighted section score
-    section_score = int(
+    section_score = _section_score(sections_present)
+
+    # Overall score: blend + clamp
+    w = _SCORE_WEIGHTS
+    overall = int(
         round(
-            sum(
-                _SECTION_WEIGHTS.get(k, 0) * 100
-                for k, present in sections_present.items()
-                if present
-            )
+            similarity_score * w["similarity"]
+            + skill_score * w["skills"]
+            + keyword_score * w["keywords"]
+            + section_score * w["sections"]
         )
     )
-
-    # Overall score: blend + clamp
-    overall = int(round(similarity_score * 0.45 + skill_score * 0.30 + keyword_score * 0.15 + section_score * 0.10))
     overall = max(0, min(100, overall))
 
     suggestions: list[str] = []
@@ -780,20 +981,23 @@ def analyze_resume_against_job(resume_text: str, job_description: str, job_title
         )
 
     # Additional analytics
-    education_level = _detect_education_level(resume_education)
-    experience_years = _extract_experience_tenure(resume_text)
+    with stage("tenure"):
+        education_level = _detect_education_level(resume_education)
+        experience_years = _extract_experience_tenure(resume_text)
     
     # Get job market insights
-    market_data = job_market_api.get_job_market_data(job_title)
-    salary_insights = job_market_api.get_salary_insights(job_title, 
-        "entry" if experience_years < 2 else 
-        "junior" if experience_years < 3 else 
-        "mid" if experience_years < 6 else 
-        "senior" if experience_years < 10 else 
-        "lead")
+    market_data = profile.market_data
+    with stage("market"):
+        salary_insights = job_market_api.get_salary_insights(job_title, 
+            "entry" if experience_years < 2 else 
+            "junior" if experience_years < 3 else 
+            "mid" if experience_years < 6 else 
+            "senior" if experience_years < 10 else 
+            "lead")
 
     # Skill Gap Analysis
-    skill_gap_analysis = _calculate_skill_gap_analysis(resume_skills, job_skills, missing_skills, market_data.trending_skills)
+    with stage("skill_gap"):
+        skill_gap_analysis = _calculate_skill_gap_analysis(resume_skills, job_skills, missing_skills, market_data.trending_skills)
 
     return {
         "job_title": job_title,
@@ -0,0 +1,369 @@
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Sequence
+
+import numpy as np
+from scipy import sparse
+
+from . import tfidf_model
+from .analyzer import (
+    _FUZZY_INDEX,
+    _KNOWN_TECH,
+    _SCORE_WEIGHTS,
+    _SKILL_ALIASES,
+    _SKILL_MATCHER,
+    _SKILL_SEPARATOR_RE,
+    JobProfile,
+    ResumeDocument,
+    _extract_education,
+    _extract_experience,
+    _fuzzy_match,
+    _section_score,
+    _skill_vocabulary,
+    _tfidf_similarity,
+    _top_keywords,
+    compile_job,
+    score,
+)
+from .skill_matcher import FuzzyIndex
+
+
+def skills_block_entries(doc: ResumeDocument) -> set[str]:
+    """Entries of the resume's skills section that ``_extract_skills_enhanced`` fuzzy-matches."""
+    skills_block = doc.section("skills", "technical skills")
+    if not skills_block:
+        return set()
+    parts = _SKILL_SEPARATOR_RE.split(skills_block.lower())
+    return {p for p in {p.strip(" -–:\t").strip() for p in parts} if 2 <= len(p) <= 40}
+
+
+class SkillSpace:
+    """Column space over a set of skill terms, e.g. the global vocabulary plus a batch's job skills.
+
+    ``columns(doc)`` lists every term a resume matches the way
+    ``_extract_skills_enhanced`` would if that term were one of the job's
+    skills (alias hit, edit-distance-1 token, skills-section entry), plus
+    the known-tech tokens it mentions. That makes a resume's row independent
+    of the job, so one sparse product scores it against every job at once.
+    """
+
+    def __init__(self, terms: Iterable[str]):
+        terms = sorted(set(terms))
+        self.terms = terms
+        self.index = {t: i for i, t in enumerate(terms)}
+        # _extract_skills_enhanced only reports terms of 2-40 characters
+        self._reportable = np.array([2 <= len(t) <= 40 for t in terms])
+
+        matcher_aliases: dict[str, set[int]] = {}
+        regex_aliases: dict[str, set[int]] = {}
+        owners: dict[str, set[int]] = {}
+        for col, term in enumerate(terms):
+            owners.setdefault(term, set()).add(col)
+            for alias in _SKILL_ALIASES.get(term, {term}):
+                owners.setdefault(alias, set()).add(col)
+                if not alias:
+                    continue
+                alias = alias.lower()
+                target = matcher_aliases if alias in _SKILL_MATCHER else regex_aliases
+                target.setdefault(alias, set()).add(col)
+
+        self._matcher_aliases = matcher_aliases
+        self._regex_aliases = [
+            (alias, re.compile(rf"\b{re.escape(alias)}\b"), cols) for alias, cols in regex_aliases.items()
+        ]
+        self._owners = owners
+        self._extra_index = FuzzyIndex(t for t in owners if t not in _FUZZY_INDEX)
+        # A space of phrases outside the vocabulary never needs the shared automaton or index
+        self._vocabulary = any(t in _FUZZY_INDEX for t in owners)
+        self._lengths = {len(t) + d for t in owners for d in (-1, 0, 1)}
+
+    def __len__(self) -> int:
+        return len(self.terms)
+
+    def columns(self, doc: ResumeDocument) -> set[int]:
+        cols = self.mentions(doc.lower)
+
+        index = self.index
+        for token in doc.token_counts:
+            for cand in self._candidates(token):
+                col = index.get(cand)
+                if col is not None and _fuzzy_match(token, cand):
+                    cols.add(col)
+            if token in _KNOWN_TECH and token in index:
+                cols.add(index[token])
+
+        for p in skills_block_entries(doc):
+            for cand in self._candidates(p):
+                if cand in self._owners and _fuzzy_match(p, cand):
+                    cols |= self._owners[cand]
+
+        return {c for c in cols if self._reportable[c]}
+
+    def mentions(self, text_l: str) -> set[int]:
+        """Columns whose term or one of its aliases appears as a whole word in lowercased text."""
+        cols: set[int] = set()
+        if self._matcher_aliases:
+            for alias in _SKILL_MATCHER.find(text_l):
+                cols |= self._matcher_aliases.get(alias, set())
+        for alias, pattern, owners in self._regex_aliases:
+            if alias in text_l and pattern.search(text_l):
+                cols |= owners
+        return cols
+
+    def _candidates(self, word: str) -> set[str]:
+        if self._vocabulary:
+            return _FUZZY_INDEX.candidates(word) | self._extra_index.candidates(word)
+        # Edit distance 1 changes the length by one at most
+        if len(word) not in self._lengths:
+            return set()
+        return self._extra_index.candidates(word)
+
+    def job_row(self, profile: JobProfile) -> list[int]:
+        return sorted(self.index[s] for s in profile.skills)
+
+
+def _indicator(rows: Sequence[Iterable[int]], width: int) -> sparse.csr_matrix:
+    indptr = [0]
+    indices: list[int] = []
+    for cols in rows:
+        indices.extend(cols)
+        indptr.append(len(indices))
+    data = np.ones(len(indices), dtype=np.int32)
+    return sparse.csr_matrix((data, indices, indptr), shape=(len(rows), width))
+
+
+def percent(x: np.ndarray) -> np.ndarray:
+    """Fractions as the integer percentages ``score()`` reports."""
+    # int(round(x * 100)): np.rint rounds halves to even, like round()
+    return np.rint(x * 100).astype(np.int64)
+
+
+def section_scores(doc: ResumeDocument) -> tuple[int, int, bool]:
+    """Section score with and without the "skills" section, and whether it is present regardless of the job.
+
+    ``score()`` also counts the section as present when the resume matches
+    any of the job's skills.
+    """
+    s = doc.sections
+    present = {
+        "summary": bool(s.get("summary") or s.get("professional summary") or s.get("objective")),
+        "skills": True,
+        "education": bool(s.get("education") or _extract_education(doc.section_lines.get("education", doc.lines))),
+        "experience": bool(
+            s.get("experience")
+            or s.get("work experience")
+            or _extract_experience(doc.lines_of("experience", "work experience"))
+        ),
+        "projects": bool(s.get("projects")),
+    }
+    with_skills = _section_score(present)
+    present["skills"] = False
+    always = bool(s.get("skills") or s.get("technical skills") or not _KNOWN_TECH.isdisjoint(doc.token_counts))
+    return with_skills, _section_score(present), always
+
+
+def overall_scores(
+    similarity: np.ndarray, skills: np.ndarray, keywords: np.ndarray, sections: np.ndarray
+) -> np.ndarray:
+    """``score()``'s overall blend of integer component scores, elementwise."""
+    w = _SCORE_WEIGHTS
+    overall = np.rint(
+        similarity * w["similarity"] + skills * w["skills"] + keywords * w["keywords"] + sections * w["sections"]
+    )
+    return np.clip(overall, 0, 100).astype(np.int64)
+
+
+def top_rows(values: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the ``k`` largest values, best first; ties go to the lower index."""
+    k = min(k, len(values))
+    if k <= 0:
+        return np.zeros(0, dtype=np.int64)
+    kth = np.partition(values, len(values) - k)[len(values) - k]
+    above = np.flatnonzero(values > kth)
+    best = np.concatenate([above, np.flatnonzero(values == kth)[: k - len(above)]])
+    return best[np.lexsort((best, -values[best]))]
+
+
+@dataclass(frozen=True, eq=False)
+class ScoreMatrix:
+    """Scores of every resume (rows) against every job (columns).
+
+    Each array holds the integer score ``score()`` reports for that pair
+    under the same name; ``detail(i, j)`` runs ``score()`` for one pair.
+    """
+
+    documents: tuple[ResumeDocument, ...]
+    jobs: tuple[JobProfile, ...]
+    overall: np.ndarray
+    similarity: np.ndarray
+    skills: np.ndarray
+    keywords: np.ndarray
+    sections: np.ndarray
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        return self.overall.shape
+
+    def detail(self, resume: int, job: int) -> dict:
+        doc = self.documents[resume]
+        return score(doc.text, self.jobs[job], resume_sections=doc.sections)
+
+    def top(self, job: int, k: int = 50) -> list[tuple[int, int]]:
+        """Best ``k`` resumes for ``job`` as (row, overall score), best first."""
+        col = self.overall[:, job]
+        return [(int(i), int(col[i])) for i in top_rows(col, k)]
+
+
+def _similarities(docs: Sequence[ResumeDocument], jobs: Sequence[JobProfile]) -> np.ndarray:
+    """Cosine similarity of every resume/job pair, as ``_tfidf_similarity`` computes it."""
+    texts = [d.text.strip() for d in docs]
+    try:
+        vectorizer = tfidf_model.get_vectorizer()
+        resumes = vectorizer.transform(texts)
+        job_vectors = sparse.vstack(
+            [p.tfidf_vector if p.tfidf_vector is not None else tfidf_model.job_vector(p.description) for p in jobs]
+        ).tocsr()
+    except Exception:  # noqa: BLE001
+        resumes = job_vectors = None
+
+    if resumes is None:
+        sim = np.zeros((len(docs), len(jobs)))
+        fallback = np.ones(sim.shape, dtype=bool)
+    else:
+        sim = (resumes @ job_vectors.T).toarray()
+        # A side without known terms gets _tfidf_similarity's token-overlap fallback
+        fallback = (np.diff(resumes.indptr) == 0)[:, None] | (np.diff(job_vectors.indptr) == 0)[None, :]
+    for i, j in zip(*np.nonzero(fallback)):
+        sim[i, j] = _tfidf_similarity(texts[i], jobs[j].description, jobs[j].tfidf_vector)
+    return sim
+
+
+def score_matrix(
+    resumes: Sequence[str | ResumeDocument],
+    jobs: Sequence[JobProfile],
+    sections: Sequence[dict[str, str] | None] | None = None,
+) -> ScoreMatrix:
+    """Score every resume against every compiled job with sparse matrix products.
+
+    Resumes are parsed once and turned into a TF-IDF row, a skill-indicator
+    row over a ``SkillSpace`` and a top-keyword indicator row; each score
+    component is then one product against the matching job matrix, blended
+    with ``_SCORE_WEIGHTS``. Every entry equals what ``score()`` reports for
+    that pair. ``sections`` may carry cached ``_split_sections`` results,
+    as for ``score``.
+    """
+    docs = tuple(
+        r if isinstance(r, ResumeDocument) else ResumeDocument.parse(r, sections[i] if sections else None)
+        for i, r in enumerate(resumes)
+    )
+    jobs = tuple(jobs)
+
+    # Skills: overlap counts from one product, over each job's skill count
+    space = SkillSpace(_skill_vocabulary() | {s for p in jobs for s in p.skills})
+    resume_skills = [space.columns(d) for d in docs]
+    job_skills = _indicator([space.job_row(p) for p in jobs], len(space))
+    overlap = (_indicator(resume_skills, len(space)) @ job_skills.T).toarray()
+    skills = percent(overlap / np.maximum(1, np.diff(job_skills.indptr))[None, :])
+
+    # Keywords: only terms some job lists can count towards an overlap
+    vocab: dict[str, int] = {}
+    job_keywords = []
+    for p in jobs:
+        job_keywords.append(sorted({vocab.setdefault(k.lower(), len(vocab)) for k in p.keywords}))
+    resume_keywords = [
+        {vocab[k] for k in (w.lower() for w in _top_keywords(d, limit=20)) if k in vocab} for d in docs
+    ]
+    job_kw = _indicator(job_keywords, len(vocab))
+    kw_overlap = (_indicator(resume_keywords, len(vocab)) @ job_kw.T).toarray()
+    keywords = percent(kw_overlap / np.maximum(1, np.diff(job_kw.indptr))[None, :])
+
+    # Sections: resume-only, except that matching any job skill fills in "skills"
+    parts = [section_scores(d) for d in docs]
+    with_skills = np.array([p[0] for p in parts], dtype=np.int64)
+    without_skills = np.array([p[1] for p in parts], dtype=np.int64)
+    always_skills = np.array([p[2] for p in parts], dtype=bool)
+    section = np.where(always_skills[:, None] | (overlap > 0), with_skills[:, None], without_skills[:, None])
+
+    similarity = percent(np.clip(_similarities(docs, jobs), 0.0, 1.0))
+    overall = overall_scores(similarity, skills, keywords, section)
+
+    return ScoreMatrix(
+        documents=docs,
+        jobs=jobs,
+        overall=overall,
+        similarity=similarity,
+        skills=skills,
+        keywords=keywords,
+        sections=section,
+    )
+
+
+def load_resumes(directory: Path) -> tuple[list[str], list[str]]:
+    """File names and texts of the ``.txt`` and ``.pdf`` resumes in ``directory``; unreadable PDFs are skipped."""
+    from .pdf_text import PAGE_BUDGET, extract_many
+
+    names, texts = [], []
+    for path in sorted(directory.glob("*.txt")):
+        names.append(path.name)
+        texts.append(path.read_text(encoding="utf-8", errors="ignore"))
+    pdfs = sorted(directory.glob("*.pdf"))
+    for path, result in zip(pdfs, extract_many([str(p) for p in pdfs], budget=PAGE_BUDGET)):
+        if isinstance(result, ValueError):
+            print(f"skipping {path.name}: {result}", file=sys.stderr)
+            continue
+        names.append(path.name)
+        texts.append(result.text)
+    return names, texts
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Rank a directory of resumes against a list of jobs.")
+    parser.add_argument("--jobs", type=Path, required=True, help='JSON list of {"title": ..., "description": ...}')
+    parser.add_argument("--resumes", type=Path, required=True, help="Directory of resumes (*.pdf, *.txt)")
+    parser.add_argument("--top", type=int, default=50, help="Candidates kept per job (default: 50)")
+    parser.add_argument("--out", type=Path, help="Write the ranking here instead of stdout")
+    args = parser.parse_args()
+
+    jobs = [
+        compile_job((j.get("title") or "").strip(), (j.get("description") or "").strip())
+        for j in json.loads(args.jobs.read_text(encoding="utf-8"))
+    ]
+    names, texts = load_resumes(args.resumes)
+    matrix = score_matrix(texts, jobs)
+
+    ranking = []
+    for j, job in enumerate(jobs):
+        ranking.append(
+            {
+                "job_title": job.title,
+                "candidates": [
+                    {
+                        "resume": names[i],
+                        "overall_score": overall,
+                        "scores": {
+                            "similarity": int(matrix.similarity[i, j]),
+                            "skills": int(matrix.skills[i, j]),
+                            "keywords": int(matrix.keywords[i, j]),
+                            "sections": int(matrix.sections[i, j]),
+                        },
+                    }
+                    for i, overall in matrix.top(j, args.top)
+                ],
+            }
+        )
+
+    out = json.dumps(ranking, indent=2)
+    if args.out:
+        args.out.write_text(out, encoding="utf-8")
+    else:
+        print(out)
+
+
+if __name__ == "__main__":
+    main()
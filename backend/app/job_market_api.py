@@ -1,314 +1,638 @@
+import argparse
 import json
+import logging
+import mmap
 import requests
-from typing import Dict, List, Optional
+import requests.adapters
+import struct
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Protocol, Tuple
 from dataclasses import dataclass
-from datetime import datetime, timedelta
+from datetime import timedelta
+from pathlib import Path
 import os
 
+from .title_index import classify_title
 
-@dataclass
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
 class JobMarketData:
+    """Market data for one job title.
+
+    Instances are shared by the market cache and by compiled job profiles,
+    so the lists are stored as tuples and ``salary_range`` as a read-only
+    mapping.
+    """
+
     title: str
     demand_score: float
-    salary_range: Dict[str, int]
-    trending_skills: List[str]
+    salary_range: Mapping[str, int]
+    trending_skills: Tuple[str, ...]
     growth_rate: float
-    market_insights: List[str]
+    market_insights: Tuple[str, ...]
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "salary_range", MappingProxyType(dict(self.salary_range)))
+        object.__setattr__(self, "trending_skills", tuple(self.trending_skills))
+        object.__setattr__(self, "market_insights", tuple(self.market_insights))
+
+
+# Mock market data per title_index role slug, plus generic fallbacks.
+_MARKET_PROFILES: Dict[str, dict] = {
+    "ai_engineer": {
+        "demand_score": 9.2,
+        "salary_range": {"min": 120000, "max": 200000, "median": 160000},
+        "trending_skills": ["python", "tensorflow", "pytorch", "mlops", "kubernetes", "aws", "nlp", "computer vision"],
+        "growth_rate": 0.34,
+        "market_insights": [
+            "AI roles have seen 34% growth in the past year",
+            "High demand for ML engineers in healthcare and finance",
+            "Remote work opportunities abundant in AI field",
+            "Companies investing heavily in AI infrastructure"
+        ],
+    },
+    "machine_learning_engineer": {
+        "demand_score": 9.0,
+        "salary_range": {"min": 115000, "max": 185000, "median": 150000},
+        "trending_skills": ["python", "scikit-learn", "tensorflow", "pytorch", "spark", "airflow", "kubeflow", "mlflow"],
+        "growth_rate": 0.32,
+        "market_insights": [
+            "ML engineering roles growing 32% year-over-year",
+            "Production ML skills highly valued",
+            "AutoML and MLOps tools in high demand",
+            "Healthcare and finance sectors leading ML adoption"
+        ],
+    },
+    "data_scientist": {
+        "demand_score": 8.8,
+        "salary_range": {"min": 110000, "max": 175000, "median": 142000},
+        "trending_skills": ["python", "r", "statistics", "machine learning", "tableau", "sql", "jupyter", "pandas"],
+        "growth_rate": 0.28,
+        "market_insights": [
+            "Data science roles growing 28% annually",
+            "Statistical analysis and ML skills essential",
+            "Business acumen increasingly important",
+            "Remote data science roles widely available"
+        ],
+    },
+    "devops_engineer": {
+        "demand_score": 9.0,
+        "salary_range": {"min": 110000, "max": 180000, "median": 145000},
+        "trending_skills": ["kubernetes", "docker", "aws", "terraform", "ci/cd", "monitoring", "python", "go"],
+        "growth_rate": 0.28,
+        "market_insights": [
+            "DevOps roles growing 28% year-over-year",
+            "Kubernetes skills in highest demand",
+            "Cloud certification significantly increases salary potential",
+            "Automation skills highly valued across industries"
+        ],
+    },
+    "cloud_architect": {
+        "demand_score": 8.9,
+        "salary_range": {"min": 125000, "max": 190000, "median": 157000},
+        "trending_skills": ["aws", "azure", "gcp", "terraform", "kubernetes", "serverless", "microservices", "networking"],
+        "growth_rate": 0.30,
+        "market_insights": [
+            "Cloud architecture roles growing 30% annually",
+            "Multi-cloud expertise highly valued",
+            "Enterprise cloud migration driving demand",
+            "Security and cost optimization skills critical"
+        ],
+    },
+    "site_reliability_engineer": {
+        "demand_score": 8.7,
+        "salary_range": {"min": 115000, "max": 175000, "median": 145000},
+        "trending_skills": ["kubernetes", "monitoring", "automation", "python", "go", "aws", "prometheus", "grafana"],
+        "growth_rate": 0.26,
+        "market_insights": [
+            "SRE roles growing 26% year-over-year",
+            "Observability and monitoring skills essential",
+            "Incident management expertise highly valued",
+            "Automation and reliability engineering in demand"
+        ],
+    },
+    "cybersecurity_analyst": {
+        "demand_score": 8.8,
+        "salary_range": {"min": 100000, "max": 170000, "median": 135000},
+        "trending_skills": ["python", "cloud security", "siem", "penetration testing", "risk management", "compliance"],
+        "growth_rate": 0.31,
+        "market_insights": [
+            "Cybersecurity demand up 31% due to increased threats",
+            "Cloud security skills most critical",
+            "Compliance expertise highly valued",
+            "Remote security roles becoming more common"
+        ],
+    },
+    "security_engineer": {
+        "demand_score": 8.6,
+        "salary_range": {"min": 105000, "max": 165000, "median": 135000},
+        "trending_skills": ["python", "application security", "penetration testing", "cloud security", "siem", "threat modeling"],
+        "growth_rate": 0.29,
+        "market_insights": [
+            "Security engineering roles growing 29% annually",
+            "Application security skills in high demand",
+            "DevSecOps practices becoming standard",
+            "Threat modeling expertise increasingly valuable"
+        ],
+    },
+    "data_engineer": {
+        "demand_score": 8.5,
+        "salary_range": {"min": 105000, "max": 165000, "median": 135000},
+        "trending_skills": ["python", "sql", "spark", "aws", "airflow", "kafka", "data modeling", "etl"],
+        "growth_rate": 0.25,
+        "market_insights": [
+            "Data engineering roles growing 25% annually",
+            "Big data technologies in high demand",
+            "Real-time data processing skills valued",
+            "Cloud data platforms becoming standard"
+        ],
+    },
+    "frontend_engineer": {
+        "demand_score": 8.2,
+        "salary_range": {"min": 90000, "max": 150000, "median": 120000},
+        "trending_skills": ["javascript", "react", "typescript", "next.js", "vue", "css", "web performance", "testing"],
+        "growth_rate": 0.18,
+        "market_insights": [
+            "Frontend roles growing 18% year-over-year",
+            "React and TypeScript skills essential",
+            "Web performance and accessibility increasingly important",
+            "Remote frontend development widely available"
+        ],
+    },
+    "backend_engineer": {
+        "demand_score": 8.3,
+        "salary_range": {"min": 95000, "max": 155000, "median": 125000},
+        "trending_skills": ["python", "java", "node.js", "microservices", "aws", "docker", "sql", "apis"],
+        "growth_rate": 0.20,
+        "market_insights": [
+            "Backend engineering roles growing 20% annually",
+            "Microservices and cloud skills essential",
+            "API development and database design critical",
+            "Scalability and performance expertise valued"
+        ],
+    },
+    "product_manager": {
+        "demand_score": 8.0,
+        "salary_range": {"min": 95000, "max": 160000, "median": 127000},
+        "trending_skills": ["product management", "agile", "user research", "data analysis", "roadmapping", "stakeholder management"],
+        "growth_rate": 0.22,
+        "market_insights": [
+            "Product management roles growing 22% annually",
+            "Technical product management skills in high demand",
+            "Data-driven decision making essential",
+            "Cross-functional collaboration critical"
+        ],
+    },
+    "data_analyst": {
+        "demand_score": 7.8,
+        "salary_range": {"min": 75000, "max": 120000, "median": 95000},
+        "trending_skills": ["sql", "excel", "python", "tableau", "power bi", "statistics", "data visualization"],
+        "growth_rate": 0.15,
+        "market_insights": [
+            "Data analysis roles growing 15% year-over-year",
+            "SQL and visualization skills essential",
+            "Business intelligence tools in high demand",
+            "Remote data analysis roles increasingly common"
+        ],
+    },
+    "web_developer": {
+        "demand_score": 7.9,
+        "salary_range": {"min": 80000, "max": 130000, "median": 105000},
+        "trending_skills": ["javascript", "html", "css", "react", "node.js", "responsive design", "web performance"],
+        "growth_rate": 0.16,
+        "market_insights": [
+            "Web development roles growing 16% annually",
+            "Full-stack developers most in demand",
+            "JavaScript frameworks essential",
+            "Remote web development widely available"
+        ],
+    },
+    "software_developer": {
+        "demand_score": 8.1,
+        "salary_range": {"min": 85000, "max": 140000, "median": 112000},
+        "trending_skills": ["python", "java", "javascript", "git", "sql", "apis", "testing", "cloud"],
+        "growth_rate": 0.17,
+        "market_insights": [
+            "Software development roles growing 17% annually",
+            "Cloud and DevOps skills increasingly required",
+            "Full-stack capabilities highly valued",
+            "Agile and collaboration skills essential"
+        ],
+    },
+    "manager": {
+        "demand_score": 7.2,
+        "salary_range": {"min": 80000, "max": 130000, "median": 105000},
+        "trending_skills": ["leadership", "project management", "communication", "team collaboration", "strategic planning"],
+        "growth_rate": 0.12,
+        "market_insights": [
+            "Management roles growing 12% annually",
+            "Leadership and communication skills essential",
+            "Strategic planning expertise valued",
+            "Cross-functional collaboration critical"
+        ],
+    },
+    "analyst": {
+        "demand_score": 7.4,
+        "salary_range": {"min": 70000, "max": 115000, "median": 92000},
+        "trending_skills": ["data analysis", "problem solving", "communication", "excel", "presentation skills"],
+        "growth_rate": 0.13,
+        "market_insights": [
+            "Analysis roles growing 13% year-over-year",
+            "Data interpretation skills essential",
+            "Business acumen increasingly important",
+            "Remote analysis roles widely available"
+        ],
+    },
+    "general": {
+        "demand_score": 7.0,
+        "salary_range": {"min": 65000, "max": 110000, "median": 87000},
+        "trending_skills": ["communication", "teamwork", "problem solving", "time management", "adaptability"],
+        "growth_rate": 0.10,
+        "market_insights": [
+            "General roles growing 10% annually",
+            "Digital transformation driving demand",
+            "Remote work becoming standard",
+            "Skills in technology increasingly valuable"
+        ],
+    },
+}
+
+
+class ProviderUnavailable(Exception):
+    """A market data provider could not answer (error, timeout or open circuit)."""
+
+
+class MarketDataProvider(Protocol):
+    def fetch(self, job_title: str) -> JobMarketData: ...
+
+
+def _profile_key(job_title: str, profiles) -> str:
+    """Which entry of ``profiles`` describes a job title"""
+    match = classify_title(job_title)
+    if match.slug in profiles:
+        return match.slug
+    # Default for other roles - vary based on keywords
+    if "manager" in match.words:
+        return "manager"
+    if "analyst" in match.words:
+        return "analyst"
+    return "general"
+
+
+class MockMarketDataProvider:
+    """Generate realistic mock job market data from the built-in profiles"""
+
+    def fetch(self, job_title: str) -> JobMarketData:
+        profile = _MARKET_PROFILES[_profile_key(job_title, _MARKET_PROFILES)]
+        return JobMarketData(title=job_title, **profile)
+
+
+_SNAPSHOT_MAGIC = b"RAMKT\x01"
+_SNAPSHOT_HEADER = struct.Struct("<I")
+SNAPSHOT_PATH = Path(
+    os.environ.get("MARKET_SNAPSHOT_PATH") or Path(__file__).resolve().parent / "data" / "market_snapshot.bin"
+)
+
+
+def write_snapshot(profiles: Dict[str, dict], path: Path = SNAPSHOT_PATH) -> None:
+    """Write market data profiles (keyed like ``_MARKET_PROFILES``) as a snapshot file
+
+    Layout: magic, index length, a JSON index of ``key -> [offset, length]``,
+    then one compact JSON object per profile. The file is replaced
+    atomically so running workers can pick it up.
+    """
+    if "general" not in profiles:
+        raise ValueError("snapshot needs a 'general' profile for unmatched titles")
+    index: Dict[str, List[int]] = {}
+    blobs: List[bytes] = []
+    offset = 0
+    for key in sorted(profiles):
+        profile = profiles[key]
+        try:
+            JobMarketData(title=key, **profile)  # reject malformed profiles up front
+        except TypeError as e:
+            raise ValueError(f"market profile {key!r}: {e}") from None
+        blob = json.dumps(profile, separators=(",", ":")).encode("utf-8")
+        index[key] = [offset, len(blob)]
+        blobs.append(blob)
+        offset += len(blob)
+    header = json.dumps(index, separators=(",", ":")).encode("utf-8")
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp, "wb") as fh:
+        fh.write(_SNAPSHOT_MAGIC + _SNAPSHOT_HEADER.pack(len(header)) + header)
+        fh.writelines(blobs)
+    os.replace(tmp, path)
+
+
+class SnapshotMarketDataProvider:
+    """Market data read from a snapshot file written by ``write_snapshot``
+
+    The file is memory-mapped read-only, so every worker on a host shares one
+    copy through the page cache, and a lookup is a dict probe plus decoding
+    one small JSON object. The file is re-mapped when it is replaced,
+    checked at most every ``check_interval`` seconds. Replace it by renaming
+    a new file over it (as ``write_snapshot`` does), never by rewriting it in
+    place: a mapped file that shrinks under a reader crashes the process.
+    """
+
+    def __init__(self, path: Path = SNAPSHOT_PATH, check_interval: float = 30.0):
+        self.path = Path(path)
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._map = self._load()
+        self._checked = time.monotonic()
+
+    def _load(self) -> Tuple[mmap.mmap, int, Dict[str, List[int]], Tuple[int, int]]:
+        with open(self.path, "rb") as fh:
+            st = os.fstat(fh.fileno())
+            mm = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        start = len(_SNAPSHOT_MAGIC)
+        if mm[:start] != _SNAPSHOT_MAGIC:
+            mm.close()
+            raise ValueError(f"{self.path} is not a market data snapshot")
+        (header_len,) = _SNAPSHOT_HEADER.unpack_from(mm, start)
+        start += _SNAPSHOT_HEADER.size
+        index = json.loads(mm[start : start + header_len])
+        return mm, start + header_len, index, (st.st_ino, st.st_mtime_ns)
+
+    def _current(self):
+        now = time.monotonic()
+        if now - self._checked >= self.check_interval:
+            with self._lock:
+                if now - self._checked >= self.check_interval:
+                    self._checked = now
+                    try:
+                        st = os.stat(self.path)
+                        if (st.st_ino, st.st_mtime_ns) != self._map[3]:
+                            # The old map is released once no reader holds it
+                            self._map = self._load()
+                    except (OSError, ValueError):
+                        pass  # keep serving the snapshot we have
+        return self._map
+
+    def keys(self) -> List[str]:
+        return list(self._current()[2])
+
+    def fetch(self, job_title: str) -> JobMarketData:
+        mm, base, index, _ = self._current()
+        offset, length = index[_profile_key(job_title, index)]
+        profile = json.loads(mm[base + offset : base + offset + length])
+        return JobMarketData(title=job_title, **profile)
+
+
+class CircuitBreaker:
+    """Stops calling a failing dependency for ``reset_after`` seconds.
+
+    Opens after ``failure_threshold`` consecutive failures; once the pause is
+    over a single trial call is let through, and its outcome closes the
+    circuit again or re-opens it.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_after: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_after = reset_after
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._trial = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self.opened_at is None:
+                return "closed"
+            return "half-open" if time.monotonic() - self.opened_at >= self.reset_after else "open"
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.opened_at is None:
+                return True
+            if self._trial or time.monotonic() - self.opened_at < self.reset_after:
+                return False
+            self._trial = True
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._trial = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self._trial or self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+            self._trial = False
+
+
+class HTTPMarketDataProvider:
+    """Fetch market data from a remote service over a pooled HTTP session
+
+    ``GET {base_url}/market-data?title=...`` must answer with the
+    ``JobMarketData`` fields other than ``title`` as a JSON object.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        api_key: Optional[str] = None,
+        timeout: float = 2.0,
+        pool_size: int = 10,
+        breaker: Optional[CircuitBreaker] = None,
+    ):
+        self.url = base_url.rstrip("/") + "/market-data"
+        # Short connect timeout: an unreachable service should fail fast
+        self.timeout = (min(timeout, 1.0), timeout)
+        self.breaker = breaker or CircuitBreaker()
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        if api_key:
+            self.session.headers["Authorization"] = f"Bearer {api_key}"
+
+    def fetch(self, job_title: str) -> JobMarketData:
+        if not self.breaker.allow():
+            raise ProviderUnavailable("market data service circuit is open")
+        try:
+            resp = self.session.get(self.url, params={"title": job_title}, timeout=self.timeout)
+            resp.raise_for_status()
+            body = resp.json()
+            data = JobMarketData(
+                title=job_title,
+                demand_score=float(body["demand_score"]),
+                salary_range={k: int(body["salary_range"][k]) for k in ("min", "max", "median")},
+                trending_skills=[str(s) for s in body["trending_skills"]],
+                growth_rate=float(body["growth_rate"]),
+                market_insights=[str(s) for s in body["market_insights"]],
+            )
+        except Exception as e:  # noqa: BLE001
+            self.breaker.record_failure()
+            raise ProviderUnavailable(f"market data fetch failed: {e}") from e
+        self.breaker.record_success()
+        return data
 
 
 class JobMarketAPI:
-    """Integration with job market APIs for real-time skill trends and insights"""
+    """Integration with job market APIs for real-time skill trends and insights
+
+    Market data is cached per normalized title in a bounded LRU. An entry is
+    fresh for ``cache_duration``; for ``stale_duration`` after that it is
+    still served while a background refresh runs. Concurrent misses for one
+    title are collapsed so the data is fetched only once.
+
+    With a ``fallback`` provider, a title seen for the first time is answered
+    from the fallback at once and fetched from ``provider`` in the background,
+    so a slow market data service never delays a request.
+    """
     
-    def __init__(self):
-        self.cache = {}
-        self.cache_duration = timedelta(hours=1)  # Cache for 1 hour instead of 24
+    def __init__(
+        self,
+        provider: Optional[MarketDataProvider] = None,
+        fallback: Optional[MarketDataProvider] = None,
+        max_entries: int = 1024,
+        cache_duration: timedelta = timedelta(hours=1),
+        stale_duration: timedelta = timedelta(hours=24),
+    ):
+        self.provider = provider or MockMarketDataProvider()
+        self.fallback = fallback
+        self.max_entries = max_entries
+        self.cache_duration = cache_duration
+        self.stale_duration = stale_duration
+        # title -> (data, fresh until, usable until), on the monotonic clock
+        self.cache: OrderedDict[str, Tuple[JobMarketData, float, float]] = OrderedDict()
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.refresh_failures = 0
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, Future] = {}
+        self._refresher: Optional[ThreadPoolExecutor] = None
         
-    def _get_from_cache(self, job_title: str) -> Optional[JobMarketData]:
-        """Get cached data if available and not expired"""
-        if job_title in self.cache:
-            cached_data, timestamp = self.cache[job_title]
-            if datetime.now() - timestamp < self.cache_duration:
-                return cached_data
-        return None
+    def _get_from_cache(self, job_title: str) -> Optional[Tuple[JobMarketData, bool]]:
+        """Cached data and whether it is still fresh, unless expired (caller holds the lock)"""
+        item = self.cache.get(job_title)
+        if item is None:
+            return None
+        data, fresh_until, usable_until = item
+        now = time.monotonic()
+        if now >= usable_until:
+            del self.cache[job_title]
+            self.expirations += 1
+            return None
+        self.cache.move_to_end(job_title)
+        return data, now < fresh_until
     
-    def _cache_data(self, job_title: str, data: JobMarketData):
-        """Cache job market data with timestamp"""
-        self.cache[job_title] = (data, datetime.now())
+    def _cache_data(self, job_title: str, data: JobMarketData, fresh: bool = True):
+        """Cache job market data with its expiry times (caller holds the lock)"""
+        now = time.monotonic()
+        fresh_until = now + self.cache_duration.total_seconds() if fresh else now
+        self.cache[job_title] = (data, fresh_until, fresh_until + self.stale_duration.total_seconds())
+        self.cache.move_to_end(job_title)
+        if len(self.cache) <= self.max_entries:
+            return
+        # Drop expired entries before evicting live ones
+        for key in [k for k, (_, _, usable_until) in self.cache.items() if usable_until <= now]:
+            del self.cache[key]
+            self.expirations += 1
+        while len(self.cache) > self.max_entries:
+            self.cache.popitem(last=False)
+            self.evictions += 1
     
     def get_job_market_data(self, job_title: str) -> JobMarketData:
         """Get job market data for a given job title"""
         # Normalize job title for cache key
         normalized_title = job_title.strip().lower()
         
-        # Check cache first
-        cached_data = self._get_from_cache(normalized_title)
-        if cached_data:
-            return cached_data
+        with self._lock:
+            cached = self._get_from_cache(normalized_title)
+            if cached is not None:
+                data, fresh = cached
+                if fresh:
+                    self.hits += 1
+                else:
+                    self.stale_hits += 1
+                    self._refresh_in_background(normalized_title, job_title)
+                return data
+            self.misses += 1
+            if self.fallback is not None:
+                # Answer from the fallback now and fetch the real data off the request path
+                data = self.fallback.fetch(job_title)
+                self._cache_data(normalized_title, data, fresh=False)
+                self._refresh_in_background(normalized_title, job_title)
+                return data
+            flight = self._inflight.get(normalized_title)
+            leader = flight is None
+            if leader:
+                flight = self._inflight[normalized_title] = Future()
         
-        # Generate mock data for now (can be replaced with real API calls)
-        data = self._generate_mock_market_data(job_title)
-        self._cache_data(normalized_title, data)
+        if not leader:
+            # Another thread is already fetching this title
+            return flight.result()
+        return self._fetch(normalized_title, job_title, flight)
+    
+    def _fetch(self, normalized_title: str, job_title: str, flight: Future) -> JobMarketData:
+        try:
+            data = self.provider.fetch(job_title)
+        except BaseException as e:
+            with self._lock:
+                del self._inflight[normalized_title]
+            flight.set_exception(e)
+            raise
+        with self._lock:
+            self._cache_data(normalized_title, data)
+            del self._inflight[normalized_title]
+        flight.set_result(data)
         return data
     
-    def _generate_mock_market_data(self, job_title: str) -> JobMarketData:
-        """Generate realistic mock job market data (replace with real API calls)"""
-        job_title_lower = job_title.lower()
-        
-        # Specific matching for different job roles
-        if "ai engineer" in job_title_lower or ("ai" in job_title_lower and "engineer" in job_title_lower):
-            return JobMarketData(
-                title=job_title,
-                demand_score=9.2,
-                salary_range={"min": 120000, "max": 200000, "median": 160000},
-                trending_skills=["python", "tensorflow", "pytorch", "mlops", "kubernetes", "aws", "nlp", "computer vision"],
-                growth_rate=0.34,
-                market_insights=[
-                    "AI roles have seen 34% growth in the past year",
-                    "High demand for ML engineers in healthcare and finance",
-                    "Remote work opportunities abundant in AI field",
-                    "Companies investing heavily in AI infrastructure"
-                ]
-            )
-        elif "machine learning" in job_title_lower or "ml" in job_title_lower:
-            return JobMarketData(
-                title=job_title,
-                demand_score=9.0,
-                salary_range={"min": 115000, "max": 185000, "median": 150000},
-                trending_skills=["python", "scikit-learn", "tensorflow", "pytorch", "spark", "airflow", "kubeflow", "mlflow"],
-                growth_rate=0.32,
-                market_insights=[
-                    "ML engineering roles growing 32% year-over-year",
-                    "Production ML skills highly valued",
-                    "AutoML and MLOps tools in high demand",
-                    "Healthcare and finance sectors leading ML adoption"
-                ]
-            )
-        elif "data scientist" in job_title_lower or "data science" in job_title_lower:
-            return JobMarketData(
-                title=job_title,
-                demand_score=8.8,
-                salary_range={"min": 110000, "max": 175000, "median": 142000},
-                trending_skills=["python", "r", "statistics", "machine learning", "tableau", "sql", "jupyter", "pandas"],
-                growth_rate=0.28,
-                market_insights=[
-                    "Data science roles growing 28% annually",
-                    "Statistical analysis and ML skills essential",
-                    "Business acumen increasingly important",
-                    "Remote data science roles widely available"
-                ]
-            )
-        elif "devops" in job_title_lower:
-            return JobMarketData(
-                title=job_title,
-                demand_score=9.0,
-                salary_range={"min": 110000, "max": 180000, "median": 145000},
-                trending_skills=["kubernetes", "docker", "aws", "terraform", "ci/cd", "monitoring", "python", "go"],
-                growth_rate=0.28,
-                market_insights=[
-                    "DevOps roles growing 28% year-over-year",
-                    "Kubernetes skills in highest demand",
-                    "Cloud certification significantly increases salary potential",
-                    "Automation skills highly valued across industries"
-                ]
-            )
-        elif "cloud architect" in job_title_lower or ("cloud" in job_title_lower and "architect" in job_title_lower):
-            return JobMarketData(
-                title=job_title,
-                demand_score=8.9,
-                salary_range={"min": 125000, "max": 190000, "median": 157000},
-                trending_skills=["aws", "azure", "gcp", "terraform", "kubernetes", "serverless", "microservices", "networking"],
-                growth_rate=0.30,
-                market_insights=[
-                    "Cloud architecture roles growing 30% annually",
-                    "Multi-cloud expertise highly valued",
-                    "Enterprise cloud migration driving demand",
-                    "Security and cost optimization skills critical"
-                ]
-            )
-        elif "site reliability" in job_title_lower or "sre" in job_title_lower:
-            return JobMarketData(
-                title=job_title,
-                demand_score=8.7,
-                salary_range={"min": 115000, "max": 175000, "median": 145000},
-                trending_skills=["kubernetes", "monitoring", "automation", "python", "go", "aws", "prometheus", "grafana"],
-                growth_rate=0.26,
-                market_insights=[
-                    "SRE roles growing 26% year-over-year",
-                    "Observability and monitoring skills essential",
-                    "Incident management expertise highly valued",
-                    "Automation and reliability engineering in demand"
-                ]
-            )
-        elif "cybersecurity" in job_title_lower or "cyber security" in job_title_lower:
-            return JobMarketData(
-                title=job_title,
-                demand_score=8.8,
-                salary_range={"min": 100000, "max": 170000, "median": 135000},
-                trending_skills=["python", "cloud security", "siem", "penetration testing", "risk management", "compliance"],
-                growth_rate=0.31,
-                market_insights=[
-                    "Cybersecurity demand up 31% due to increased threats",
-                    "Cloud security skills most critical",
-                    "Compliance expertise highly valued",
-                    "Remote security roles becoming more common"
-                ]
-            )
-        elif "security engineer" in job_title_lower or ("security" in job_title_lower and "engineer" in job_title_lower):
-            return JobMarketData(
-                title=job_title,
-                demand_score=8.6,
-                salary_range={"min": 105000, "max": 165000, "median": 135000},
-                trending_skills=["python", "application security", "penetration testing", "cloud security", "siem", "threat modeling"],
-                growth_rate=0.29,
-                market_insights=[
-                    "Security engineering roles growing 29% annually",
-                    "Application security skills in high demand",
-                    "DevSecOps practices becoming standard",
-                    "Threat modeling expertise increasingly valuable"
-                ]
-            )
-        elif "data engineer" in job_title_lower or ("data" in job_title_lower and "engineer" in job_title_lower):
-            return JobMarketData(
-                title=job_title,
-                demand_score=8.5,
-                salary_range={"min": 105000, "max": 165000, "median": 135000},
-                trending_skills=["python", "sql", "spark", "aws", "airflow", "kafka", "data modeling", "etl"],
-                growth_rate=0.25,
-                market_insights=[
-                    "Data engineering roles growing 25% annually",
-                    "Big data technologies in high demand",
-                    "Real-time data processing skills valued",
-                    "Cloud data platforms becoming standard"
-                ]
-            )
-        elif "frontend" in job_title_lower and ("engineer" in job_title_lower or "developer" in job_title_lower):
-            return JobMarketData(
-                title=job_title,
-                demand_score=8.2,
-                salary_range={"min": 90000, "max": 150000, "median": 120000},
-                trending_skills=["javascript", "react", "typescript", "next.js", "vue", "css", "web performance", "testing"],
-                growth_rate=0.18,
-                market_insights=[
-                    "Frontend roles growing 18% year-over-year",
-                    "React and TypeScript skills essential",
-                    "Web performance and accessibility increasingly important",
-                    "Remote frontend development widely available"
-                ]
-            )
-        elif "backend" in job_title_lower and ("engineer" in job_title_lower or "developer" in job_title_lower):
-            return JobMarketData(
-                title=job_title,
-                demand_score=8.3,
-                salary_range={"min": 95000, "max": 155000, "median": 125000},
-                trending_skills=["python", "java", "node.js", "microservices", "aws", "docker", "sql", "apis"],
-                growth_rate=0.20,
-                market_insights=[
-                    "Backend engineering roles growing 20% annually",
-                    "Microservices and cloud skills essential",
-                    "API development and database design critical",
-                    "Scalability and performance expertise valued"
-                ]
-            )
-        elif "product manager" in job_title_lower or ("product" in job_title_lower and "manager" in job_title_lower):
-            return JobMarketData(
-                title=job_title,
-                demand_score=8.0,
-                salary_range={"min": 95000, "max": 160000, "median": 127000},
-                trending_skills=["product management", "agile", "user research", "data analysis", "roadmapping", "stakeholder management"],
-                growth_rate=0.22,
-                market_insights=[
-                    "Product management roles growing 22% annually",
-                    "Technical product management skills in high demand",
-                    "Data-driven decision making essential",
-                    "Cross-functional collaboration critical"
-                ]
-            )
-        elif "data analyst" in job_title_lower:
-            return JobMarketData(
-                title=job_title,
-                demand_score=7.8,
-                salary_range={"min": 75000, "max": 120000, "median": 95000},
-                trending_skills=["sql", "excel", "python", "tableau", "power bi", "statistics", "data visualization"],
-                growth_rate=0.15,
-                market_insights=[
-                    "Data analysis roles growing 15% year-over-year",
-                    "SQL and visualization skills essential",
-                    "Business intelligence tools in high demand",
-                    "Remote data analysis roles increasingly common"
-                ]
-            )
-        elif "web developer" in job_title_lower:
-            return JobMarketData(
-                title=job_title,
-                demand_score=7.9,
-                salary_range={"min": 80000, "max": 130000, "median": 105000},
-                trending_skills=["javascript", "html", "css", "react", "node.js", "responsive design", "web performance"],
-                growth_rate=0.16,
-                market_insights=[
-                    "Web development roles growing 16% annually",
-                    "Full-stack developers most in demand",
-                    "JavaScript frameworks essential",
-                    "Remote web development widely available"
-                ]
-            )
-        elif "software developer" in job_title_lower or ("software" in job_title_lower and ("developer" in job_title_lower or "engineer" in job_title_lower)):
-            return JobMarketData(
-                title=job_title,
-                demand_score=8.1,
-                salary_range={"min": 85000, "max": 140000, "median": 112000},
-                trending_skills=["python", "java", "javascript", "git", "sql", "apis", "testing", "cloud"],
-                growth_rate=0.17,
-                market_insights=[
-                    "Software development roles growing 17% annually",
-                    "Cloud and DevOps skills increasingly required",
-                    "Full-stack capabilities highly valued",
-                    "Agile and collaboration skills essential"
-                ]
-            )
-        else:
-            # Default for other roles - vary based on keywords
-            if "manager" in job_title_lower:
-                return JobMarketData(
-                    title=job_title,
-                    demand_score=7.2,
-                    salary_range={"min": 80000, "max": 130000, "median": 105000},
-                    trending_skills=["leadership", "project management", "communication", "team collaboration", "strategic planning"],
-                    growth_rate=0.12,
-                    market_insights=[
-                        "Management roles growing 12% annually",
-                        "Leadership and communication skills essential",
-                        "Strategic planning expertise valued",
-                        "Cross-functional collaboration critical"
-                    ]
-                )
-            elif "analyst" in job_title_lower:
-                return JobMarketData(
-                    title=job_title,
-                    demand_score=7.4,
-                    salary_range={"min": 70000, "max": 115000, "median": 92000},
-                    trending_skills=["data analysis", "problem solving", "communication", "excel", "presentation skills"],
-                    growth_rate=0.13,
-                    market_insights=[
-                        "Analysis roles growing 13% year-over-year",
-                        "Data interpretation skills essential",
-                        "Business acumen increasingly important",
-                        "Remote analysis roles widely available"
-                    ]
-                )
-            else:
-                return JobMarketData(
-                    title=job_title,
-                    demand_score=7.0,
-                    salary_range={"min": 65000, "max": 110000, "median": 87000},
-                    trending_skills=["communication", "teamwork", "problem solving", "time management", "adaptability"],
-                    growth_rate=0.10,
-                    market_insights=[
-                        "General roles growing 10% annually",
-                        "Digital transformation driving demand",
-                        "Remote work becoming standard",
-                        "Skills in technology increasingly valuable"
-                    ]
-                )
+    def _refresh_in_background(self, normalized_title: str, job_title: str):
+        """Start fetching a title on the refresh pool unless already in flight (caller holds the lock)"""
+        if normalized_title in self._inflight:
+            return
+        flight = self._inflight[normalized_title] = Future()
+        if self._refresher is None:
+            self._refresher = ThreadPoolExecutor(max_workers=2, thread_name_prefix="market-refresh")
+        self._refresher.submit(self._refresh, normalized_title, job_title, flight)
+    
+    def _refresh(self, normalized_title: str, job_title: str, flight: Future):
+        try:
+            self._fetch(normalized_title, job_title, flight)
+        except Exception:  # noqa: BLE001
+            # Keep serving what we have; the next stale read retries
+            with self._lock:
+                self.refresh_failures += 1
+    
+    def cache_stats(self) -> Dict[str, Any]:
+        """Hit, miss and eviction counters for the market data cache"""
+        with self._lock:
+            lookups = self.hits + self.stale_hits + self.misses
+            stats = {
+                "provider": type(self.provider).__name__,
+                "size": len(self.cache),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "stale_hits": self.stale_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "refresh_failures": self.refresh_failures,
+                "hit_ratio": round((self.hits + self.stale_hits) / lookups, 4) if lookups else 0.0,
+            }
+        breaker = getattr(self.provider, "breaker", None)
+        if breaker is not None:
+            stats["circuit"] = breaker.state
+        return stats
     
     def get_trending_skills_by_industry(self, industry: str) -> List[str]:
         """Get trending skills for a specific industry"""
@@ -339,7 +663,7 @@ class JobMarketAPI:
         multiplier = multipliers.get(experience_level.lower(), 1.0)
         
         return {
-            "base_range": base_range,
+            "base_range": dict(base_range),
             "adjusted_range": {
                 "min": int(base_range["min"] * multiplier),
                 "max": int(base_range["max"] * multiplier),
@@ -351,5 +675,65 @@ class JobMarketAPI:
         }
 
 
+def market_api_from_env() -> JobMarketAPI:
+    """Build the market data client configured by ``MARKET_*`` environment variables.
+
+    MARKET_SNAPSHOT_PATH: snapshot file to serve local data from (default app/data/market_snapshot.bin
+                        when it exists, otherwise the built-in mock data, which is also
+                        used if the snapshot is missing or unreadable)
+    MARKET_API_URL:     base URL of the market data service; local data becomes its fallback
+    MARKET_API_KEY:     bearer token sent to the service
+    MARKET_API_TIMEOUT_SECONDS: per-request timeout (default 2)
+    MARKET_CACHE_SIZE:  job titles kept in memory (default 1024)
+    MARKET_STALE_SECONDS: how long expired data may still be served while it refreshes (default 86400)
+    """
+    local: MarketDataProvider = MockMarketDataProvider()
+    if os.environ.get("MARKET_SNAPSHOT_PATH") or SNAPSHOT_PATH.exists():
+        try:
+            local = SnapshotMarketDataProvider(SNAPSHOT_PATH)
+        except (OSError, ValueError, struct.error) as e:
+            # This runs at import; a bad snapshot must not stop the app from starting
+            logger.error("Cannot read market snapshot %s (%s); using the built-in market data", SNAPSHOT_PATH, e)
+
+    url = os.environ.get("MARKET_API_URL")
+    provider: MarketDataProvider = local
+    fallback: Optional[MarketDataProvider] = None
+    if url:
+        provider = HTTPMarketDataProvider(
+            url,
+            api_key=os.environ.get("MARKET_API_KEY") or None,
+            timeout=float(os.environ.get("MARKET_API_TIMEOUT_SECONDS") or 2),
+        )
+        fallback = local
+    return JobMarketAPI(
+        provider=provider,
+        fallback=fallback,
+        max_entries=int(os.environ.get("MARKET_CACHE_SIZE") or 1024),
+        stale_duration=timedelta(seconds=float(os.environ.get("MARKET_STALE_SECONDS") or 86400)),
+    )
+
+
 # Global instance
-job_market_api = JobMarketAPI()
+job_market_api = market_api_from_env()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compile job market data into a snapshot file.")
+    parser.add_argument(
+        "--profiles",
+        type=Path,
+        help="JSON object of extra or replacement profiles keyed by role slug (or manager/analyst/general), "
+        "merged over the built-in ones.",
+    )
+    parser.add_argument("--out", type=Path, default=SNAPSHOT_PATH, help=f"Output path (default: {SNAPSHOT_PATH})")
+    args = parser.parse_args()
+
+    profiles = dict(_MARKET_PROFILES)
+    if args.profiles:
+        profiles.update(json.loads(args.profiles.read_text(encoding="utf-8")))
+    write_snapshot(profiles, args.out)
+    print(f"Wrote {len(profiles)} profiles, {args.out.stat().st_size} bytes -> {args.out}")
+
+
+if __name__ == "__main__":
+    main()
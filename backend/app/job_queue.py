@@ -0,0 +1,266 @@
+from __future__ import annotations
+
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, Callable, Optional, Protocol
+
+
+class QueueFull(Exception):
+    """The broker already holds its maximum number of waiting jobs."""
+
+
+class Broker(Protocol):
+    def enqueue(self, job_id: str, payload: dict) -> None:
+        """Store a new job; raise QueueFull when the queue is at capacity."""
+        ...
+
+    def claim(self, timeout: float) -> Optional[tuple[str, dict]]:
+        """Take the oldest queued job and mark it running, or None after ``timeout``."""
+        ...
+
+    def finish(self, job_id: str, result: dict, status_code: int) -> None: ...
+
+    def get(self, job_id: str) -> Optional[dict]: ...
+
+    def depth(self) -> int: ...
+
+
+class MemoryBroker:
+    """In-process broker; job status is only visible to the process that accepted it."""
+
+    def __init__(self, max_depth: int = 100, result_ttl: float = 3600):
+        self.result_ttl = result_ttl
+        self._queue: queue.Queue[tuple[str, dict]] = queue.Queue(maxsize=max_depth)
+        self._jobs: dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    def enqueue(self, job_id: str, payload: dict) -> None:
+        with self._lock:
+            self._prune()
+            self._jobs[job_id] = {"status": "queued", "created": time.time()}
+        try:
+            self._queue.put_nowait((job_id, payload))
+        except queue.Full:
+            with self._lock:
+                self._jobs.pop(job_id, None)
+            raise QueueFull() from None
+
+    def claim(self, timeout: float) -> Optional[tuple[str, dict]]:
+        try:
+            job_id, payload = self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+        with self._lock:
+            self._jobs[job_id]["status"] = "running"
+        return job_id, payload
+
+    def finish(self, job_id: str, result: dict, status_code: int) -> None:
+        with self._lock:
+            self._jobs[job_id].update(
+                status="done" if status_code < 400 else "failed",
+                result=result,
+                status_code=status_code,
+                finished=time.time(),
+            )
+
+    def get(self, job_id: str) -> Optional[dict]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job else None
+
+    def depth(self) -> int:
+        return self._queue.qsize()
+
+    def _prune(self) -> None:
+        # Caller holds the lock
+        cutoff = time.time() - self.result_ttl
+        for job_id in [k for k, v in self._jobs.items() if v.get("finished", cutoff + 1) < cutoff]:
+            del self._jobs[job_id]
+
+
+class SQLiteBroker:
+    """Broker in a SQLite file, shared by every worker process on the host."""
+
+    def __init__(
+        self,
+        path: str,
+        max_depth: int = 100,
+        result_ttl: float = 3600,
+        poll_interval: float = 0.2,
+        stale_after: float = 300,
+    ):
+        self.max_depth = max_depth
+        self.stale_after = stale_after
+        self.result_ttl = result_ttl
+        self.poll_interval = poll_interval
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=10, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            " id TEXT PRIMARY KEY, status TEXT NOT NULL, file BLOB, params TEXT,"
+            " result TEXT, status_code INTEGER, created REAL NOT NULL, started REAL, finished REAL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS jobs_status_created ON jobs (status, created)")
+
+    def enqueue(self, job_id: str, payload: dict) -> None:
+        params = {k: v for k, v in payload.items() if k != "file"}
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute(
+                    "DELETE FROM jobs WHERE finished IS NOT NULL AND finished < ?", (now - self.result_ttl,)
+                )
+                (depth,) = self._conn.execute("SELECT COUNT(*) FROM jobs WHERE status = 'queued'").fetchone()
+                if depth >= self.max_depth:
+                    raise QueueFull()
+                self._conn.execute(
+                    "INSERT INTO jobs (id, status, file, params, created) VALUES (?, 'queued', ?, ?, ?)",
+                    (job_id, payload.get("file"), json.dumps(params), now),
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def claim(self, timeout: float) -> Optional[tuple[str, dict]]:
+        deadline = time.monotonic() + timeout
+        while True:
+            with self._lock:
+                # Jobs left running by a process that died are picked up again
+                now = time.time()
+                row = self._conn.execute(
+                    "UPDATE jobs SET status = 'running', started = ? WHERE id = ("
+                    " SELECT id FROM jobs WHERE status = 'queued' OR (status = 'running' AND started < ?)"
+                    " ORDER BY created LIMIT 1"
+                    ") RETURNING id, file, params",
+                    (now, now - self.stale_after),
+                ).fetchone()
+            if row is not None:
+                job_id, file_bytes, params = row
+                payload = json.loads(params)
+                payload["file"] = file_bytes
+                return job_id, payload
+            if time.monotonic() >= deadline:
+                return None
+            time.sleep(self.poll_interval)
+
+    def finish(self, job_id: str, result: dict, status_code: int) -> None:
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, result = ?, status_code = ?, finished = ?, file = NULL WHERE id = ?",
+                ("done" if status_code < 400 else "failed", json.dumps(result), status_code, time.time(), job_id),
+            )
+
+    def get(self, job_id: str) -> Optional[dict]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT status, result, status_code, created, finished FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        status, result, status_code, created, finished = row
+        job: dict[str, Any] = {"status": status, "created": created}
+        if finished is not None:
+            job.update(result=json.loads(result), status_code=status_code, finished=finished)
+        return job
+
+    def depth(self) -> int:
+        with self._lock:
+            (depth,) = self._conn.execute("SELECT COUNT(*) FROM jobs WHERE status = 'queued'").fetchone()
+        return depth
+
+
+class JobQueue:
+    """Accepts analysis jobs and drains them with a pool of local worker threads.
+
+    ``handler(payload)`` returns ``(response_body, http_status)``; the heavy
+    PDF work it does already runs in the extraction process pool. Workers
+    start with the queue, so jobs a shared broker already holds are drained
+    without waiting for a new submission.
+    """
+
+    def __init__(self, broker: Broker, handler: Callable[[dict], tuple[dict, int]], workers: int = 2):
+        self.broker = broker
+        self.handler = handler
+        self.workers = workers
+        self.busy = 0
+        self._threads: list[threading.Thread] = []
+        self._lock = threading.Lock()
+        self._start()
+
+    def submit(self, payload: dict) -> str:
+        """Queue a job and return its id; raises QueueFull when at capacity."""
+        job_id = uuid.uuid4().hex
+        self.broker.enqueue(job_id, payload)
+        return job_id
+
+    def status(self, job_id: str) -> Optional[dict]:
+        return self.broker.get(job_id)
+
+    def _start(self) -> None:
+        with self._lock:
+            if self._threads:
+                return
+            for i in range(self.workers):
+                t = threading.Thread(target=self._work, name=f"analysis-worker-{i}", daemon=True)
+                t.start()
+                self._threads.append(t)
+
+    def _work(self) -> None:
+        while True:
+            claimed = self.broker.claim(timeout=1.0)
+            if claimed is None:
+                continue
+            job_id, payload = claimed
+            with self._lock:
+                self.busy += 1
+            try:
+                body, status_code = self.handler(payload)
+            except Exception as e:  # noqa: BLE001
+                body, status_code = {"detail": f"Analysis failed: {e}"}, 500
+            finally:
+                with self._lock:
+                    self.busy -= 1
+            self.broker.finish(job_id, body, status_code)
+
+
+def backend_from_env() -> str:
+    """The broker ``queue_from_env`` builds: ``JOB_QUEUE_BACKEND``, or sqlite when
+    ``WEB_CONCURRENCY`` > 1 (an in-process broker only knows the jobs its own
+    process accepted), else memory."""
+    processes = int(os.environ.get("WEB_CONCURRENCY") or 1)
+    return (os.environ.get("JOB_QUEUE_BACKEND") or ("sqlite" if processes > 1 else "memory")).strip().lower()
+
+
+def queue_from_env(handler: Callable[[dict], tuple[dict, int]]) -> JobQueue:
+    """Build the job queue configured by ``JOB_QUEUE_*`` environment variables.
+
+    JOB_QUEUE_BACKEND:   memory or sqlite (default: sqlite when WEB_CONCURRENCY > 1, else memory)
+    JOB_QUEUE_PATH:      SQLite file (sqlite backend)
+    JOB_QUEUE_MAX_DEPTH: waiting jobs accepted before 429 (default 100)
+    JOB_QUEUE_WORKERS:   worker threads per process (default 2)
+    JOB_RESULT_TTL_SECONDS: how long finished results stay retrievable (default 3600)
+    """
+    kind = backend_from_env()
+    # gunicorn runs WEB_CONCURRENCY worker processes
+    processes = int(os.environ.get("WEB_CONCURRENCY") or 1)
+    max_depth = int(os.environ.get("JOB_QUEUE_MAX_DEPTH") or 100)
+    ttl = float(os.environ.get("JOB_RESULT_TTL_SECONDS") or 3600)
+    if kind == "sqlite":
+        path = os.environ.get("JOB_QUEUE_PATH") or "job_queue.sqlite3"
+        broker: Broker = SQLiteBroker(path, max_depth=max_depth, result_ttl=ttl)
+    elif processes > 1:
+        raise RuntimeError(
+            f"JOB_QUEUE_BACKEND={kind} cannot share job status between {processes} worker processes"
+            " (WEB_CONCURRENCY); use JOB_QUEUE_BACKEND=sqlite."
+        )
+    else:
+        broker = MemoryBroker(max_depth=max_depth, result_ttl=ttl)
+    return JobQueue(broker, handler, workers=int(os.environ.get("JOB_QUEUE_WORKERS") or 2))
@@ -1,21 +1,44 @@
 from __future__ import annotations
 
-import io
+import hashlib
 import os
 import sys
+import threading
+import time
 
-from flask import Flask, jsonify, request
+from flask import Flask, Response, g, jsonify, request, send_file
 from flask_cors import CORS
 
 try:
-    from .analyzer import analyze_resume_against_job
+    from . import text_cache as _text_cache
+    from . import metrics, timing
+    from . import pdf_preflight
+    from .job_queue import QueueFull, queue_from_env
+    from .profiling import profiler_from_env
+    from .analyzer import _normalize_text, _split_sections, compile_job, score
+    from .job_market_api import job_market_api
+    from .pdf_text import PAGE_BUDGET, Extraction, ExtractionTimeout, budget_tag, extract_many, extract_text_pooled
+    from .result_cache import ResultCache, cache_from_env
+    from .search_index import index_from_env
+    from .uploads import MAX_PDF_BYTES, PDFSpool, SpoolingRequest
 except ImportError:
     # Allow running this file directly: python app/main.py
     sys.path.append(os.path.dirname(os.path.dirname(__file__)))
-    from app.analyzer import analyze_resume_against_job
+    from app import text_cache as _text_cache
+    from app import metrics, timing
+    from app import pdf_preflight
+    from app.job_queue import QueueFull, queue_from_env
+    from app.profiling import profiler_from_env
+    from app.analyzer import _normalize_text, _split_sections, compile_job, score
+    from app.job_market_api import job_market_api
+    from app.pdf_text import PAGE_BUDGET, Extraction, ExtractionTimeout, budget_tag, extract_many, extract_text_pooled
+    from app.result_cache import ResultCache, cache_from_env
+    from app.search_index import index_from_env
+    from app.uploads import MAX_PDF_BYTES, PDFSpool, SpoolingRequest
 
 
 app = Flask(__name__)
+app.request_class = SpoolingRequest
 CORS(
     app,
     resources={
@@ -31,21 +54,173 @@ CORS(
     },
 )
 
+# Cached text and results depend on how much of each document is extracted
+_EXTRACTION_TAG = budget_tag(PAGE_BUDGET)
+result_cache = cache_from_env()
+text_cache = _text_cache.cache_from_env(variant=_EXTRACTION_TAG)
+profiler = profiler_from_env()
+search_index = index_from_env()
+if search_index is not None:
+    # Load it off the request path; searches before then wait for the load
+    threading.Thread(target=search_index.warm, name="search-index-warmup", daemon=True).start()
 
-def _extract_text_from_pdf(file_bytes: bytes) -> str:
-    try:
-        try:
-            import pdfplumber  # type: ignore
-        except ModuleNotFoundError as e:
-            raise RuntimeError(
-                "PDF parser dependency is missing. Install backend requirements (pip install -r requirements.txt)."
-            ) from e
-
-        with pdfplumber.open(io.BytesIO(file_bytes)) as pdf:
-            pages_text = [(p.extract_text() or "") for p in pdf.pages]
-            return "\n".join(pages_text).strip()
-    except Exception as e:  # noqa: BLE001
-        raise ValueError(f"Failed to parse PDF: {e}")
+
+_MAX_BATCH_FILES = int(os.environ.get("MAX_BATCH_FILES") or 500)
+_MAX_BATCH_BYTES = int(os.environ.get("MAX_BATCH_UPLOAD_BYTES") or 0) or None
+# /api/analyze hands documents with more pages than this to the job queue (0: never)
+_ASYNC_PAGES = int(os.environ.get("PDF_ASYNC_PAGES") or 0)
+_MAX_SEARCH_RESULTS = 500
+
+# Request bodies larger than this are cut off while they stream in (room is
+# left for the form fields next to the PDF)
+SpoolingRequest.body_limits = {
+    "analyze": MAX_PDF_BYTES + (64 << 10),
+    "submit_job": MAX_PDF_BYTES + (64 << 10),
+    "index_resume": MAX_PDF_BYTES + (64 << 10),
+    "analyze_batch": _MAX_BATCH_BYTES,
+}
+
+# Endpoints whose stages are timed (Server-Timing header, /api/timings)
+_TIMED_ENDPOINTS = {"analyze", "analyze_batch", "search"}
+
+
+@app.before_request
+def _start_timing():
+    g.request_started = time.perf_counter()
+    metrics.REQUESTS_IN_PROGRESS.inc()
+    if request.endpoint in _TIMED_ENDPOINTS:
+        g.timing = timing.begin()
+
+
+@app.after_request
+def _report_timing(response):
+    endpoint = request.endpoint or "unmatched"
+    metrics.REQUESTS.labels(endpoint, request.method, response.status_code).inc()
+    if "request_started" in g:
+        metrics.REQUEST_LATENCY.labels(endpoint).observe(time.perf_counter() - g.request_started)
+    _sync_cache_metrics()
+
+    started = g.pop("timing", None)
+    if started is None:
+        return response
+    timings = timing.end(started)
+    metrics.observe_stages(timings)
+    response.headers["Server-Timing"] = timing.server_timing(timings)
+    # ?debug=timings (or debug=1) also puts them in the JSON body
+    if request.args.get("debug") in {"1", "true", "timings"} and response.is_json:
+        body = response.get_json(silent=True)
+        if isinstance(body, dict):
+            body.setdefault("debug", {})["timings"] = timings
+            response.set_data(app.json.dumps(body))
+    return response
+
+
+@app.before_request
+def _start_profile():
+    if profiler is not None and request.endpoint == "analyze":
+        fmt = profiler.wanted(request.headers, request.args)
+        if fmt:
+            g.profile = profiler.start(fmt)
+
+
+@app.after_request
+def _save_profile(response):
+    session = g.pop("profile", None)
+    if session is not None:
+        response.headers["X-Profile"] = profiler.finish(session, request.endpoint)
+    return response
+
+
+@app.teardown_request
+def _end_request(exc):
+    if g.pop("request_started", None) is not None:
+        metrics.REQUESTS_IN_PROGRESS.dec()
+    # A request that raised never reached _save_profile
+    session = g.pop("profile", None)
+    if session is not None:
+        profiler.finish(session, request.endpoint)
+
+
+def _sync_cache_metrics() -> None:
+    if result_cache:
+        metrics.sync_cache("result", result_cache, ("hits", "misses", "evictions", "expirations"))
+    if text_cache:
+        metrics.sync_cache("text", text_cache, ("hits", "disk_hits", "misses", "evictions"))
+    metrics.sync_cache(
+        "market", job_market_api, ("hits", "stale_hits", "misses", "evictions", "expirations", "refresh_failures")
+    )
+
+
+def _cached_text(digest: str) -> tuple[str, dict | None, dict | None] | None:
+    cached = text_cache.get(digest) if text_cache else None
+    if cached is None:
+        return None
+    return cached["text"], cached["sections"], cached.get("extraction")
+
+
+def _remember_text(digest: str, extracted: Extraction) -> tuple[str, dict | None, dict]:
+    """Normalize freshly extracted text and store it (with sections) in the text cache.
+
+    Also returns what the response reports about the extraction: the page
+    count, how many pages were read and whether the page budget cut it short.
+    """
+    text = _normalize_text(extracted.text)
+    info = {"pages": extracted.pages, "pages_read": extracted.pages_read, "truncated": extracted.truncated}
+    if text_cache is None:
+        return text, None, info
+    sections = _split_sections(text) if text else None
+    text_cache.put(digest, text, sections, info)
+    return text, sections, info
+
+
+def _preflight(source: bytes | str) -> pdf_preflight.PreflightReport | None:
+    if not pdf_preflight.ENABLED:
+        return None
+    with timing.stage("preflight"):
+        return pdf_preflight.preflight(source)
+
+
+def _extract_text_from_pdf(
+    source: bytes | str, digest: str, report: pdf_preflight.PreflightReport | None = None
+) -> tuple[str, dict | None, dict | None]:
+    """Return the normalized resume text, its sections and extraction info, via the text cache.
+
+    Documents the pre-flight check rejects raise ValueError before any page
+    is parsed.
+    """
+    cached = _cached_text(digest)
+    if cached is not None:
+        return cached
+
+    report = report or _preflight(source)
+    problem = report.problem() if report else None
+    if problem:
+        raise ValueError(problem)
+    with timing.stage("pdf_extract"):
+        extracted = extract_text_pooled(
+            source, n_pages=report.pages if report and report.complete else None, budget=PAGE_BUDGET
+        )
+    return _remember_text(digest, extracted)
+
+
+def _read_pdf_upload(f) -> tuple[PDFSpool, None] | tuple[None, tuple[str, int]]:
+    """Return the spooled PDF upload, or an error message and HTTP status."""
+    spool = f.stream
+    metrics.PDF_BYTES.observe(spool.size)
+    if spool.error == "too_large":
+        return None, ("File too large (max 7MB)", 413)
+
+    content_type = (f.content_type or "").lower()
+    content_type_ok = content_type in {"application/pdf", "application/x-pdf", "application/octet-stream"}
+
+    if spool.error or not content_type_ok:
+        return None, ("Only PDF files are supported", 400)
+    return spool, None
+
+
+@app.errorhandler(413)
+def request_too_large(e):
+    return jsonify({"detail": "File too large (max 7MB)"}), 413
 
 
 @app.route('/api/health')
@@ -68,35 +243,364 @@ def analyze():
     if "file" not in request.files:
         return jsonify({"detail": "Resume PDF file is required"}), 400
 
-    f = request.files["file"]
-    raw = f.read() or b""
-    if len(raw) > 7_000_000:
-        return jsonify({"detail": "File too large (max 7MB)"}), 413
+    with timing.stage("upload"):
+        upload, error = _read_pdf_upload(request.files["file"])
+    if error:
+        return jsonify({"detail": error[0]}), error[1]
+
+    # A cached result is answered at once, however long the document
+    cache_key, body = _cached_result(upload.digest, job_title, job_description)
+    status, report = 200, None
+    if body is None:
+        if _ASYNC_PAGES:
+            report = _preflight(upload.source())
+            if report and report.complete and not report.problem() and report.pages > _ASYNC_PAGES:
+                return _enqueue(upload, job_title, job_description)
+        body, status = _run_analysis(upload.source(), job_title, job_description, upload.digest, cache_key, report)
+
+    candidate_id = (request.form.get("candidate_id") or "").strip()
+    if status == 200 and candidate_id and search_index is not None:
+        # The analysis stands even if indexing fails; say why next to it
+        error = _index_upload(candidate_id, upload, report)
+        if error:
+            body["index_error"] = error[0]
+    return jsonify(body), status
+
+
+def _analyze_pdf(
+    source: bytes | str,
+    job_title: str,
+    job_description: str,
+    digest: str | None = None,
+    report: pdf_preflight.PreflightReport | None = None,
+) -> tuple[dict, int]:
+    """Run (or fetch from cache) the full analysis of a validated PDF upload.
+
+    ``source`` is the PDF's bytes or the path of its spool file; ``digest``
+    (its SHA-256) is required for a path. ``report`` may carry the result of
+    an earlier pre-flight check.
+    """
+    digest = digest or hashlib.sha256(source).hexdigest()
+    cache_key, cached = _cached_result(digest, job_title, job_description)
+    if cached is not None:
+        return cached, 200
+    return _run_analysis(source, job_title, job_description, digest, cache_key, report)
 
-    filename = (f.filename or "").lower()
-    looks_like_pdf = raw[:5] == b"%PDF-" or filename.endswith(".pdf")
-    content_type = (f.content_type or "").lower()
-    content_type_ok = content_type in {"application/pdf", "application/x-pdf", "application/octet-stream"}
 
-    if not looks_like_pdf or not content_type_ok:
-        return jsonify({"detail": "Only PDF files are supported"}), 400
+def _cached_result(digest: str, job_title: str, job_description: str) -> tuple[str | None, dict | None]:
+    """The result cache key for an analysis (None without a cache) and its cached result, if any."""
+    if not result_cache:
+        return None, None
+    cache_key = ResultCache.make_key(digest, job_title, job_description, _EXTRACTION_TAG)
+    with timing.stage("result_cache"):
+        cached = result_cache.get(cache_key)
+    if cached is not None:
+        cached["job_title"] = job_title
+    return cache_key, cached
 
+
+def _run_analysis(
+    source: bytes | str,
+    job_title: str,
+    job_description: str,
+    digest: str,
+    cache_key: str | None,
+    report: pdf_preflight.PreflightReport | None = None,
+) -> tuple[dict, int]:
+    """Extract and score an uncached upload, storing the result under ``cache_key``."""
     try:
-        resume_text = _extract_text_from_pdf(raw)
+        resume_text, resume_sections, extraction = _extract_text_from_pdf(source, digest, report)
     except RuntimeError as e:
-        return jsonify({"detail": str(e)}), 500
+        return {"detail": str(e)}, 500
+    except ExtractionTimeout:
+        return {"detail": "PDF took too long to process. Try a simpler or shorter file."}, 422
     except ValueError as e:
-        return jsonify({"detail": str(e)}), 400
+        return {"detail": str(e)}, 400
 
     if not resume_text:
-        return jsonify({"detail": "Could not extract text from PDF (is it scanned?)"}), 400
+        return {"detail": "Could not extract text from PDF (is it scanned?)"}, 400
+
+    try:
+        result = score(resume_text, compile_job(job_title, job_description), resume_sections=resume_sections)
+    except Exception as e:  # noqa: BLE001
+        return {"detail": f"Analysis failed: {e}"}, 500
+    if extraction:
+        result["extraction"] = extraction
+
+    if cache_key:
+        result_cache.set(cache_key, result)
+
+    return result, 200
+
+
+def _run_job(payload: dict) -> tuple[dict, int]:
+    started = timing.begin()
+    try:
+        with metrics.QUEUE_BUSY.track_inprogress():
+            return _analyze_pdf(payload["file"], payload["job_title"], payload["job_description"])
+    finally:
+        metrics.observe_stages(timing.end(started))
+        metrics.QUEUE_DEPTH.set(job_queue.broker.depth())
+        _sync_cache_metrics()
+
+
+job_queue = queue_from_env(_run_job)
+metrics.QUEUE_WORKERS.set(job_queue.workers)
+
+
+@app.route('/api/jobs', methods=['POST'])
+def submit_job():
+    """Queue an analysis (same form fields as /api/analyze) and return its id at once."""
+    job_title = (request.form.get("job_title") or "").strip()
+    job_description = (request.form.get("job_description") or "").strip()
+
+    if not job_title:
+        return jsonify({"detail": "Job title is required"}), 400
+
+    if "file" not in request.files:
+        return jsonify({"detail": "Resume PDF file is required"}), 400
+
+    upload, error = _read_pdf_upload(request.files["file"])
+    if error:
+        return jsonify({"detail": error[0]}), error[1]
+    return _enqueue(upload, job_title, job_description)
+
+
+def _enqueue(upload: PDFSpool, job_title: str, job_description: str):
+    try:
+        # The job outlives this request and its spool file
+        job_id = job_queue.submit({"file": upload.read_bytes(), "job_title": job_title, "job_description": job_description})
+    except QueueFull:
+        response = jsonify({"detail": "Too many analyses in progress. Please retry shortly."})
+        response.headers["Retry-After"] = "5"
+        return response, 429
+
+    metrics.QUEUE_DEPTH.set(job_queue.broker.depth())
+    return jsonify({"id": job_id, "status": "queued", "status_url": f"/api/jobs/{job_id}"}), 202
+
+
+@app.route('/api/jobs/<job_id>')
+def job_status(job_id: str):
+    job = job_queue.status(job_id)
+    if job is None:
+        return jsonify({"detail": "Unknown job id"}), 404
+
+    body: dict = {"id": job_id, "status": job["status"]}
+    if job["status"] == "done":
+        body["result"] = job["result"]
+    elif job["status"] == "failed":
+        body["detail"] = job["result"].get("detail")
+        body["status_code"] = job["status_code"]
+    else:
+        body["queue_depth"] = job_queue.broker.depth()
+    return jsonify(body)
+
+
+@app.route('/api/analyze/batch', methods=['POST'])
+def analyze_batch():
+    """Score many resumes (form field ``files``) against one job, ranked by overall score."""
+    job_title = (request.form.get("job_title") or "").strip()
+    job_description = (request.form.get("job_description") or "").strip()
+
+    if not job_title:
+        return jsonify({"detail": "Job title is required"}), 400
+
+    files = request.files.getlist("files")
+    if not files:
+        return jsonify({"detail": "At least one resume PDF file is required"}), 400
+    if len(files) > _MAX_BATCH_FILES:
+        return jsonify({"detail": f"Too many files (max {_MAX_BATCH_FILES})"}), 413
 
     try:
-        result = analyze_resume_against_job(resume_text, job_description, job_title=job_title)
+        profile = compile_job(job_title, job_description)
     except Exception as e:  # noqa: BLE001
         return jsonify({"detail": f"Analysis failed: {e}"}), 500
 
-    return jsonify(result)
+    results: list[dict] = []
+    errors: list[dict] = []
+    pending: list[dict] = []
+    to_extract: list[tuple[int, bytes | str, int | None]] = []
+
+    for index, f in enumerate(files):
+        filename = f.filename or f"resume_{index + 1}.pdf"
+        upload, error = _read_pdf_upload(f)
+        if error:
+            errors.append({"index": index, "filename": filename, "detail": error[0]})
+            continue
+
+        digest = upload.digest
+        cache_key = ResultCache.make_key(digest, job_title, job_description, _EXTRACTION_TAG) if result_cache else None
+        cached = result_cache.get(cache_key) if cache_key else None
+        if cached is not None:
+            cached["job_title"] = job_title
+            results.append({"index": index, "filename": filename, "result": cached})
+            continue
+
+        item = {
+            "index": index,
+            "filename": filename,
+            "digest": digest,
+            "cache_key": cache_key,
+            "text": "",
+            "sections": None,
+            "extraction": None,
+            "error": None,
+        }
+        cached_text = _cached_text(digest)
+        if cached_text is not None:
+            item["text"], item["sections"], item["extraction"] = cached_text
+        else:
+            report = _preflight(upload.source())
+            problem = report.problem() if report else None
+            if problem:
+                errors.append({"index": index, "filename": filename, "detail": problem})
+                continue
+            to_extract.append((len(pending), upload.source(), report.pages if report and report.complete else None))
+        pending.append(item)
+
+    # Parse every uncached PDF in parallel worker processes
+    with timing.stage("pdf_extract"):
+        extracted_texts = extract_many(
+            [source for _, source, _ in to_extract], budget=PAGE_BUDGET, n_pages=[pages for _, _, pages in to_extract]
+        )
+    for (pos, _, _), extracted in zip(to_extract, extracted_texts):
+        item = pending[pos]
+        if isinstance(extracted, Exception):
+            item["error"] = str(extracted)
+            continue
+        item["text"], item["sections"], item["extraction"] = _remember_text(item["digest"], extracted)
+
+    for item in pending:
+        # Cached or fresh, an empty text gets the error /api/analyze gives it
+        detail = item["error"] or (None if item["text"] else "Could not extract text from PDF (is it scanned?)")
+        if detail:
+            errors.append({"index": item["index"], "filename": item["filename"], "detail": detail})
+            continue
+        try:
+            result = score(item["text"], profile, resume_sections=item["sections"])
+        except Exception as e:  # noqa: BLE001
+            errors.append({"index": item["index"], "filename": item["filename"], "detail": f"Analysis failed: {e}"})
+            continue
+        if item["extraction"]:
+            result["extraction"] = item["extraction"]
+        if item["cache_key"]:
+            result_cache.set(item["cache_key"], result)
+        results.append({"index": item["index"], "filename": item["filename"], "result": result})
+
+    results.sort(key=lambda r: (-r["result"]["overall_score"], r["index"]))
+    for rank, r in enumerate(results, 1):
+        r["rank"] = rank
+        r["overall_score"] = r["result"]["overall_score"]
+
+    errors.sort(key=lambda e: e["index"])
+    return jsonify({"job_title": job_title, "count": len(results), "results": results, "errors": errors})
+
+
+@app.route('/api/search', methods=['POST'])
+def search():
+    """Best indexed resumes for a job (JSON or form: job_title and/or job_description, top_k)."""
+    if search_index is None:
+        return jsonify({"detail": "Candidate search is not enabled"}), 404
+
+    data = request.get_json(silent=True) or request.form
+    job_title = (data.get("job_title") or "").strip()
+    job_description = (data.get("job_description") or "").strip()
+    if not job_title and not job_description:
+        return jsonify({"detail": "Job title or description is required"}), 400
+    try:
+        top_k = int(data.get("top_k") or 50)
+    except (TypeError, ValueError):
+        return jsonify({"detail": "top_k must be an integer"}), 400
+    top_k = max(1, min(top_k, _MAX_SEARCH_RESULTS))
+
+    profile = compile_job(job_title, job_description)
+    with timing.stage("search"):
+        results = search_index.search(profile, top_k)
+    return jsonify(
+        {"job_title": job_title, "indexed": len(search_index), "stale": search_index.stale, "results": results}
+    )
+
+
+@app.route('/api/search/resumes/<resume_id>', methods=['PUT', 'DELETE'])
+def index_resume(resume_id: str):
+    """Add (or replace) a resume PDF in the search index under ``resume_id``, or remove it."""
+    if search_index is None:
+        return jsonify({"detail": "Candidate search is not enabled"}), 404
+
+    if request.method == "DELETE":
+        if not search_index.delete(resume_id):
+            return jsonify({"detail": "Unknown resume id"}), 404
+        return jsonify({"id": resume_id, "deleted": True})
+
+    if "file" not in request.files:
+        return jsonify({"detail": "Resume PDF file is required"}), 400
+    upload, error = _read_pdf_upload(request.files["file"])
+    if error:
+        return jsonify({"detail": error[0]}), error[1]
+
+    error = _index_upload(resume_id, upload)
+    if error:
+        return jsonify({"detail": error[0]}), error[1]
+    return jsonify({"id": resume_id, "indexed": len(search_index)}), 201
+
+
+def _index_upload(
+    resume_id: str, upload: PDFSpool, report: pdf_preflight.PreflightReport | None = None
+) -> tuple[str, int] | None:
+    """Add an uploaded resume to the search index; (message, status) if it cannot be read."""
+    # Through the text cache, so this re-extracts only if the cache is off
+    # or the analysis came from the result cache
+    try:
+        resume_text, resume_sections, _ = _extract_text_from_pdf(upload.source(), upload.digest, report)
+    except RuntimeError as e:
+        return str(e), 500
+    except ExtractionTimeout:
+        return "PDF took too long to process. Try a simpler or shorter file.", 422
+    except ValueError as e:
+        return str(e), 400
+    if not resume_text:
+        return "Could not extract text from PDF (is it scanned?)", 400
+
+    search_index.add(resume_id, resume_text, resume_sections)
+    return None
+
+
+@app.route('/api/cache/stats')
+def cache_stats():
+    return jsonify({
+        "result_cache": result_cache.stats() if result_cache else None,
+        "text_cache": text_cache.stats() if text_cache else None,
+        "market_cache": job_market_api.cache_stats(),
+    })
+
+
+@app.route('/api/metrics')
+def prometheus_metrics():
+    """Prometheus exposition of request, stage, PDF, cache and queue metrics."""
+    metrics.QUEUE_DEPTH.set(job_queue.broker.depth())
+    payload, content_type = metrics.exposition()
+    return Response(payload, content_type=content_type)
+
+
+@app.route('/api/profiles')
+@app.route('/api/profiles/<name>')
+def profiles(name: str | None = None):
+    """List stored request profiles, or download one; needs the profiling token."""
+    supplied = request.headers.get("X-Profile-Token") or request.args.get("profile_token")
+    if profiler is None or not profiler.authorized(supplied):
+        return jsonify({"detail": "Not found"}), 404
+    if name is None:
+        return jsonify({"profiles": profiler.names()})
+    path = profiler.path(name)
+    if path is None:
+        return jsonify({"detail": "Unknown profile"}), 404
+    return send_file(path, as_attachment=True, download_name=name)
+
+
+@app.route('/api/timings')
+def timings():
+    """Per-stage latency histograms (milliseconds) of analyses served by this process."""
+    return jsonify({"enabled": timing.ENABLED, "buckets_ms": list(timing.BUCKETS_MS), "stages": timing.histograms()})
 
 
 if __name__ == "__main__":
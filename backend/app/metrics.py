@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import os
+import threading
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+)
+from prometheus_client import multiprocess
+
+from .job_queue import backend_from_env
+
+MULTIPROCESS = bool(os.environ.get("PROMETHEUS_MULTIPROC_DIR"))
+
+_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+_STAGE_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 10)
+
+REQUESTS = Counter("http_requests_total", "HTTP requests served", ["endpoint", "method", "status"])
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds", "Time to serve an HTTP request", ["endpoint"], buckets=_LATENCY_BUCKETS
+)
+REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress", "Requests being served", multiprocess_mode="livesum"
+)
+STAGE_LATENCY = Histogram(
+    "analysis_stage_duration_seconds", "Time spent in each analysis stage", ["stage"], buckets=_STAGE_BUCKETS
+)
+PDF_BYTES = Histogram(
+    "pdf_upload_bytes",
+    "Size of uploaded PDFs",
+    buckets=(10_000, 50_000, 100_000, 250_000, 500_000, 1_000_000, 2_500_000, 5_000_000, 7_000_000),
+)
+PDF_PAGES = Histogram("pdf_pages", "Pages per extracted PDF", buckets=(1, 2, 3, 5, 10, 20, 50, 100, 500))
+
+CACHE_EVENTS = Counter("cache_events_total", "Cache lookups and evictions", ["cache", "event"])
+
+# The SQLite broker's depth is shared by every worker; memory queues add up
+_SHARED_QUEUE = backend_from_env() == "sqlite"
+QUEUE_DEPTH = Gauge(
+    "job_queue_depth", "Jobs waiting in the analysis queue", multiprocess_mode="livemax" if _SHARED_QUEUE else "livesum"
+)
+QUEUE_WORKERS = Gauge("job_queue_workers", "Analysis worker threads", multiprocess_mode="livesum")
+QUEUE_BUSY = Gauge("job_queue_busy_workers", "Analysis worker threads running a job", multiprocess_mode="livesum")
+
+# cache -> {event: last value seen}, for turning the caches' own counters into increments
+_synced: dict[str, dict[str, int]] = {}
+_sync_lock = threading.Lock()
+
+
+def sync_cache(cache: str, source: object, events: tuple[str, ...]) -> None:
+    """Add what ``source``'s counter attributes grew by since the last sync.
+
+    The caches keep plain per-process counters; syncing them at the end of
+    each request turns them into Prometheus counters that sum across workers.
+    """
+    with _sync_lock:
+        seen = _synced.setdefault(cache, {})
+        for event in events:
+            value = getattr(source, event, 0)
+            delta = value - seen.get(event, 0)
+            if delta > 0:
+                CACHE_EVENTS.labels(cache, event).inc(delta)
+            seen[event] = value
+
+
+def observe_stages(timings: dict[str, float]) -> None:
+    """Record ``timing.end`` output (milliseconds per stage)."""
+    for name, ms in timings.items():
+        STAGE_LATENCY.labels(name).observe(ms / 1e3)
+
+
+def exposition() -> tuple[bytes, str]:
+    """Metrics in the Prometheus text format, with their content type.
+
+    With ``PROMETHEUS_MULTIPROC_DIR`` set (before this module is imported)
+    every gunicorn worker writes its samples there and they are aggregated
+    here; otherwise they cover this process only.
+    """
+    if MULTIPROCESS:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
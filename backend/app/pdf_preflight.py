@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from .pdf_text import PDFSource, _stream
+
+ENABLED = (os.environ.get("PDF_PREFLIGHT") or "1").strip().lower() not in {"0", "false", "no", "off"}
+MAX_PAGES = int(os.environ.get("PDF_MAX_PAGES") or 200)
+
+# Form XObjects can nest; text inside them still needs a font somewhere
+_MAX_FORM_DEPTH = 3
+
+
+@dataclass(frozen=True)
+class PreflightReport:
+    """What the cross-reference table, trailer and page tree say about a PDF.
+
+    ``pages`` counts the leaves of the page tree. ``has_fonts`` is True when
+    any page (or a form it draws) declares a font, i.e. the document has a
+    text layer. ``error`` is set when not even the cross-reference data
+    could be read; a page tree that cannot be walked leaves ``complete``
+    False instead, since the extractors may still recover the pages.
+    """
+
+    pages: int = 0
+    objects: int = 0
+    encrypted: bool = False
+    needs_password: bool = False
+    has_fonts: bool = False
+    complete: bool = True
+    error: Optional[str] = None
+
+    def problem(self, max_pages: int = MAX_PAGES) -> Optional[str]:
+        """Why the document should be rejected before extraction, or None."""
+        if self.error:
+            return f"Failed to parse PDF: {self.error}"
+        if self.needs_password:
+            return "PDF is password-protected"
+        if not self.complete:
+            return None
+        if self.pages > max_pages:
+            return f"PDF has too many pages (max {max_pages})"
+        if not self.has_fonts:
+            return "Could not extract text from PDF (is it scanned?)"
+        return None
+
+
+def _has_font(resources: Any, depth: int = 0) -> bool:
+    from pdfminer.pdftypes import PDFStream, resolve1  # type: ignore
+
+    resources = resolve1(resources)
+    if not isinstance(resources, dict):
+        return False
+    if resolve1(resources.get("Font")):
+        return True
+    if depth >= _MAX_FORM_DEPTH:
+        return False
+    xobjects = resolve1(resources.get("XObject"))
+    for ref in (xobjects or {}).values() if isinstance(xobjects, dict) else ():
+        xobj = resolve1(ref)
+        if isinstance(xobj, PDFStream) and getattr(resolve1(xobj.get("Subtype")), "name", None) == "Form":
+            if _has_font(xobj.get("Resources"), depth + 1):
+                return True
+    return False
+
+
+def _walk_pages(root: Any) -> tuple[int, bool]:
+    """Page count and whether any page has fonts, inheriting ``/Resources``."""
+    from pdfminer.pdftypes import resolve1  # type: ignore
+
+    pages, has_fonts = 0, False
+    seen: set[int] = set()
+    stack = [(root, None)]
+    while stack:
+        node, inherited = stack.pop()
+        node = resolve1(node)
+        if not isinstance(node, dict) or id(node) in seen:
+            continue
+        seen.add(id(node))
+        resources = node.get("Resources", inherited)
+        kids = resolve1(node.get("Kids"))
+        if isinstance(kids, list):
+            stack.extend((kid, resources) for kid in reversed(kids))
+            continue
+        pages += 1
+        if not has_fonts:
+            has_fonts = _has_font(resources)
+    return pages, has_fonts
+
+
+def preflight(source: PDFSource) -> PreflightReport:
+    """Inspect a PDF's structure without decoding any page content."""
+    try:
+        from pdfminer.pdfdocument import PDFDocument, PDFEncryptionError, PDFPasswordIncorrect  # type: ignore
+        from pdfminer.pdfparser import PDFParser  # type: ignore
+        from pdfminer.pdftypes import resolve1  # type: ignore
+    except ModuleNotFoundError as e:
+        raise RuntimeError(
+            "PDF parser dependency is missing. Install backend requirements (pip install -r requirements.txt)."
+        ) from e
+
+    with _stream(source) as stream:
+        try:
+            doc = PDFDocument(PDFParser(stream))
+        except PDFPasswordIncorrect:
+            return PreflightReport(encrypted=True, needs_password=True)
+        except PDFEncryptionError:
+            # A scheme pdfminer cannot decrypt; pdfium may still manage
+            return PreflightReport(encrypted=True, complete=False)
+        except Exception as e:  # noqa: BLE001
+            return PreflightReport(error=str(e) or type(e).__name__)
+
+        encrypted = doc.encryption is not None
+        objects = len({objid for xref in doc.xrefs for objid in xref.get_objids()})
+        try:
+            pages, has_fonts = _walk_pages(resolve1(doc.catalog.get("Pages")))
+        except Exception:  # noqa: BLE001
+            pages, has_fonts = 0, False
+
+    return PreflightReport(
+        pages=pages,
+        objects=objects,
+        encrypted=encrypted,
+        has_fonts=has_fonts,
+        complete=pages > 0,
+    )
@@ -0,0 +1,570 @@
+from __future__ import annotations
+
+import functools
+import io
+import logging
+import mmap
+import multiprocessing
+import os
+import queue
+import re
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Callable, Iterator, NamedTuple, Optional, Union
+
+# PDF bytes, or the path of a PDF file (read memory-mapped, never copied into
+# the pipe to a worker process)
+PDFSource = Union[bytes, str]
+
+logger = logging.getLogger(__name__)
+
+
+def _observe_pages(n_pages: int) -> None:
+    # Imported here: worker processes load this module too and must not
+    # register metrics of their own
+    from .metrics import PDF_PAGES
+
+    PDF_PAGES.observe(n_pages)
+
+
+class ExtractionTimeout(ValueError):
+    """The document did not finish extracting within its time budget."""
+
+
+class Extraction(NamedTuple):
+    text: str
+    pages: int
+    pages_read: int
+    truncated: bool
+
+
+@dataclass(frozen=True)
+class PageBudget:
+    """How much of a document to extract (0 = no limit).
+
+    With ``core_sections`` set, extraction also stops one page after the
+    one where every section the scorer weighs (summary, skills, education,
+    experience, projects) has a heading. Later pages can still move the
+    keyword and similarity scores, so this is off unless asked for.
+    """
+
+    max_pages: int = 0
+    max_chars: int = 0
+    core_sections: bool = False
+
+
+def budget_from_env() -> Optional[PageBudget]:
+    """The budget set by ``PDF_PAGE_BUDGET`` (default 10), ``PDF_CHAR_BUDGET``
+    (default 100000) and ``PDF_SECTION_EARLY_EXIT`` (default 0); None if all are off."""
+    budget = PageBudget(
+        max_pages=int(os.environ.get("PDF_PAGE_BUDGET") or 10),
+        max_chars=int(os.environ.get("PDF_CHAR_BUDGET") or 100_000),
+        core_sections=(os.environ.get("PDF_SECTION_EARLY_EXIT") or "0").strip().lower() not in {"0", "false", "no", "off"},
+    )
+    return budget if budget.max_pages > 0 or budget.max_chars > 0 or budget.core_sections else None
+
+
+def budget_tag(budget: Optional[PageBudget]) -> str:
+    """Short label for ``budget``, for the keys of anything cached from the extracted text."""
+    if budget is None:
+        return "full"
+    return f"p{budget.max_pages}-c{budget.max_chars}-s{int(budget.core_sections)}"
+
+
+PAGE_BUDGET = budget_from_env()
+
+# Headings as analyzer._section_lines recognizes them, grouped into the
+# sections analyzer._SECTION_WEIGHTS scores
+_CORE_HEADINGS = {
+    "summary": "summary",
+    "professional summary": "summary",
+    "objective": "summary",
+    "skills": "skills",
+    "technical skills": "skills",
+    "experience": "experience",
+    "work experience": "experience",
+    "education": "education",
+    "projects": "projects",
+}
+_CORE_SECTIONS = len(set(_CORE_HEADINGS.values()))
+_NON_ALPHA_RE = re.compile(r"[^a-zA-Z ]")
+
+
+class _BudgetTracker:
+    """Feeds pages in document order against a ``PageBudget``."""
+
+    def __init__(self, budget: PageBudget):
+        self.budget = budget
+        self.pages = 0
+        self.chars = 0
+        self.cut = False
+        self.exhausted = False
+        self._seen: set[str] = set()
+        self._last_page = False
+
+    def take(self, text: str) -> Optional[str]:
+        """The part of the next page to keep, or None once the budget is spent."""
+        if self.exhausted:
+            return None
+        budget = self.budget
+        self.pages += 1
+        if budget.max_chars and self.chars + len(text) >= budget.max_chars:
+            self.cut = len(text) > budget.max_chars - self.chars
+            text = text[: budget.max_chars - self.chars]
+            self.exhausted = True
+        self.chars += len(text)
+        if budget.max_pages and self.pages >= budget.max_pages:
+            self.exhausted = True
+        if budget.core_sections:
+            if self._last_page:
+                self.exhausted = True
+            else:
+                for line in text.splitlines():
+                    section = _CORE_HEADINGS.get(_NON_ALPHA_RE.sub("", line).strip().lower())
+                    if section:
+                        self._seen.add(section)
+                self._last_page = len(self._seen) == _CORE_SECTIONS
+        return text
+
+    def keep(self, pages_text: list[str]) -> list[str]:
+        kept = []
+        for text in pages_text:
+            text = self.take(text)
+            if text is None:
+                break
+            kept.append(text)
+        return kept
+
+
+@contextmanager
+def _stream(source: PDFSource) -> Iterator[Any]:
+    """Seekable binary stream over ``source``; files are memory-mapped."""
+    if isinstance(source, (bytes, bytearray)):
+        yield io.BytesIO(source)
+        return
+    with open(source, "rb") as fh, mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        yield mapped
+
+
+def _open_pdf(stream):
+    try:
+        import pdfplumber  # type: ignore
+    except ModuleNotFoundError as e:
+        raise RuntimeError(
+            "PDF parser dependency is missing. Install backend requirements (pip install -r requirements.txt)."
+        ) from e
+    return pdfplumber.open(stream)
+
+
+def _pdfplumber_pages(
+    source: PDFSource, start: int, stop: int | None, budget: PageBudget | None = None
+) -> tuple[int, list[str]]:
+    tracker = _BudgetTracker(budget) if budget else None
+    with _stream(source) as stream, _open_pdf(stream) as pdf:
+        pages_text = []
+        for page in pdf.pages[start:stop]:
+            if tracker and tracker.exhausted:
+                break
+            pages_text.append(page.extract_text() or "")
+            if tracker:
+                tracker.take(pages_text[-1])
+        return len(pdf.pages), pages_text
+
+
+# pdfium is not thread-safe
+_PDFIUM_LOCK = threading.Lock()
+
+
+def _pdfium_pages(
+    source: PDFSource, start: int, stop: int | None, budget: PageBudget | None = None
+) -> tuple[int, list[str]]:
+    import pypdfium2 as pdfium  # type: ignore
+
+    tracker = _BudgetTracker(budget) if budget else None
+    with _PDFIUM_LOCK:
+        # pdfium reads a path through its own file access, page by page
+        pdf = pdfium.PdfDocument(source)
+        try:
+            n_pages = len(pdf)
+            pages_text = []
+            for i in range(start, n_pages if stop is None else min(stop, n_pages)):
+                if tracker and tracker.exhausted:
+                    break
+                page = pdf[i]
+                textpage = page.get_textpage()
+                pages_text.append(textpage.get_text_range().replace("\r\n", "\n").replace("\r", "\n"))
+                textpage.close()
+                page.close()
+                if tracker:
+                    tracker.take(pages_text[-1])
+        finally:
+            pdf.close()
+    return n_pages, pages_text
+
+
+def _pdfminer_pages(
+    source: PDFSource, start: int, stop: int | None, budget: PageBudget | None = None
+) -> tuple[int, list[str]]:
+    from pdfminer.converter import TextConverter  # type: ignore
+    from pdfminer.layout import LAParams  # type: ignore
+    from pdfminer.pdfdocument import PDFDocument  # type: ignore
+    from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager  # type: ignore
+    from pdfminer.pdfpage import PDFPage  # type: ignore
+    from pdfminer.pdfparser import PDFParser  # type: ignore
+    from pdfminer.pdftypes import resolve1  # type: ignore
+
+    tracker = _BudgetTracker(budget) if budget else None
+    # pdfminer only takes paths and real file objects, not memory maps
+    fp = io.BytesIO(source) if isinstance(source, (bytes, bytearray)) else open(source, "rb")
+    with fp:
+        document = PDFDocument(PDFParser(fp))
+        output = io.StringIO()
+        resources = PDFResourceManager()
+        interpreter = PDFPageInterpreter(resources, TextConverter(resources, output, laparams=LAParams()))
+        pages = PDFPage.create_pages(document)
+        pages_text = []
+        seen = 0
+        for page in pages:
+            seen += 1
+            if seen <= start:
+                continue
+            if (stop is not None and seen > stop) or (tracker and tracker.exhausted):
+                break
+            interpreter.process_page(page)
+            # The converter ends every page with a form feed
+            pages_text.append(output.getvalue().rstrip("\f").strip("\n"))
+            output.seek(0)
+            output.truncate()
+            if tracker:
+                tracker.take(pages_text[-1])
+        # The page tree records its size; walk the remaining pages only if it does not
+        tree = resolve1(document.catalog.get("Pages"))
+        count = resolve1(tree.get("Count")) if isinstance(tree, dict) else None
+        n_pages = count if isinstance(count, int) and count >= seen else seen + sum(1 for _ in pages)
+    return n_pages, pages_text
+
+
+_ENGINES: dict[str, Callable[[PDFSource, int, int | None, Optional[PageBudget]], tuple[int, list[str]]]] = {
+    "pdfium": _pdfium_pages,
+    "pdfminer": _pdfminer_pages,
+    "pdfplumber": _pdfplumber_pages,
+}
+ENGINES = tuple(_ENGINES)
+
+
+def default_engine() -> str:
+    """The engine chosen by ``PDF_ENGINE`` (pdfium, pdfminer or pdfplumber; default pdfium)."""
+    return _engine_named((os.environ.get("PDF_ENGINE") or "pdfium").strip().lower())
+
+
+@functools.lru_cache(maxsize=None)
+def _engine_named(engine: str) -> str:
+    # Cached so a misconfigured engine is reported once, not per document
+    if engine in _ENGINES:
+        return engine
+    logger.warning("Unknown PDF_ENGINE %r (expected one of %s); using pdfium", engine, ", ".join(ENGINES))
+    return "pdfium"
+
+
+def _needs_fallback(text: str) -> bool:
+    """Heuristics for a page the fast engines get wrong but pdfplumber usually does not."""
+    words = text.split()
+    if not words:
+        return True
+    # Words glued together (missing spaces) or letter-spaced text (s p a c e d)
+    glued = sum(1 for w in words if len(w) > 25)
+    spaced = sum(1 for w in words if len(w) == 1 and w.isalpha())
+    return glued / len(words) > 0.05 or spaced / len(words) > 0.3
+
+
+def _extract_pages(
+    source: PDFSource, start: int, stop: int | None, engine: str, budget: PageBudget | None = None
+) -> tuple[int, list[str]]:
+    """Page count plus the text of pages ``start:stop``, falling back to pdfplumber when needed.
+
+    With a ``budget`` the engines may stop early; the pages returned are
+    whole, uncut pages, so callers can replay them through their own
+    tracker.
+    """
+    if engine != "pdfplumber":
+        try:
+            n_pages, pages_text = _ENGINES[engine](source, start, stop, budget)
+            redo = [i for i, text in enumerate(pages_text) if _needs_fallback(text)]
+            if pages_text and not redo:
+                return n_pages, pages_text
+            if pages_text and len(redo) < len(pages_text):
+                return n_pages, _redo_pages(source, start, pages_text, redo)
+        except Exception:  # noqa: BLE001
+            pass
+    return _pdfplumber_pages(source, start, stop, budget)
+
+
+def _redo_pages(source: PDFSource, start: int, pages_text: list[str], redo: list[int]) -> list[str]:
+    """``pages_text`` (pages from ``start`` on) with the pages at offsets ``redo`` re-extracted by pdfplumber."""
+    pages_text = list(pages_text)
+    with _stream(source) as stream, _open_pdf(stream) as pdf:
+        for i in redo:
+            pages_text[i] = pdf.pages[start + i].extract_text() or ""
+    return pages_text
+
+
+def _assemble(n_pages: int, pages_text: list[str], tracker: _BudgetTracker | None) -> Extraction:
+    truncated = len(pages_text) < n_pages or bool(tracker and tracker.cut)
+    return Extraction("\n".join(pages_text).strip(), n_pages, len(pages_text), truncated)
+
+
+def extract_document(source: PDFSource, engine: str | None = None, budget: PageBudget | None = None) -> Extraction:
+    """Extract the raw text of every page (or as many as ``budget`` allows), in this process.
+
+    Raises ValueError if the document cannot be parsed.
+    """
+    try:
+        n_pages, pages_text = _extract_pages(source, 0, None, engine or default_engine(), budget)
+    except Exception as e:  # noqa: BLE001
+        raise ValueError(f"Failed to parse PDF: {e}")
+    _observe_pages(n_pages)
+    tracker = _BudgetTracker(budget) if budget else None
+    return _assemble(n_pages, tracker.keep(pages_text) if tracker else pages_text, tracker)
+
+
+def extract_text(source: PDFSource, engine: str | None = None) -> str:
+    """Extract the raw text of every page, in this process.
+
+    Raises ValueError if the document cannot be parsed.
+    """
+    return extract_document(source, engine).text
+
+
+def _extract_head(
+    source: PDFSource, stop: int | None, engine: str, budget: PageBudget | None = None
+) -> tuple[int, list[str]]:
+    """Page count plus the text of the first ``stop`` pages (all if None)."""
+    return _extract_pages(source, 0, stop, engine, budget)
+
+
+def _extract_range(source: PDFSource, start: int, stop: int | None, engine: str) -> list[str]:
+    return _extract_pages(source, start, stop, engine)[1]
+
+
+def _worker_main(conn) -> None:
+    while True:
+        try:
+            fn, args = conn.recv()
+        except (EOFError, OSError):
+            return
+        try:
+            conn.send((True, fn(*args)))
+        except Exception as e:  # noqa: BLE001
+            conn.send((False, str(e)))
+
+
+class _Worker:
+    def __init__(self, ctx):
+        self.conn, child = ctx.Pipe()
+        self.proc = ctx.Process(target=_worker_main, args=(child,), daemon=True)
+        self.proc.start()
+        child.close()
+
+    def kill(self) -> None:
+        self.proc.kill()
+        self.proc.join(1)
+        self.conn.close()
+
+
+class ExtractionPool:
+    """A fixed set of extraction processes with per-document deadlines.
+
+    Documents longer than ``pages_per_task`` are split into page ranges that
+    run on several workers at once. A worker still busy when its document's
+    deadline passes is killed and replaced, so one pathological PDF cannot
+    pin a process (or the request thread waiting on it) indefinitely.
+    """
+
+    def __init__(self, size: int, timeout: float = 20.0, pages_per_task: int = 4, engine: str | None = None):
+        self.size = size
+        self.engine = engine or default_engine()
+        self.timeout = timeout
+        self.pages_per_task = max(1, pages_per_task)
+        methods = multiprocessing.get_all_start_methods()
+        self._ctx = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+        # None marks a slot whose process is started on first use
+        self._idle: queue.Queue[_Worker | None] = queue.Queue()
+        for _ in range(size):
+            self._idle.put(None)
+
+    def _ready(self, worker: _Worker | None) -> _Worker:
+        return worker if worker is not None and worker.proc.is_alive() else _Worker(self._ctx)
+
+    def _acquire(self, deadline: float | None) -> _Worker:
+        try:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            return self._ready(self._idle.get(timeout=timeout))
+        except queue.Empty:
+            raise ExtractionTimeout("PDF extraction timed out waiting for a free worker") from None
+
+    def _try_acquire(self) -> _Worker | None:
+        try:
+            return self._ready(self._idle.get_nowait())
+        except queue.Empty:
+            return None
+
+    def _release(self, worker: _Worker) -> None:
+        self._idle.put(worker)
+
+    def _discard(self, worker: _Worker) -> None:
+        worker.kill()
+        self._idle.put(None)
+
+    def _collect(self, worker: _Worker, deadline: float | None) -> tuple[bool, Any]:
+        """The worker's ``(ok, value)`` reply; a parse error comes back as ``(False, message)``."""
+        remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+        if not worker.conn.poll(remaining):
+            raise ExtractionTimeout("PDF extraction timed out")
+        return worker.conn.recv()
+
+    def _run(self, fn: Callable, args: tuple, deadline: float | None) -> Any:
+        worker = self._acquire(deadline)
+        try:
+            worker.conn.send((fn, args))
+            ok, value = self._collect(worker, deadline)
+        except BaseException:
+            # Timed out, exited or interrupted mid-task: its state is unknown
+            self._discard(worker)
+            raise
+        # A worker that reported a parse error is healthy and goes back to the pool
+        self._release(worker)
+        if not ok:
+            raise ValueError(f"Failed to parse PDF: {value}")
+        return value
+
+    def extract(
+        self,
+        source: PDFSource,
+        timeout: float | None = None,
+        n_pages: int | None = None,
+        budget: PageBudget | None = None,
+    ) -> Extraction:
+        """Extract every page's text, splitting long documents across workers.
+
+        With ``n_pages`` already known (from the pre-flight check) every page
+        range is dispatched at once instead of after the first one returns.
+        Page ranges come back in order; once ``budget`` is spent no further
+        ones are dispatched.
+        """
+        timeout = self.timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout if timeout and timeout > 0 else None
+        # With a single worker there is nothing to gain from splitting
+        step = self.pages_per_task if self.size > 1 else None
+        tracker = _BudgetTracker(budget) if budget else None
+
+        def last_page(n: int) -> int:
+            return min(n, budget.max_pages) if budget and budget.max_pages else n
+
+        if step and n_pages:
+            head: list[str] = []
+            starts = range(0, last_page(n_pages), step)
+        else:
+            try:
+                n_pages, head = self._run(_extract_head, (source, step, self.engine, budget), deadline)
+            except (EOFError, OSError) as e:
+                raise ValueError(f"Failed to parse PDF: worker exited ({e})") from e
+            starts = range(step, last_page(n_pages), step) if step else range(0)
+        _observe_pages(n_pages)
+        pages_text = tracker.keep(head) if tracker else head
+
+        # Without a page budget the last range is left open in case the page count was low
+        end = last_page(n_pages)
+        final_stop = None if end == n_pages else end
+        ranges = deque((start, start + step if start + step < end else final_stop) for start in starts)
+        inflight: deque[_Worker] = deque()
+        try:
+            while True:
+                if tracker and tracker.exhausted:
+                    ranges.clear()
+                if not ranges and not inflight:
+                    break
+                if ranges:
+                    # Never block on a new worker while holding others: collect first
+                    worker = self._try_acquire() if inflight else self._acquire(deadline)
+                    if worker is not None:
+                        start, stop = ranges.popleft()
+                        inflight.append(worker)
+                        worker.conn.send((_extract_range, (source, start, stop, self.engine)))
+                        continue
+                ok, chunk = self._collect(inflight[0], deadline)
+                self._release(inflight.popleft())
+                if not ok:
+                    raise ValueError(f"Failed to parse PDF: {chunk}")
+                pages_text += tracker.keep(chunk) if tracker else chunk
+        except (EOFError, OSError) as e:
+            raise ValueError(f"Failed to parse PDF: worker exited ({e})") from e
+        finally:
+            # Anything still running belongs to a failed or timed-out document
+            for worker in inflight:
+                self._discard(worker)
+
+        return _assemble(n_pages, pages_text, tracker)
+
+
+_POOL: ExtractionPool | None = None
+_POOL_LOCK = threading.Lock()
+
+
+def _pool() -> ExtractionPool | None:
+    """The process-wide extraction pool, configured by ``PDF_*`` environment variables.
+
+    PDF_WORKERS:         extraction processes (default min(4, CPUs); 0 extracts in-process)
+    PDF_TIMEOUT_SECONDS: per-document deadline (default 20)
+    PDF_PAGES_PER_TASK:  page-range size for splitting long documents (default 4)
+    PDF_ENGINE:          see ``default_engine``
+    """
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is None:
+            workers = os.environ.get("PDF_WORKERS")
+            size = int(workers) if workers else min(4, os.cpu_count() or 1)
+            if size <= 0:
+                return None
+            _POOL = ExtractionPool(
+                size,
+                timeout=float(os.environ.get("PDF_TIMEOUT_SECONDS") or 20),
+                pages_per_task=int(os.environ.get("PDF_PAGES_PER_TASK") or 4),
+            )
+        return _POOL
+
+
+def extract_text_pooled(
+    source: PDFSource, n_pages: int | None = None, budget: PageBudget | None = None
+) -> Extraction:
+    """Extract on the shared process pool (or in-process if it is disabled)."""
+    pool = _pool()
+    if pool is None:
+        return extract_document(source, budget=budget)
+    return pool.extract(source, n_pages=n_pages, budget=budget)
+
+
+def extract_many(
+    documents: list[PDFSource], budget: PageBudget | None = None, n_pages: list[int | None] | None = None
+) -> list[Extraction | ValueError]:
+    """Extract several PDFs in parallel on the shared process pool.
+
+    ``n_pages`` may give each document's page count, as the pre-flight
+    check found it (None where unknown). Results come back in input order;
+    a document that fails to parse yields its ValueError instead of raising.
+    """
+    def one(doc: PDFSource, pages: int | None) -> Extraction | ValueError:
+        try:
+            return extract_text_pooled(doc, n_pages=pages, budget=budget)
+        except ValueError as e:
+            return e
+
+    counts = n_pages if n_pages is not None else [None] * len(documents)
+    pool = _pool()
+    if len(documents) <= 1 or pool is None:
+        return [one(doc, pages) for doc, pages in zip(documents, counts)]
+    with ThreadPoolExecutor(max_workers=pool.size) as threads:
+        return list(threads.map(one, documents, counts))
@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+import cProfile
+import hmac
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Mapping, Optional, Union
+
+FORMATS = ("pstats", "speedscope")
+
+# Only one deterministic profiler can be active per process on newer Pythons
+_CPROFILE_LOCK = threading.Lock()
+
+
+class _DeterministicSession:
+    """cProfile around the request thread, saved as a pstats file."""
+
+    suffix = ".pstats"
+
+    def __init__(self):
+        self._profile = cProfile.Profile()
+        self._profile.enable()
+
+    def stop(self, path: Path) -> None:
+        try:
+            self._profile.disable()
+        finally:
+            _CPROFILE_LOCK.release()
+        self._profile.dump_stats(str(path))
+
+
+class _SamplingSession:
+    """Samples the request thread's stack from a helper thread; saved as speedscope JSON."""
+
+    suffix = ".speedscope.json"
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._thread_id = threading.get_ident()
+        self._frames: dict[tuple[str, str, int], int] = {}
+        self._samples: list[list[int]] = []
+        self._weights: list[float] = []
+        self._done = threading.Event()
+        self._started = time.perf_counter()
+        self._sampler = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+        self._sampler.start()
+
+    def _run(self) -> None:
+        last = time.perf_counter()
+        while not self._done.wait(self.interval):
+            frame = sys._current_frames().get(self._thread_id)
+            now = time.perf_counter()
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                key = (code.co_name, code.co_filename, code.co_firstlineno)
+                index = self._frames.get(key)
+                if index is None:
+                    index = self._frames[key] = len(self._frames)
+                stack.append(index)
+                frame = frame.f_back
+            stack.reverse()
+            self._samples.append(stack)
+            self._weights.append(now - last)
+            last = now
+
+    def stop(self, path: Path) -> None:
+        self._done.set()
+        self._sampler.join()
+        elapsed = time.perf_counter() - self._started
+        doc = {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "shared": {"frames": [{"name": n, "file": f, "line": line} for n, f, line in self._frames]},
+            "profiles": [
+                {
+                    "type": "sampled",
+                    "name": path.name,
+                    "unit": "seconds",
+                    "startValue": 0,
+                    "endValue": elapsed,
+                    "samples": self._samples,
+                    "weights": self._weights,
+                }
+            ],
+        }
+        path.write_text(json.dumps(doc), encoding="utf-8")
+
+
+Session = Union[_DeterministicSession, _SamplingSession]
+
+
+class RequestProfiler:
+    """Profiles opted-in or randomly sampled requests into a rotating directory.
+
+    A request opts in by sending ``token`` (``X-Profile-Token`` header or
+    ``profile_token`` query parameter) and may pick the format with
+    ``X-Profile`` / ``profile``: ``pstats`` (cProfile, the default) or
+    ``speedscope`` (stack sampling). A ``sample_rate`` fraction of the other
+    requests is profiled by stack sampling, which adds little overhead.
+    Only the newest ``keep`` profiles are kept.
+    """
+
+    def __init__(
+        self,
+        directory: Union[str, Path],
+        token: Optional[str] = None,
+        sample_rate: float = 0.0,
+        keep: int = 100,
+        interval: float = 0.005,
+    ):
+        self.directory = Path(directory)
+        self.token = token
+        self.sample_rate = sample_rate
+        self.keep = keep
+        self.interval = interval
+        self._lock = threading.Lock()
+
+    def authorized(self, supplied: Optional[str]) -> bool:
+        return bool(self.token and supplied and hmac.compare_digest(supplied.encode(), self.token.encode()))
+
+    def wanted(self, headers: Mapping[str, str], args: Mapping[str, str]) -> Optional[str]:
+        """Format to profile this request in, or None to leave it alone."""
+        if self.authorized(headers.get("X-Profile-Token") or args.get("profile_token")):
+            fmt = (headers.get("X-Profile") or args.get("profile") or "pstats").strip().lower()
+            return fmt if fmt in FORMATS else "pstats"
+        if self.sample_rate > 0 and random.random() < self.sample_rate:
+            return "speedscope"
+        return None
+
+    def start(self, fmt: str) -> Session:
+        # A second concurrent cProfile request falls back to sampling
+        if fmt == "pstats" and _CPROFILE_LOCK.acquire(blocking=False):
+            try:
+                return _DeterministicSession()
+            except BaseException:
+                _CPROFILE_LOCK.release()
+                raise
+        return _SamplingSession(self.interval)
+
+    def finish(self, session: Session, label: str) -> str:
+        """Stop ``session``, store the profile and return its file name."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        name = f"{time.strftime('%Y%m%dT%H%M%S')}-{label}-{uuid.uuid4().hex[:8]}{session.suffix}"
+        session.stop(self.directory / name)
+        self._rotate()
+        return name
+
+    def path(self, name: str) -> Optional[Path]:
+        """Stored profile called ``name``, or None (names never leave the directory)."""
+        path = self.directory / name
+        if Path(name).name != name or not path.is_file():
+            return None
+        return path
+
+    def names(self) -> list[str]:
+        """Stored profiles, newest first."""
+        return [p.name for p in self._files()]
+
+    def _files(self) -> list[Path]:
+        try:
+            files = [p for p in self.directory.iterdir() if p.is_file()]
+        except FileNotFoundError:
+            return []
+        return sorted(files, key=lambda p: p.stat().st_mtime, reverse=True)
+
+    def _rotate(self) -> None:
+        with self._lock:
+            for old in self._files()[self.keep :]:
+                try:
+                    old.unlink()
+                except FileNotFoundError:
+                    pass
+
+
+def profiler_from_env() -> Optional[RequestProfiler]:
+    """Build the request profiler configured by ``PROFILE_*`` environment variables.
+
+    PROFILE_TOKEN:       admin token that lets a request ask to be profiled
+    PROFILE_SAMPLE_RATE: fraction of requests profiled at random (default 0)
+    PROFILE_DIR:         where profiles are written (default: a temp subdirectory)
+    PROFILE_KEEP:        newest profiles kept (default 100)
+
+    Returns None (no per-request cost at all) when neither a token nor a
+    sample rate is set.
+    """
+    token = os.environ.get("PROFILE_TOKEN") or None
+    rate = float(os.environ.get("PROFILE_SAMPLE_RATE") or 0)
+    if not token and rate <= 0:
+        return None
+    return RequestProfiler(
+        os.environ.get("PROFILE_DIR") or Path(tempfile.gettempdir()) / "resume-analyzer-profiles",
+        token=token,
+        sample_rate=rate,
+        keep=int(os.environ.get("PROFILE_KEEP") or 100),
+    )
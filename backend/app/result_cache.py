@@ -0,0 +1,232 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional, Protocol
+
+
+# Bump when the analysis output changes so persisted entries are not reused.
+_KEY_VERSION = "v3"
+
+
+class CacheBackend(Protocol):
+    def get(self, key: str) -> Optional[bytes]: ...
+
+    def set(self, key: str, value: bytes) -> int:
+        """Store ``value`` and return the number of entries evicted to make room."""
+        ...
+
+    def __len__(self) -> int: ...
+
+
+class MemoryBackend:
+    """In-process LRU, bounded by entry count."""
+
+    def __init__(self, max_entries: int = 512):
+        self.max_entries = max_entries
+        self._data: OrderedDict[str, bytes] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: bytes) -> int:
+        evicted = 0
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                evicted += 1
+        return evicted
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class SQLiteBackend:
+    """On-disk LRU shared by every worker process on the host."""
+
+    def __init__(self, path: str, max_entries: int = 10_000):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=5, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value BLOB NOT NULL, accessed REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS cache_accessed ON cache (accessed)")
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM cache WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            self._conn.execute("UPDATE cache SET accessed = ? WHERE key = ?", (time.time(), key))
+            return bytes(row[0])
+
+    def set(self, key: str, value: bytes) -> int:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, accessed) VALUES (?, ?, ?)", (key, value, time.time())
+            )
+            (count,) = self._conn.execute("SELECT COUNT(*) FROM cache").fetchone()
+            excess = count - self.max_entries
+            if excess > 0:
+                self._conn.execute(
+                    "DELETE FROM cache WHERE key IN (SELECT key FROM cache ORDER BY accessed LIMIT ?)", (excess,)
+                )
+            return max(0, excess)
+
+    def __len__(self) -> int:
+        with self._lock:
+            (count,) = self._conn.execute("SELECT COUNT(*) FROM cache").fetchone()
+            return count
+
+
+class RedisBackend:
+    """LRU on any Redis-compatible client (get/set/delete/zadd/zcard/zpopmin).
+
+    Recency is tracked in a sorted set next to the values so the entry bound
+    holds regardless of the server's ``maxmemory-policy``.
+    """
+
+    def __init__(self, client: Any, max_entries: int = 10_000, prefix: str = "resume-analyzer:result:"):
+        self.client = client
+        self.max_entries = max_entries
+        self.prefix = prefix
+        self._lru_key = prefix + "__lru__"
+
+    def get(self, key: str) -> Optional[bytes]:
+        value = self.client.get(self.prefix + key)
+        if value is not None:
+            self.client.zadd(self._lru_key, {key: time.time()})
+        return value
+
+    def set(self, key: str, value: bytes) -> int:
+        self.client.set(self.prefix + key, value)
+        self.client.zadd(self._lru_key, {key: time.time()})
+        excess = self.client.zcard(self._lru_key) - self.max_entries
+        if excess <= 0:
+            return 0
+        oldest = self.client.zpopmin(self._lru_key, excess)
+        for old_key, _ in oldest:
+            if isinstance(old_key, bytes):
+                old_key = old_key.decode("utf-8")
+            self.client.delete(self.prefix + old_key)
+        return len(oldest)
+
+    def __len__(self) -> int:
+        return int(self.client.zcard(self._lru_key))
+
+
+class ResultCache:
+    """Analysis results keyed by PDF content plus job title and description.
+
+    Results embed market data, which may have been fallback or stale data
+    when they were stored, so entries older than ``ttl`` seconds (0: no
+    limit) count as misses.
+    """
+
+    def __init__(self, backend: CacheBackend, ttl: float = 3600.0):
+        self.backend = backend
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(file_digest: str, job_title: str, job_description: str, variant: str = "") -> str:
+        """``file_digest`` is the hex SHA-256 of the uploaded PDF; ``variant``
+        names how its text was extracted (see ``pdf_text.budget_tag``)."""
+        h = hashlib.sha256()
+        h.update(_KEY_VERSION.encode())
+        h.update(file_digest.encode("ascii"))
+        for part in (variant, job_title.strip().lower(), job_description.strip()):
+            h.update(b"\0")
+            h.update(part.encode("utf-8"))
+        return h.hexdigest()
+
+    def get(self, key: str) -> Optional[dict]:
+        result, age = None, 0.0
+        try:
+            raw = self.backend.get(key)
+            if raw is not None:
+                entry = json.loads(raw)
+                result, age = entry["result"], time.time() - entry["stored"]
+        except Exception:  # noqa: BLE001
+            # An unreachable backend and a corrupt entry are both misses
+            result = None
+        expired = result is not None and self.ttl > 0 and age > self.ttl
+        with self._lock:
+            if result is None or expired:
+                self.misses += 1
+                self.expirations += expired
+                return None
+            self.hits += 1
+        return result
+
+    def set(self, key: str, result: dict) -> None:
+        entry = {"stored": time.time(), "result": result}
+        try:
+            evicted = self.backend.set(key, json.dumps(entry, separators=(",", ":")).encode("utf-8"))
+        except Exception:  # noqa: BLE001
+            # A broken cache must never fail the request it was meant to speed up
+            return
+        with self._lock:
+            self.evictions += evicted
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        try:
+            size = len(self.backend)
+        except Exception:  # noqa: BLE001
+            size = None
+        return {
+            "backend": type(self.backend).__name__,
+            "size": size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+def cache_from_env() -> Optional[ResultCache]:
+    """Build the result cache configured by ``RESULT_CACHE_*`` environment variables.
+
+    RESULT_CACHE_BACKEND: memory (default), sqlite, redis or none
+    RESULT_CACHE_SIZE:    maximum number of entries
+    RESULT_CACHE_TTL_SECONDS: how long a result is served (default 3600, as market data; 0 forever)
+    RESULT_CACHE_PATH:    SQLite file (sqlite backend)
+    RESULT_CACHE_URL:     redis:// URL (redis backend)
+    """
+    kind = (os.environ.get("RESULT_CACHE_BACKEND") or "memory").strip().lower()
+    size = int(os.environ.get("RESULT_CACHE_SIZE") or 512)
+    ttl = float(os.environ.get("RESULT_CACHE_TTL_SECONDS") or 3600)
+
+    if kind in {"none", "off", "disabled"}:
+        return None
+    if kind == "sqlite":
+        path = os.environ.get("RESULT_CACHE_PATH") or "result_cache.sqlite3"
+        return ResultCache(SQLiteBackend(path, max_entries=size), ttl=ttl)
+    if kind == "redis":
+        try:
+            import redis  # type: ignore
+        except ModuleNotFoundError as e:
+            raise RuntimeError("RESULT_CACHE_BACKEND=redis requires the 'redis' package (pip install redis).") from e
+        url = os.environ.get("RESULT_CACHE_URL") or "redis://localhost:6379/0"
+        return ResultCache(RedisBackend(redis.Redis.from_url(url), max_entries=size), ttl=ttl)
+    return ResultCache(MemoryBackend(max_entries=size), ttl=ttl)
@@ -0,0 +1,672 @@
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Iterable, Optional
+
+import numpy as np
+from scipy import sparse
+
+from . import tfidf_model
+from .analyzer import (
+    JobProfile,
+    ResumeDocument,
+    _skill_vocabulary,
+    _tfidf_similarity,
+    _fuzzy_match,
+    _tokenize,
+    _top_keywords,
+    compile_job,
+)
+from .batch_scoring import (
+    SkillSpace,
+    load_resumes,
+    overall_scores,
+    percent,
+    section_scores,
+    skills_block_entries,
+    top_rows,
+)
+from .skill_matcher import FuzzyIndex
+
+# Rows read per query when fetching resume text
+_FETCH_CHUNK = 500
+# Rows loaded between compactions when a worker catches up with the file
+_LOAD_CHUNK = 10_000
+# Rows checked against their text between threshold updates
+_CHECK_CHUNK = 256
+# Bits per resume in the trigram signature (a power of two)
+_SIGNATURE_BITS = 1 << 12
+# Job skill phrases up to this long are fuzzy-matched through posting lists
+# of each resume's short tokens and skills-section entries
+_SHORT_PHRASE = 7
+# Deleted and re-indexed rows are dropped from memory once they make up this
+# fraction of the rows held
+_DEAD_FRACTION = 0.25
+
+
+class _Column:
+    """Growable numpy array (capacity doubles as it fills)."""
+
+    __slots__ = ("data", "n")
+
+    def __init__(self, dtype, capacity: int = 8, width: Optional[int] = None):
+        self.data = np.zeros((capacity,) if width is None else (capacity, width), dtype=dtype)
+        self.n = 0
+
+    def _reserve(self, n: int) -> None:
+        if n > len(self.data):
+            grown = np.zeros((max(n, 2 * len(self.data)),) + self.data.shape[1:], dtype=self.data.dtype)
+            grown[: self.n] = self.data[: self.n]
+            self.data = grown
+
+    def append(self, value) -> None:
+        self._reserve(self.n + 1)
+        self.data[self.n] = value
+        self.n += 1
+
+    def extend(self, values) -> None:
+        self._reserve(self.n + len(values))
+        self.data[self.n : self.n + len(values)] = values
+        self.n += len(values)
+
+    def take(self, rows: np.ndarray) -> None:
+        """Keep only the entries at ``rows``, in that order."""
+        kept = self.values[rows]
+        self.data = np.zeros((max(8, len(kept)),) + kept.shape[1:], dtype=kept.dtype)
+        self.data[: len(kept)] = kept
+        self.n = len(kept)
+
+    @property
+    def values(self) -> np.ndarray:
+        return self.data[: self.n]
+
+
+def _trigram_bits(text: str) -> np.ndarray:
+    """Signature bit of each byte trigram of ``text`` (UTF-8)."""
+    b = np.frombuffer(text.encode("utf-8"), dtype=np.uint8).astype(np.uint32)
+    grams = (b[:-2] << 16) | (b[1:-1] << 8) | b[2:]
+    # Fibonacci hashing: the top bits of the product pick the signature bit
+    shift = 32 - (_SIGNATURE_BITS.bit_length() - 1)
+    return (grams * np.uint32(2654435769)) >> np.uint32(shift)
+
+
+def _signature(doc: ResumeDocument) -> bytes:
+    """Trigram bitset of a resume's text and skills section: a substring test with false positives only."""
+    bits = np.zeros(_SIGNATURE_BITS, dtype=bool)
+    bits[_trigram_bits(doc.lower)] = True
+    bits[_trigram_bits(doc.section("skills", "technical skills").lower())] = True
+    return np.packbits(bits).tobytes()
+
+
+def _fingerprint() -> str:
+    """Identifies the TF-IDF model and skill vocabulary that stored features were computed with."""
+    vocab = tfidf_model.get_vectorizer().vocabulary_
+    terms = [sorted(vocab, key=vocab.get), sorted(_skill_vocabulary())]
+    return hashlib.sha256(json.dumps(terms).encode("utf-8")).hexdigest()
+
+
+class CandidateIndex:
+    """Analyzed resumes, searchable by job: the top K by the overall score ``score()`` gives.
+
+    Resumes live in a SQLite file with their text, section split and the
+    features scoring needs, so every worker on a host shares one index and
+    picks up the others' additions and deletions before each search. In
+    memory a worker holds TF-IDF postings (a CSC matrix plus a tail of
+    recent rows), posting lists of each resume's matched skills and top
+    keywords, and per-resume section scores. A search traverses the
+    postings of the job's terms, skills and keywords once.
+
+    Job skills outside the skill vocabulary, and the token-overlap fallback
+    for texts without TF-IDF terms, depend on the resume text. A signature
+    of the text's trigrams and posting lists of its short tokens and
+    skills-section entries bound those scores; the text is read and scored
+    exactly only for resumes whose upper bound still reaches the K-th best
+    lower bound.
+    """
+
+    def __init__(self, path: str, compact_every: int = 1024):
+        self.path = path
+        self.compact_every = compact_every
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(path, timeout=10, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS resumes ("
+            " seq INTEGER PRIMARY KEY AUTOINCREMENT, id TEXT NOT NULL UNIQUE, text TEXT NOT NULL, sections TEXT,"
+            " tfidf_indices BLOB NOT NULL, tfidf_data BLOB NOT NULL, skills TEXT NOT NULL, keywords TEXT NOT NULL,"
+            " section_with INTEGER NOT NULL, section_without INTEGER NOT NULL, always_skills INTEGER NOT NULL,"
+            " n_tokens INTEGER NOT NULL, short_terms TEXT NOT NULL, signature BLOB NOT NULL, added REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS deletions (seq INTEGER PRIMARY KEY AUTOINCREMENT, resume_seq INTEGER NOT NULL)"
+        )
+        self._conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+
+        self._space = SkillSpace(_skill_vocabulary())
+        self._width = len(tfidf_model.get_vectorizer().vocabulary_)
+        fingerprint = _fingerprint()
+        self._conn.execute("INSERT OR IGNORE INTO meta (key, value) VALUES ('features', ?)", (fingerprint,))
+        (stored,) = self._conn.execute("SELECT value FROM meta WHERE key = 'features'").fetchone()
+        # Features from another model or vocabulary score wrongly until rebuilt
+        self.stale = stored != fingerprint
+
+        self._seq = 0
+        self._deletion_seq = 0
+        self._ids: list[Optional[str]] = []
+        self._seqs: list[int] = []
+        self._row_of_seq: dict[int, int] = {}
+        self._row_of_id: dict[str, int] = {}
+        self._dead = 0
+        self._alive = _Column(bool)
+        self._section_with = _Column(np.int64)
+        self._section_without = _Column(np.int64)
+        self._always_skills = _Column(bool)
+        self._no_terms = _Column(bool)
+        self._n_tokens = _Column(np.int64)
+        self._signatures = _Column(np.uint8, width=_SIGNATURE_BITS // 8)
+        self._skill_postings: dict[str, _Column] = {}
+        self._keyword_postings: dict[str, _Column] = {}
+        self._term_postings: dict[str, _Column] = {}
+        # Characters of the indexed short terms, to enumerate a phrase's neighbours
+        self._alphabet: set[str] = set()
+        self._main = sparse.csc_matrix((0, self._width))
+        self._tail: list[tuple[np.ndarray, np.ndarray]] = []
+        self._tail_matrix: Optional[sparse.csc_matrix] = None
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._sync()
+            return len(self._row_of_id)
+
+    def __contains__(self, resume_id: object) -> bool:
+        with self._lock:
+            self._sync()
+            return resume_id in self._row_of_id
+
+    def _features(self, resume_id: str, text: str, sections: Optional[dict] = None) -> tuple:
+        doc = ResumeDocument.parse(text, sections)
+        vec = tfidf_model.get_vectorizer().transform([doc.text]).tocsr()
+        vec.sort_indices()
+        skills = sorted(self._space.terms[c] for c in self._space.columns(doc))
+        keywords = sorted({w.lower() for w in _top_keywords(doc, limit=20)})
+        with_skills, without_skills, always = section_scores(doc)
+        # Anything within one edit of a short phrase is at most one character longer
+        short_terms = {t for t in doc.token_counts if len(t) <= _SHORT_PHRASE + 1}
+        short_terms |= {p for p in skills_block_entries(doc) if len(p) <= _SHORT_PHRASE + 1}
+        return (
+            resume_id,
+            doc.text,
+            json.dumps(doc.sections),
+            vec.indices.astype(np.int32).tobytes(),
+            vec.data.astype(np.float64).tobytes(),
+            "\n".join(skills),
+            "\n".join(keywords),
+            with_skills,
+            without_skills,
+            int(always),
+            len(set(_tokenize(doc.text))),
+            json.dumps(sorted(short_terms)),
+            _signature(doc),
+            time.time(),
+        )
+
+    def add(self, resume_id: str, text: str, sections: Optional[dict] = None) -> None:
+        """Index (or re-index) one resume. ``sections`` may carry its cached ``_split_sections``."""
+        self.add_many([(resume_id, text, sections)])
+
+    def add_many(self, resumes: Iterable[tuple[str, str, Optional[dict]]]) -> int:
+        """Index several resumes in one transaction; return how many. Identical resumes are parsed once."""
+        features: dict[tuple[str, str], tuple] = {}
+        rows = []
+        for resume_id, text, sections in resumes:
+            key = (text, json.dumps(sections, sort_keys=True))
+            if key not in features:
+                features[key] = self._features(resume_id, text, sections)
+            rows.append((resume_id, *features[key][1:]))
+        return self._write(rows)
+
+    def _write(self, rows: list[tuple]) -> int:
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                for row in rows:
+                    self._delete_row(row[0])
+                    self._conn.execute(
+                        "INSERT INTO resumes (id, text, sections, tfidf_indices, tfidf_data, skills, keywords,"
+                        " section_with, section_without, always_skills, n_tokens, short_terms, signature, added)"
+                        " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        row,
+                    )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._sync()
+        return len(rows)
+
+    def delete(self, resume_id: str) -> bool:
+        """Drop a resume from the index; False if it was not indexed."""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                deleted = self._delete_row(resume_id)
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._sync()
+        return deleted
+
+    def _delete_row(self, resume_id: str) -> bool:
+        # Caller holds the lock inside a transaction
+        row = self._conn.execute("DELETE FROM resumes WHERE id = ? RETURNING seq", (resume_id,)).fetchone()
+        if row is None:
+            return False
+        self._conn.execute("INSERT INTO deletions (resume_seq) VALUES (?)", row)
+        return True
+
+    def _sync(self) -> None:
+        """Load rows added and apply deletions made (by any process) since the last sync."""
+        # Caller holds the lock
+        cursor = self._conn.execute(
+            "SELECT seq, id, tfidf_indices, tfidf_data, skills, keywords, section_with, section_without,"
+            " always_skills, n_tokens, short_terms, signature FROM resumes WHERE seq > ? ORDER BY seq",
+            (self._seq,),
+        )
+        while True:
+            rows = cursor.fetchmany(_LOAD_CHUNK)
+            if not rows:
+                break
+            self._append(rows)
+            if len(self._tail) >= self.compact_every:
+                self._compact()
+        deletions = self._conn.execute(
+            "SELECT seq, resume_seq FROM deletions WHERE seq > ? ORDER BY seq", (self._deletion_seq,)
+        ).fetchall()
+        for seq, resume_seq in deletions:
+            self._deletion_seq = seq
+            row = self._row_of_seq.pop(resume_seq, None)
+            if row is not None:
+                self._kill(row)
+        if self._dead > _DEAD_FRACTION * len(self._ids):
+            self._purge()
+
+    def _append(self, rows: list[tuple]) -> None:
+        # Posting lists grow once per term per sync, not once per resume
+        new_skills: dict[str, list[int]] = {}
+        new_keywords: dict[str, list[int]] = {}
+        new_terms: dict[str, list[int]] = {}
+        for (
+            seq,
+            resume_id,
+            indices,
+            data,
+            skills,
+            keywords,
+            with_skills,
+            without_skills,
+            always,
+            n_tokens,
+            short_terms,
+            signature,
+        ) in rows:
+            old = self._row_of_id.get(resume_id)
+            if old is not None:
+                self._kill(old)
+            row = len(self._ids)
+            self._seq = seq
+            self._ids.append(resume_id)
+            self._seqs.append(seq)
+            self._row_of_seq[seq] = row
+            self._row_of_id[resume_id] = row
+
+            indices = np.frombuffer(indices, dtype=np.int32)
+            self._tail.append((indices, np.frombuffer(data, dtype=np.float64)))
+            self._tail_matrix = None
+            for term in skills.split("\n") if skills else ():
+                new_skills.setdefault(term, []).append(row)
+            for term in keywords.split("\n") if keywords else ():
+                new_keywords.setdefault(term, []).append(row)
+            for term in json.loads(short_terms):
+                new_terms.setdefault(term, []).append(row)
+            self._alive.append(True)
+            self._section_with.append(with_skills)
+            self._section_without.append(without_skills)
+            self._always_skills.append(bool(always))
+            self._no_terms.append(not len(indices))
+            self._n_tokens.append(n_tokens)
+            self._signatures.append(np.frombuffer(signature, dtype=np.uint8))
+
+        self._alphabet.update("".join(new_terms))
+        for postings, new in (
+            (self._skill_postings, new_skills),
+            (self._keyword_postings, new_keywords),
+            (self._term_postings, new_terms),
+        ):
+            for term, term_rows in new.items():
+                column = postings.get(term)
+                if column is None:
+                    column = postings[term] = _Column(np.int32)
+                column.extend(term_rows)
+
+    def _kill(self, row: int) -> None:
+        # Deleted rows stay in the postings, masked out, until _purge drops them
+        resume_id = self._ids[row]
+        if resume_id is not None and self._row_of_id.get(resume_id) == row:
+            del self._row_of_id[resume_id]
+        self._ids[row] = None
+        if self._alive.data[row]:
+            self._alive.data[row] = False
+            self._dead += 1
+
+    def _purge(self) -> None:
+        """Drop dead rows from memory and renumber the live ones."""
+        # Caller holds the lock
+        keep = np.flatnonzero(self._alive.values)
+        renumber = np.full(len(self._ids), -1, dtype=np.int64)
+        renumber[keep] = np.arange(len(keep))
+
+        self._compact()
+        self._main = self._main[keep]
+        self._ids = [self._ids[row] for row in keep]
+        self._seqs = [self._seqs[row] for row in keep]
+        self._row_of_seq = {seq: row for row, seq in enumerate(self._seqs)}
+        self._row_of_id = {resume_id: row for row, resume_id in enumerate(self._ids)}
+        for column in (
+            self._alive,
+            self._section_with,
+            self._section_without,
+            self._always_skills,
+            self._no_terms,
+            self._n_tokens,
+            self._signatures,
+        ):
+            column.take(keep)
+        for postings in (self._skill_postings, self._keyword_postings, self._term_postings):
+            for term in list(postings):
+                rows = renumber[postings[term].values]
+                rows = rows[rows >= 0]
+                if len(rows):
+                    postings[term] = _Column(np.int32, capacity=len(rows))
+                    postings[term].extend(rows)
+                else:
+                    del postings[term]
+        self._alphabet = set("".join(self._term_postings))
+        self._dead = 0
+
+    def _tail_csc(self) -> sparse.csc_matrix:
+        if self._tail_matrix is None:
+            indptr = np.cumsum([0] + [len(indices) for indices, _ in self._tail])
+            indices = np.concatenate([i for i, _ in self._tail]) if self._tail else np.zeros(0, np.int32)
+            data = np.concatenate([d for _, d in self._tail]) if self._tail else np.zeros(0)
+            matrix = sparse.csr_matrix((data, indices, indptr), shape=(len(self._tail), self._width))
+            self._tail_matrix = matrix.tocsc()
+        return self._tail_matrix
+
+    def _compact(self) -> None:
+        self._main = sparse.vstack([self._main, self._tail_csc()], format="csc")
+        self._tail = []
+        self._tail_matrix = None
+
+    def _similarities(self, profile: JobProfile, n: int) -> tuple[np.ndarray, np.ndarray]:
+        """TF-IDF cosine per row, and which rows need ``_tfidf_similarity``'s token-overlap fallback instead."""
+        job = profile.tfidf_vector if profile.tfidf_vector is not None else tfidf_model.job_vector(profile.description)
+        job = job.tocsr()
+        if not job.has_sorted_indices:
+            job = job.sorted_indices()
+        sim = np.zeros(n)
+        if job.nnz:
+            # Term-at-a-time over each job term's postings
+            main = self._main.shape[0]
+            if main:
+                sim[:main] = self._main[:, job.indices] @ job.data
+            if self._tail:
+                sim[main:] = self._tail_csc()[:, job.indices] @ job.data
+            fallback = self._no_terms.values.copy()
+        else:
+            fallback = np.ones(n, dtype=bool)
+        if not _tokenize(profile.description):
+            fallback[:] = False
+        # Without tokens on the resume side the fallback is 0 as well
+        fallback &= self._n_tokens.values > 0
+        return sim, fallback
+
+    def _may_contain(self, text: str, rows: np.ndarray) -> np.ndarray:
+        """Which of ``rows`` may contain ``text``: their signatures have all of its trigrams."""
+        signatures = self._signatures.values
+        maybe = np.ones(len(rows), dtype=bool)
+        for bit in np.unique(_trigram_bits(text)):
+            maybe[maybe] = (signatures[rows[maybe], bit >> 3] & (0x80 >> (bit & 7))) != 0
+        return maybe
+
+    def _term_rows(self, phrase: str, n: int) -> np.ndarray:
+        """Rows with a token or skills-section entry within one edit of a short phrase."""
+        # The terms FuzzyIndex would offer: a phrase's deletion key, or one with a character inserted
+        neighbours = set()
+        for key in FuzzyIndex.lookup_keys(phrase):
+            neighbours.add(key)
+            neighbours.update(key[:i] + c + key[i:] for i in range(len(key) + 1) for c in self._alphabet)
+        rows = np.zeros(n, dtype=bool)
+        for term in neighbours:
+            if term in self._term_postings and _fuzzy_match(term, phrase):
+                rows[self._term_postings[term].values] = True
+        return rows
+
+    def _may_match(self, phrase: str, n: int) -> np.ndarray:
+        """Rows whose text or skills section may hold a string within one edit of ``phrase``.
+
+        Such a string lacks at most the phrase's trigrams that overlap the
+        edited character, and those start at consecutive offsets.
+        """
+        bits = _trigram_bits(phrase)
+        if not len(bits):
+            return np.ones(n, dtype=bool)
+        present = self._signatures.values[:, bits >> 3] & (0x80 >> (bits & 7)).astype(np.uint8)
+        missing = present == 0
+        first = missing.argmax(axis=1)
+        last = len(bits) - 1 - missing[:, ::-1].argmax(axis=1)
+        span = 2 + max(len(c.encode("utf-8")) for c in phrase)
+        return ~missing.any(axis=1) | (last - first < span)
+
+    def _postings_count(self, postings: dict[str, _Column], terms: Iterable[str], n: int) -> np.ndarray:
+        lists = [postings[t].values for t in terms if t in postings]
+        if not lists:
+            return np.zeros(n, dtype=np.int64)
+        return np.bincount(np.concatenate(lists), minlength=n)
+
+    def search(self, profile: JobProfile, k: int = 50) -> list[dict]:
+        """The ``k`` best resumes for a compiled job, best first (ties: earliest indexed)."""
+        with self._lock:
+            self._sync()
+            n = len(self._ids)
+            alive = self._alive.values.copy()
+            k = min(k, int(alive.sum()))
+            if k <= 0:
+                return []
+
+            sim, sim_fallback = self._similarities(profile, n)
+            similarity_lo = percent(np.clip(np.where(sim_fallback, 0.0, sim), 0.0, 1.0))
+            fallback_rows = np.flatnonzero(sim_fallback)
+            if len(fallback_rows):
+                # Jaccard overlap of token sets, counting every job token the text may contain as shared
+                job_tokens = set(_tokenize(profile.description))
+                shared = sum((self._may_contain(t, fallback_rows) for t in job_tokens), np.zeros(len(fallback_rows)))
+                na, nb = self._n_tokens.values[fallback_rows], len(job_tokens)
+                shared = np.minimum(shared, np.minimum(na, nb))
+                sim = sim.copy()
+                sim[fallback_rows] = shared / np.maximum(1, na + nb - shared)
+            similarity_hi = percent(np.clip(sim, 0.0, 1.0))
+
+            job_skills = {s.lower() for s in profile.skills}
+            known = [s for s in profile.skills if s in self._space.index]
+            # Phrases from the job's own skills block: matched against resume text, on demand
+            extra = sorted(s for s in profile.skills if s not in self._space.index and 2 <= len(s) <= 40)
+            skill_den = max(1, len(job_skills))
+            overlap = self._postings_count(self._skill_postings, known, n)
+            short_space = SkillSpace(p for p in extra if len(p) <= _SHORT_PHRASE)
+            long_space = SkillSpace(p for p in extra if len(p) > _SHORT_PHRASE)
+            # Fuzzy matches of short phrases are known exactly; only the phrase itself in the text is a maybe
+            short_hits = np.zeros((len(short_space), n), dtype=bool)
+            everything = np.arange(n)
+            possible = overlap.copy()
+            for col, phrase in enumerate(short_space.terms):
+                short_hits[col] = self._term_rows(phrase, n)
+                possible += short_hits[col] | self._may_contain(phrase, everything)
+            for phrase in long_space.terms:
+                possible += self._may_match(phrase, n)
+            certain = overlap + short_hits.sum(axis=0)
+            skills_lo = percent(certain / skill_den)
+            skills_hi = percent(np.minimum(possible, skill_den) / skill_den)
+
+            job_keywords = {w.lower() for w in profile.keywords}
+            keywords = percent(self._postings_count(self._keyword_postings, job_keywords, n) / max(1, len(job_keywords)))
+
+            with_skills, without_skills = self._section_with.values, self._section_without.values
+            always = self._always_skills.values
+            sections_lo = np.where(always | (certain > 0), with_skills, without_skills)
+            sections_hi = np.where(always | (possible > 0), with_skills, without_skills)
+
+            lo = np.where(alive, overall_scores(similarity_lo, skills_lo, keywords, sections_lo), -1)
+            hi = np.where(alive, overall_scores(similarity_hi, skills_hi, keywords, sections_hi), -1)
+
+            # Rows whose score depends on their text: check them best bound first,
+            # until no remaining bound reaches the k-th best score known so far
+            unknown = alive & ((similarity_hi > similarity_lo) | (possible > certain))
+            similarity, skills, sections = similarity_lo, skills_lo.copy(), sections_lo.copy()
+            overall = lo.copy()
+            pending = np.flatnonzero(unknown)
+            pending = pending[np.argsort(-hi[pending], kind="stable")]
+            checked = np.zeros(n, dtype=bool)
+            for start in range(0, len(pending), _CHECK_CHUNK):
+                threshold = np.partition(overall, n - k)[n - k]
+                chunk = pending[start : start + _CHECK_CHUNK]
+                chunk = chunk[hi[chunk] >= threshold]
+                if not len(chunk):
+                    break
+                for seq, text, sections_json in self._fetch([self._seqs[row] for row in chunk]):
+                    row = self._row_of_seq[seq]
+                    if sim_fallback[row]:
+                        value = _tfidf_similarity(text, profile.description, profile.tfidf_vector)
+                        similarity[row] = percent(np.clip(np.array(value), 0.0, 1.0))
+                    if extra:
+                        # Stored text is already normalized, so its lowercase is what parsing would give
+                        mentioned = short_space.mentions(text.lower())
+                        matched = int(certain[row]) + sum(1 for c in mentioned if not short_hits[c, row])
+                        if len(long_space):
+                            doc = ResumeDocument.parse(text, json.loads(sections_json) if sections_json else None)
+                            matched += len(long_space.columns(doc))
+                        skills[row] = percent(np.array(matched / skill_den))
+                        sections[row] = with_skills[row] if always[row] or matched else without_skills[row]
+                checked[chunk] = True
+                overall[chunk] = overall_scores(similarity[chunk], skills[chunk], keywords[chunk], sections[chunk])
+            # The rest were bounded below the k-th best and never scored exactly
+            overall[unknown & ~checked] = -1
+
+            return [
+                {
+                    "id": self._ids[row],
+                    "overall_score": int(overall[row]),
+                    "scores": {
+                        "similarity": int(similarity[row]),
+                        "skills": int(skills[row]),
+                        "keywords": int(keywords[row]),
+                        "sections": int(sections[row]),
+                    },
+                }
+                for row in top_rows(overall, k)
+                if overall[row] >= 0
+            ]
+
+    def _fetch(self, seqs: list[int]) -> Iterable[tuple[int, str, Optional[str]]]:
+        for start in range(0, len(seqs), _FETCH_CHUNK):
+            chunk = seqs[start : start + _FETCH_CHUNK]
+            marks = ",".join("?" * len(chunk))
+            yield from self._conn.execute(f"SELECT seq, text, sections FROM resumes WHERE seq IN ({marks})", chunk)
+
+    def rebuild(self) -> int:
+        """Recompute every resume's features (after refitting the TF-IDF model or changing the skill vocabulary)."""
+        with self._lock:
+            last = self._conn.execute("SELECT COALESCE(MAX(seq), 0) FROM resumes").fetchone()[0]
+        done, after = 0, 0
+        while True:
+            with self._lock:
+                batch = self._conn.execute(
+                    "SELECT seq, id, text, sections FROM resumes WHERE seq > ? AND seq <= ? ORDER BY seq LIMIT ?",
+                    (after, last, _FETCH_CHUNK),
+                ).fetchall()
+            if not batch:
+                break
+            after = batch[-1][0]
+            done += self.add_many((rid, text, json.loads(s) if s else None) for _, rid, text, s in batch)
+        with self._lock:
+            self._conn.execute("UPDATE meta SET value = ? WHERE key = 'features'", (_fingerprint(),))
+            self.stale = False
+        return done
+
+    def warm(self) -> None:
+        """Load the index into memory now rather than on the first search."""
+        with self._lock:
+            self._sync()
+
+    def stats(self) -> dict:
+        with self._lock:
+            self._sync()
+            return {
+                "resumes": len(self._row_of_id),
+                "rows_in_memory": len(self._ids),
+                "stale": self.stale,
+            }
+
+
+def index_from_env() -> Optional[CandidateIndex]:
+    """Open the candidate search index at ``SEARCH_INDEX_PATH`` (a SQLite file); None when unset."""
+    path = os.environ.get("SEARCH_INDEX_PATH")
+    if not path:
+        return None
+    return CandidateIndex(path)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Manage the candidate search index at SEARCH_INDEX_PATH.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    add = commands.add_parser("add", help="Index every *.pdf and *.txt resume in a directory (id: file name)")
+    add.add_argument("directory", type=Path)
+    delete = commands.add_parser("delete", help="Remove resumes by id")
+    delete.add_argument("ids", nargs="+")
+    commands.add_parser("rebuild", help="Recompute stored features after a model or vocabulary change")
+    search = commands.add_parser("search", help="Print the best candidates for a job")
+    search.add_argument("job_title")
+    search.add_argument("--description", default="")
+    search.add_argument("-k", type=int, default=10)
+    args = parser.parse_args()
+
+    index = index_from_env()
+    if index is None:
+        parser.error("set SEARCH_INDEX_PATH")
+
+    if args.command == "add":
+        names, texts = load_resumes(args.directory)
+        added = index.add_many((name, text, None) for name, text in zip(names, texts))
+        print(f"Indexed {added} resume(s); {len(index)} in {index.path}")
+    elif args.command == "delete":
+        for resume_id in args.ids:
+            print(f"{resume_id}: {'deleted' if index.delete(resume_id) else 'not indexed'}")
+    elif args.command == "rebuild":
+        print(f"Rebuilt {index.rebuild()} resume(s)")
+    else:
+        started = time.perf_counter()
+        results = index.search(compile_job(args.job_title, args.description), args.k)
+        elapsed = (time.perf_counter() - started) * 1e3
+        print(json.dumps(results, indent=2))
+        print(f"{len(results)} of {len(index)} resumes in {elapsed:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
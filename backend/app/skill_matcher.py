@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+from collections import deque
+from typing import Iterable
+
+
+def _is_word(ch: str) -> bool:
+    # Same notion of a "word" character as the re module's \w
+    return ch.isalnum() or ch == "_"
+
+
+class AliasMatcher:
+    """Aho-Corasick automaton over a fixed skill/alias vocabulary.
+
+    Built once, then ``find`` reports every vocabulary entry that occurs in a
+    text with the same word boundaries as ``re.search(rf"\\b{alias}\\b", text)``,
+    in a single pass over the text regardless of vocabulary size.
+    """
+
+    def __init__(self, patterns: Iterable[str]):
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._out: list[tuple[str, ...]] = [()]
+        self._patterns: set[str] = set()
+
+        for pat in patterns:
+            pat = (pat or "").lower()
+            if pat and pat not in self._patterns:
+                self._patterns.add(pat)
+                self._insert(pat)
+        self._link()
+
+    def __contains__(self, pattern: object) -> bool:
+        return isinstance(pattern, str) and pattern.lower() in self._patterns
+
+    def __len__(self) -> int:
+        return len(self._patterns)
+
+    def _insert(self, pat: str) -> None:
+        state = 0
+        for ch in pat:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(())
+            state = nxt
+        self._out[state] = self._out[state] + (pat,)
+
+    def _link(self) -> None:
+        goto, fail, out = self._goto, self._fail, self._out
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in goto[state].items():
+                queue.append(nxt)
+                f = fail[state]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                fail[nxt] = goto[f].get(ch, 0)
+                out[nxt] = out[nxt] + out[fail[nxt]]
+
+    def find(self, text: str) -> set[str]:
+        """Return the vocabulary entries found word-bounded in ``text``.
+
+        ``text`` is expected to be lowercased already, like the patterns.
+        """
+        goto, fail, out = self._goto, self._fail, self._out
+        n = len(text)
+        hits: set[str] = set()
+        state = 0
+        for i, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if not out[state]:
+                continue
+            for pat in out[state]:
+                if pat in hits:
+                    continue
+                start = i - len(pat) + 1
+                before = _is_word(text[start - 1]) if start > 0 else False
+                after = _is_word(text[i + 1]) if i + 1 < n else False
+                if before != _is_word(pat[0]) and after != _is_word(pat[-1]):
+                    hits.add(pat)
+        return hits
+
+
+def _deletes(word: str) -> set[str]:
+    return {word[:i] + word[i + 1:] for i in range(len(word))}
+
+
+class FuzzyIndex:
+    """Deletion-neighbourhood (SymSpell-style) index for edit distance 1.
+
+    ``candidates(word)`` returns every indexed term whose Levenshtein distance
+    to ``word`` may be at most 1, using O(len(word)) dictionary lookups instead
+    of comparing against the whole vocabulary. The result is a superset:
+    callers confirm each candidate with their own comparison.
+    """
+
+    def __init__(self, terms: Iterable[str] = ()):
+        self._keys: dict[str, set[str]] = {}
+        self._terms: set[str] = set()
+        self._frozen = False
+        for term in terms:
+            self.add(term)
+
+    def __contains__(self, term: object) -> bool:
+        return term in self._terms
+
+    def __len__(self) -> int:
+        return len(self._terms)
+
+    def add(self, term: str) -> None:
+        if self._frozen:
+            raise TypeError("FuzzyIndex is frozen")
+        if not term or term in self._terms:
+            return
+        self._terms.add(term)
+        for key in self.lookup_keys(term):
+            self._keys.setdefault(key, set()).add(term)
+
+    def freeze(self) -> FuzzyIndex:
+        """Make the index read-only (for indexes shared between threads) and return it."""
+        self._frozen = True
+        return self
+
+    @staticmethod
+    def lookup_keys(word: str) -> set[str]:
+        """The keys a term is filed under and a word is looked up by: itself and its one-character deletions."""
+        return _deletes(word) | {word}
+
+    def candidates(self, word: str) -> set[str]:
+        out: set[str] = set()
+        keys = self._keys
+        for key in self.lookup_keys(word):
+            terms = keys.get(key)
+            if terms:
+                out |= terms
+        return out
@@ -0,0 +1,219 @@
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Optional
+
+
+class TextCache:
+    """Extracted resume text (and its section split) keyed by PDF content hash.
+
+    Two tiers, each with its own byte budget: an in-process LRU and an
+    optional directory of JSON files shared by every worker on the host.
+    Disk entries are evicted oldest-access first. ``variant`` names how the
+    text was extracted (see ``pdf_text.budget_tag``); entries stored under
+    another variant are never returned.
+    """
+
+    def __init__(
+        self,
+        max_memory_bytes: int = 64 << 20,
+        disk_dir: Optional[str] = None,
+        max_disk_bytes: int = 512 << 20,
+        variant: str = "",
+    ):
+        self.max_memory_bytes = max_memory_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self.disk_dir = Path(disk_dir) if disk_dir else None
+        self.variant = variant
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._lock = threading.Lock()
+        self._memory: OrderedDict[str, tuple[dict, int]] = OrderedDict()
+        self._memory_bytes = 0
+        self._disk_bytes = 0
+        if self.disk_dir:
+            self.disk_dir.mkdir(parents=True, exist_ok=True)
+            self._disk_bytes = sum(p.stat().st_size for p in self.disk_dir.glob("*.json"))
+
+    @staticmethod
+    def digest(file_bytes: bytes) -> str:
+        return hashlib.sha256(file_bytes).hexdigest()
+
+    def get(self, digest: str) -> Optional[dict]:
+        """Return ``{"text": str, "sections": dict | None, "extraction": dict | None}`` or None.
+
+        ``extraction`` is missing from entries written before it was recorded.
+        """
+        digest = self._key(digest)
+        with self._lock:
+            item = self._memory.get(digest)
+            if item is not None:
+                self._memory.move_to_end(digest)
+                self.hits += 1
+                return item[0]
+
+        entry = self._read_disk(digest)
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.disk_hits += 1
+            self._remember(digest, entry, len(json.dumps(entry)))
+        return entry
+
+    def put(self, digest: str, text: str, sections: Optional[dict] = None, extraction: Optional[dict] = None) -> None:
+        digest = self._key(digest)
+        entry = {"text": text, "sections": sections, "extraction": extraction}
+        payload = json.dumps(entry, separators=(",", ":"))
+        with self._lock:
+            self._remember(digest, entry, len(payload))
+        if self.disk_dir:
+            self._write_disk(digest, payload)
+
+    def _key(self, digest: str) -> str:
+        return f"{digest}-{self.variant}" if self.variant else digest
+
+    def _remember(self, digest: str, entry: dict, size: int) -> None:
+        # Caller holds the lock
+        old = self._memory.pop(digest, None)
+        if old is not None:
+            self._memory_bytes -= old[1]
+        if size > self.max_memory_bytes:
+            return
+        self._memory[digest] = (entry, size)
+        self._memory_bytes += size
+        while self._memory_bytes > self.max_memory_bytes:
+            _, (_, old_size) = self._memory.popitem(last=False)
+            self._memory_bytes -= old_size
+            self.evictions += 1
+
+    def _path(self, digest: str) -> Path:
+        assert self.disk_dir is not None
+        return self.disk_dir / f"{digest}.json"
+
+    def _read_disk(self, digest: str) -> Optional[dict]:
+        if not self.disk_dir:
+            return None
+        path = self._path(digest)
+        try:
+            entry = json.loads(path.read_text(encoding="utf-8"))
+            os.utime(path)  # refresh recency for eviction
+            return entry
+        except (OSError, ValueError):
+            return None
+
+    def _write_disk(self, digest: str, payload: str) -> None:
+        path = self._path(digest)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            previous = path.stat().st_size if path.exists() else 0
+            tmp.write_text(payload, encoding="utf-8")
+            os.replace(tmp, path)
+        except OSError:
+            return
+        with self._lock:
+            self._disk_bytes += len(payload.encode("utf-8")) - previous
+            over = self._disk_bytes > self.max_disk_bytes
+        if over:
+            self._evict_disk()
+
+    def _evict_disk(self) -> None:
+        files = []
+        for p in self.disk_dir.glob("*.json"):  # type: ignore[union-attr]
+            try:
+                st = p.stat()
+            except OSError:
+                continue
+            files.append((st.st_mtime, st.st_size, p))
+        files.sort()
+        total = sum(size for _, size, _ in files)
+        evicted = 0
+        for _, size, p in files:
+            if total <= self.max_disk_bytes:
+                break
+            try:
+                p.unlink()
+            except OSError:
+                continue
+            total -= size
+            evicted += 1
+        with self._lock:
+            self._disk_bytes = total
+            self.evictions += evicted
+
+    def warm(self, directory: str, extract: Callable[[bytes], str], split: Optional[Callable[[str], dict]] = None) -> int:
+        """Extract and cache every ``*.pdf`` under ``directory``; return how many were added."""
+        added = 0
+        for path in sorted(Path(directory).rglob("*.pdf")):
+            data = path.read_bytes()
+            digest = self.digest(data)
+            if self.get(digest) is not None:
+                continue
+            try:
+                text = extract(data)
+            except ValueError:
+                continue
+            self.put(digest, text, split(text) if split else None)
+            added += 1
+        return added
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._memory),
+            "memory_bytes": self._memory_bytes,
+            "disk_bytes": self._disk_bytes if self.disk_dir else None,
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+def cache_from_env(variant: str = "") -> Optional[TextCache]:
+    """Build the text cache configured by ``TEXT_CACHE_*`` environment variables.
+
+    TEXT_CACHE_MEMORY_BYTES: in-process budget (default 64 MiB, 0 disables the cache)
+    TEXT_CACHE_DIR:          directory for the on-disk tier (unset disables it)
+    TEXT_CACHE_DISK_BYTES:   on-disk budget (default 512 MiB)
+    """
+    memory = int(os.environ.get("TEXT_CACHE_MEMORY_BYTES") or 64 << 20)
+    if memory <= 0:
+        return None
+    return TextCache(
+        max_memory_bytes=memory,
+        disk_dir=os.environ.get("TEXT_CACHE_DIR") or None,
+        max_disk_bytes=int(os.environ.get("TEXT_CACHE_DISK_BYTES") or 512 << 20),
+        variant=variant,
+    )
+
+
+def main() -> None:
+    from .analyzer import _normalize_text, _split_sections
+    from .pdf_text import PAGE_BUDGET, budget_tag, extract_document
+
+    parser = argparse.ArgumentParser(description="Pre-extract resume PDFs into the on-disk text cache.")
+    parser.add_argument("directory", help="Directory searched recursively for *.pdf files")
+    args = parser.parse_args()
+
+    cache = cache_from_env(variant=budget_tag(PAGE_BUDGET))
+    if cache is None or cache.disk_dir is None:
+        parser.error("set TEXT_CACHE_DIR so the warmed entries outlive this process")
+    added = cache.warm(args.directory, lambda data: _normalize_text(extract_document(data, budget=PAGE_BUDGET).text), _split_sections)
+    print(f"Cached {added} new document(s) in {cache.disk_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import argparse
+import hashlib
+import logging
+import os
+import pickle
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Iterable
+
+from .roles import ROLES
+
+logger = logging.getLogger(__name__)
+
+MODEL_PATH = Path(
+    os.environ.get("TFIDF_MODEL_PATH") or Path(__file__).resolve().parent / "data" / "tfidf_vectorizer.pkl"
+)
+
+# Titles outside ROLES that job_description_from_title still knows how to
+# describe; they widen the fitted vocabulary beyond engineering roles.
+_EXTRA_TITLES = [
+    "Sales Executive",
+    "Marketing Manager",
+    "Project Manager",
+    "Human Resources Manager",
+    "Consultant",
+    "UX Designer",
+    "Business Analyst",
+    "Full Stack Developer",
+]
+
+_JOB_VECTOR_CACHE_SIZE = 1024
+
+_lock = threading.Lock()
+_vectorizer: Any = None
+_job_vectors: OrderedDict[str, Any] = OrderedDict()
+
+
+def role_corpus() -> list[str]:
+    """Job descriptions generated from ROLES plus a few generic role families."""
+    from .analyzer import _normalize_text, job_description_from_title
+
+    titles = [role.title for role in ROLES.values()] + _EXTRA_TITLES
+    return [_normalize_text(job_description_from_title(t)) for t in titles]
+
+
+def fit_vectorizer(documents: Iterable[str]):
+    from sklearn.feature_extraction.text import TfidfVectorizer
+
+    vectorizer = TfidfVectorizer(stop_words="english", ngram_range=(1, 2), min_df=1, max_features=10000)
+    vectorizer.fit([d for d in documents if d and d.strip()])
+    return vectorizer
+
+
+def save_vectorizer(vectorizer, path: Path = MODEL_PATH) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # A temporary name of its own, so concurrent writers never share one
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=path.name + ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            pickle.dump(vectorizer, fh, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def get_vectorizer():
+    """Return the process-wide fitted vectorizer, loading it on first use.
+
+    The model file is written by ``python -m app.tfidf_model`` as a deploy
+    step; the app never writes it. Without a readable file the model is
+    fitted on ``role_corpus()`` in memory, which gives every process the
+    same default model but costs each of them the fit.
+    """
+    global _vectorizer
+    if _vectorizer is not None:
+        return _vectorizer
+    with _lock:
+        if _vectorizer is None:
+            try:
+                with open(MODEL_PATH, "rb") as fh:
+                    _vectorizer = pickle.load(fh)
+            except FileNotFoundError:
+                logger.warning("No TF-IDF model at %s; fitting the default one (run python -m app.tfidf_model)", MODEL_PATH)
+                _vectorizer = fit_vectorizer(role_corpus())
+            except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError, ValueError) as e:
+                logger.error("Cannot load the TF-IDF model at %s (%s); fitting the default one", MODEL_PATH, e)
+                _vectorizer = fit_vectorizer(role_corpus())
+    return _vectorizer
+
+
+def job_vector(job_text: str):
+    """TF-IDF row for a job description, cached by the SHA-256 of its text."""
+    key = hashlib.sha256(job_text.encode("utf-8")).hexdigest()
+    with _lock:
+        vec = _job_vectors.get(key)
+        if vec is not None:
+            _job_vectors.move_to_end(key)
+            return vec
+    vec = get_vectorizer().transform([job_text])
+    with _lock:
+        _job_vectors[key] = vec
+        while len(_job_vectors) > _JOB_VECTOR_CACHE_SIZE:
+            _job_vectors.popitem(last=False)
+    return vec
+
+
+def similarity(resume_text: str, job_text: str, job_vec: Any = None) -> float | None:
+    """Cosine similarity of the two texts, or None if either has no known terms.
+
+    ``job_vec`` may carry a precomputed ``job_vector(job_text)``.
+    """
+    if job_vec is None:
+        job_vec = job_vector(job_text)
+    resume_vec = get_vectorizer().transform([resume_text])
+    if not job_vec.nnz or not resume_vec.nnz:
+        return None
+    # Rows are L2-normalized, so the dot product is the cosine.
+    return float(resume_vec.multiply(job_vec).sum())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Fit and save the TF-IDF model used for resume/job similarity.")
+    parser.add_argument(
+        "--corpus",
+        type=Path,
+        help="Directory of extra job descriptions (*.txt) to fit on, in addition to the built-in role texts.",
+    )
+    parser.add_argument("--out", type=Path, default=MODEL_PATH, help=f"Output path (default: {MODEL_PATH})")
+    args = parser.parse_args()
+
+    documents = role_corpus()
+    if args.corpus:
+        documents += [p.read_text(encoding="utf-8", errors="ignore") for p in sorted(args.corpus.glob("*.txt"))]
+
+    vectorizer = fit_vectorizer(documents)
+    save_vectorizer(vectorizer, args.out)
+    print(f"Fitted on {len(documents)} documents, {len(vectorizer.vocabulary_)} terms -> {args.out}")
+
+
+if __name__ == "__main__":
+    main()
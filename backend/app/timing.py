@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+from contextlib import nullcontext
+from contextvars import ContextVar, Token
+from functools import wraps
+from typing import Callable, Optional, TypeVar
+
+F = TypeVar("F", bound=Callable)
+
+# Histogram bucket upper bounds, in milliseconds
+BUCKETS_MS = (1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+ENABLED = (os.environ.get("ANALYSIS_TIMINGS") or "1").strip().lower() not in {"0", "false", "no", "off"}
+
+# stage -> [seconds, calls] for the request being handled in this context
+_current: ContextVar[Optional[dict[str, list]]] = ContextVar("analysis_timings", default=None)
+_NULL = nullcontext()
+
+
+class _Stage:
+    __slots__ = ("name", "timings", "start")
+
+    def __init__(self, name: str, timings: dict[str, list]):
+        self.name = name
+        self.timings = timings
+
+    def __enter__(self) -> None:
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc) -> None:
+        elapsed = time.perf_counter() - self.start
+        entry = self.timings.get(self.name)
+        if entry is None:
+            self.timings[self.name] = [elapsed, 1]
+        else:
+            entry[0] += elapsed
+            entry[1] += 1
+
+
+def stage(name: str):
+    """Context manager timing one stage of the current request.
+
+    Outside a measured request (or with timings disabled) it is a shared
+    no-op context, so instrumented code costs one ContextVar lookup.
+    """
+    timings = _current.get()
+    return _NULL if timings is None else _Stage(name, timings)
+
+
+def timed(name: str) -> Callable[[F], F]:
+    """Decorator form of ``stage``."""
+
+    def decorate(fn: F) -> F:
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            timings = _current.get()
+            if timings is None:
+                return fn(*args, **kwargs)
+            with _Stage(name, timings):
+                return fn(*args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorate
+
+
+class Histogram:
+    """Cumulative-bucket latency histogram (milliseconds)."""
+
+    def __init__(self, buckets: tuple[float, ...] = BUCKETS_MS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum_ms = 0.0
+
+    def observe(self, ms: float) -> None:
+        i = 0
+        while i < len(self.buckets) and ms > self.buckets[i]:
+            i += 1
+        self.counts[i] += 1
+        self.count += 1
+        self.sum_ms += ms
+
+    def snapshot(self) -> dict:
+        cumulative, running = {}, 0
+        for bound, n in zip([*self.buckets, "+Inf"], self.counts):
+            running += n
+            cumulative[str(bound)] = running
+        return {"count": self.count, "sum_ms": round(self.sum_ms, 3), "buckets": cumulative}
+
+
+_histograms: dict[str, Histogram] = {}
+_histograms_lock = threading.Lock()
+
+
+def histograms() -> dict[str, dict]:
+    """Per-stage latency histograms of every measured request in this process."""
+    with _histograms_lock:
+        return {name: h.snapshot() for name, h in sorted(_histograms.items())}
+
+
+def begin() -> Optional[tuple[Token, float]]:
+    """Start measuring a request in the current context; None when disabled."""
+    if not ENABLED:
+        return None
+    return _current.set({}), time.perf_counter()
+
+
+def end(started: Optional[tuple[Token, float]]) -> dict[str, float]:
+    """Stop measuring, record the histograms and return milliseconds per stage.
+
+    The result also carries ``total``, the wall time since ``begin``.
+    """
+    if started is None:
+        return {}
+    token, start = started
+    timings = _current.get() or {}
+    _current.reset(token)
+
+    out = {name: round(seconds * 1e3, 3) for name, (seconds, _) in timings.items()}
+    out["total"] = round((time.perf_counter() - start) * 1e3, 3)
+    with _histograms_lock:
+        for name, ms in out.items():
+            hist = _histograms.get(name)
+            if hist is None:
+                hist = _histograms[name] = Histogram()
+            hist.observe(ms)
+    return out
+
+
+def server_timing(timings: dict[str, float]) -> str:
+    """Format stage timings as a ``Server-Timing`` header value."""
+    return ", ".join(f"{name};dur={ms}" for name, ms in timings.items())
@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Iterable, Optional
+
+
+_NON_WORD_RE = re.compile(r"[^a-z0-9]+")
+
+# A rule is (slug, clauses): every clause must match, and a clause matches
+# when any of its terms (a word or a space-separated phrase) is in the title.
+
+# Titles with a ROLES entry.
+_ROLE_RULES = [
+    ("ai_engineer", (("ai",), ("engineer", "developer"))),
+    ("machine_learning_engineer", (("machine learning", "ml", "mlops"),)),
+    ("data_scientist", (("data scientist", "data science"),)),
+    ("devops_engineer", (("devops",),)),
+    ("cloud_architect", (("cloud",), ("architect",))),
+    ("site_reliability_engineer", (("site reliability", "sre"),)),
+    ("cybersecurity_analyst", (("cybersecurity", "cyber security"),)),
+    ("security_engineer", (("security",), ("engineer",))),
+    ("data_engineer", (("data",), ("engineer",))),
+    ("frontend_engineer", (("frontend", "front end"), ("engineer", "developer"))),
+    ("backend_engineer", (("backend", "back end"), ("engineer", "developer"))),
+    ("product_manager", (("product",), ("manager",))),
+    ("data_analyst", (("data",), ("analyst",))),
+    ("web_developer", (("web",), ("developer",))),
+    ("software_developer", (("software",), ("developer", "engineer"))),
+    ("software_developer", (("developer", "engineer"),)),
+]
+
+# Specific role families outside ROLES.
+_FAMILY_RULES = [
+    ("sales_executive", (("sales",), ("executive", "manager", "representative"))),
+    ("marketing_manager", (("marketing",), ("manager", "specialist", "coordinator"))),
+    ("product_owner", (("product",), ("owner",))),
+    ("project_manager", (("project",), ("manager", "coordinator"))),
+    ("hr_manager", (("human",), ("resources", "hr"))),
+    ("consultant", (("consultant", "advisor"),)),
+    ("ux_designer", (("designer",), ("ux", "ui"))),
+]
+
+# Broad areas, for titles that name no specific role.
+_AREA_RULES = [
+    ("analyst", (("analyst",),)),
+    ("frontend", (("frontend", "front end", "react"),)),
+    ("backend", (("backend", "back end"),)),
+    ("full_stack", (("full",), ("stack",))),
+    ("sales", (("sales",),)),
+    ("marketing", (("marketing",),)),
+    ("product", (("product",),)),
+    ("project", (("project",),)),
+    ("hr", (("human", "hr"),)),
+    ("designer", (("designer",),)),
+]
+
+_CACHE_SIZE = 1024
+
+
+def normalize_title(title: str) -> str:
+    return _NON_WORD_RE.sub(" ", (title or "").lower()).strip()
+
+
+@dataclass(frozen=True)
+class TitleMatch:
+    """The role slug a title maps to (None if no rule matched) and its words."""
+
+    slug: Optional[str]
+    words: frozenset[str]
+
+
+class TitleIndex:
+    """Maps job titles to role slugs in one pass over the title's words.
+
+    Every word and n-gram of the title is looked up in a term table built
+    from the rules. Among the rules whose clauses are all satisfied, a rule
+    from an earlier tier wins, then the one listed first, as in an if/elif
+    chain. Rules listed for the same slug share a priority; between those,
+    the one whose terms cover more of the title's words wins. Results are
+    memoized per normalized title.
+    """
+
+    def __init__(self, tiers: Iterable[Iterable[tuple[str, tuple[tuple[str, ...], ...]]]]):
+        # (slug, tier, priority, clause count) per rule, in table order
+        self._rules: list[tuple[str, int, int, int]] = []
+        self._terms: dict[tuple[str, ...], list[tuple[int, int]]] = {}
+        for tier, rules in enumerate(tiers):
+            priorities: dict[str, int] = {}
+            for slug, clauses in rules:
+                rule = len(self._rules)
+                priority = priorities.setdefault(slug, len(priorities))
+                self._rules.append((slug, tier, priority, len(clauses)))
+                for clause_no, clause in enumerate(clauses):
+                    for term in clause:
+                        self._terms.setdefault(tuple(term.split()), []).append((rule, clause_no))
+        self._max_n = max(len(term) for term in self._terms)
+
+        self._cache: OrderedDict[str, TitleMatch] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def classify(self, title: str) -> TitleMatch:
+        key = normalize_title(title)
+        with self._lock:
+            match = self._cache.get(key)
+            if match is not None:
+                self._cache.move_to_end(key)
+                return match
+
+        match = self._classify(key)
+        with self._lock:
+            self._cache[key] = match
+            while len(self._cache) > _CACHE_SIZE:
+                self._cache.popitem(last=False)
+        return match
+
+    def _classify(self, normalized: str) -> TitleMatch:
+        words = normalized.split()
+        # rule -> {clause: words covered by its longest matching term}
+        satisfied: dict[int, dict[int, int]] = {}
+        for i in range(len(words)):
+            for n in range(1, min(self._max_n, len(words) - i) + 1):
+                for rule, clause_no in self._terms.get(tuple(words[i : i + n]), ()):
+                    clauses = satisfied.setdefault(rule, {})
+                    clauses[clause_no] = max(clauses.get(clause_no, 0), n)
+
+        best: Optional[tuple[int, int, int, int]] = None
+        for rule, clauses in satisfied.items():
+            _, tier, priority, n_clauses = self._rules[rule]
+            if len(clauses) < n_clauses:
+                continue
+            rank = (tier, priority, -sum(clauses.values()), rule)
+            if best is None or rank < best:
+                best = rank
+        slug = self._rules[best[3]][0] if best is not None else None
+        return TitleMatch(slug=slug, words=frozenset(words))
+
+
+TITLE_INDEX = TitleIndex([_ROLE_RULES, _FAMILY_RULES, _AREA_RULES])
+
+
+def classify_title(title: str) -> TitleMatch:
+    """Role slug for a job title, shared by the analyzer and the job market data."""
+    return TITLE_INDEX.classify(title)
@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import hashlib
+import io
+import os
+import tempfile
+from typing import IO, Optional, Union
+
+from flask import Request
+
+MAX_PDF_BYTES = 7_000_000
+
+# A PDF may carry a few bytes of junk before its header
+_MAGIC = b"%PDF-"
+_MAGIC_WINDOW = 1024
+
+_SPOOL_MEMORY_BYTES = int(os.environ.get("UPLOAD_SPOOL_MEMORY_BYTES") or 512 << 10)
+_SPOOL_DIR = os.environ.get("UPLOAD_TMP_DIR") or None
+
+
+class PDFSpool:
+    """Write target for one uploaded file part, filled while the request body streams in.
+
+    Small files stay in memory; larger ones roll over to a named temporary
+    file that extraction workers memory-map by path. The SHA-256 is computed
+    as bytes arrive. A part whose first bytes are not a PDF header, or that
+    grows past ``limit``, is flagged in ``error`` and the rest of it is
+    discarded instead of stored.
+    """
+
+    def __init__(self, limit: int = MAX_PDF_BYTES, memory_limit: int = _SPOOL_MEMORY_BYTES):
+        self.limit = limit
+        self.memory_limit = memory_limit
+        self.size = 0
+        self.error: Optional[str] = None
+        self._head = b""
+        self._sha256 = hashlib.sha256()
+        self._buffer: Optional[io.BytesIO] = io.BytesIO()
+        self._file: Optional[IO[bytes]] = None
+
+    def write(self, data: bytes) -> int:
+        n = len(data)
+        self.size += n
+        if self.error:
+            return n
+        if len(self._head) < _MAGIC_WINDOW:
+            self._head += data[: _MAGIC_WINDOW - len(self._head)]
+            if len(self._head) >= _MAGIC_WINDOW:
+                self._check_magic()
+        if self.size > self.limit:
+            self._reject("too_large")
+        if self.error:
+            return n
+
+        self._sha256.update(data)
+        if self._file is None and self.size > self.memory_limit:
+            self._file = tempfile.NamedTemporaryFile(prefix="upload-", suffix=".pdf", dir=_SPOOL_DIR)
+            self._file.write(self._buffer.getbuffer())
+            self._buffer = None
+        (self._file or self._buffer).write(data)
+        return n
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        # The form parser rewinds once the part is complete
+        if len(self._head) < _MAGIC_WINDOW and not self.error:
+            self._check_magic()
+        if self._file is not None:
+            self._file.flush()
+        return (self._file or self._buffer or io.BytesIO()).seek(offset, whence)
+
+    def read(self, size: int = -1) -> bytes:
+        return (self._file or self._buffer or io.BytesIO()).read(size)
+
+    def _check_magic(self) -> None:
+        if _MAGIC not in self._head:
+            self._reject("not_pdf")
+
+    def _reject(self, error: str) -> None:
+        self.error = error
+        self.close()
+
+    @property
+    def digest(self) -> str:
+        return self._sha256.hexdigest()
+
+    def source(self) -> Union[bytes, str]:
+        """What the extractor reads: the bytes while in memory, else the spool file's path."""
+        if self._file is not None:
+            return self._file.name
+        return self._buffer.getvalue() if self._buffer is not None else b""
+
+    def read_bytes(self) -> bytes:
+        """The whole upload, for consumers that outlive the request (the job queue)."""
+        if self._file is None:
+            return self.source()
+        with open(self._file.name, "rb") as fh:
+            return fh.read()
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self._buffer = None
+
+    @property
+    def closed(self) -> bool:
+        return self._file is None and self._buffer is None
+
+
+class SpoolingRequest(Request):
+    """Request that streams file parts into ``PDFSpool``s and caps bodies per endpoint.
+
+    ``body_limits`` maps endpoint names to their largest accepted request
+    body; a longer body is cut off with 413 while it arrives (or at once,
+    from its Content-Length). Other endpoints use ``MAX_CONTENT_LENGTH``.
+    """
+
+    body_limits: dict[str, Optional[int]] = {}
+
+    @property
+    def max_content_length(self) -> Optional[int]:  # type: ignore[override]
+        if self.endpoint in self.body_limits:
+            return self.body_limits[self.endpoint]
+        return super().max_content_length
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        return PDFSpool()
@@ -0,0 +1,66 @@
+"""Check the batch score matrix against per-pair ``score()`` calls, and time both.
+
+Run from ``backend/``::
+
+    python -m benchmarks.bench_batch_scoring --resumes 500
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import time
+
+from app.analyzer import compile_job, score
+from app.batch_scoring import score_matrix
+from app.roles import ROLES
+
+from .corpus import noisy_text, synthetic_resume
+
+
+def _resumes(n: int) -> list[str]:
+    rng = random.Random(0)
+    out = []
+    for seed in range(n):
+        text = synthetic_resume(rng.choice([0.3, 1, 2]), seed=seed)
+        out.append(noisy_text(text, seed=seed) if seed % 4 == 0 else text)
+    return out
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--resumes", type=int, default=500)
+    parser.add_argument("--check", type=int, default=2000, help="Pairs compared against score() (default: 2000)")
+    args = parser.parse_args()
+
+    texts = _resumes(args.resumes)
+    jobs = [compile_job(role.title) for role in ROLES.values()]
+    pairs = len(texts) * len(jobs)
+
+    started = time.perf_counter()
+    matrix = score_matrix(texts, jobs)
+    t_matrix = time.perf_counter() - started
+
+    rng = random.Random(1)
+    sample = rng.sample([(i, j) for i in range(len(texts)) for j in range(len(jobs))], min(args.check, pairs))
+    started = time.perf_counter()
+    wrong = 0
+    for i, j in sample:
+        result = score(texts[i], jobs[j])
+        got = (matrix.overall[i, j], matrix.similarity[i, j], matrix.skills[i, j], matrix.keywords[i, j], matrix.sections[i, j])
+        want = (result["overall_score"], *result["scores"].values())
+        if got != want:
+            wrong += 1
+            print(f"MISMATCH resume {i} vs {jobs[j].title!r}: matrix {got}, score() {want}")
+    t_pair = (time.perf_counter() - started) / len(sample)
+
+    print(f"{len(sample) - wrong}/{len(sample)} sampled pairs match score()")
+    print(
+        f"{len(texts)} resumes x {len(jobs)} jobs: matrix {t_matrix:.2f} s ({t_matrix / pairs * 1e6:.1f} us/pair), "
+        f"per-pair score() {t_pair * 1e6:.0f} us/pair (~{t_pair * pairs:.1f} s for all)"
+    )
+    if wrong:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""Compare the deletion-index fuzzy pass against the tokens x skills loop.
+
+Run from ``backend/``::
+
+    python -m benchmarks.bench_fuzzy_index
+"""
+from __future__ import annotations
+
+import timeit
+
+from app.analyzer import _FUZZY_INDEX, _fuzzy_match, _skill_vocabulary, _tokenize
+
+from .corpus import synthetic_resume
+
+
+def _pairwise(tokens: list[str], skills: set[str]) -> set[str]:
+    # The pre-index implementation: every token against every skill.
+    return {skill for token in tokens for skill in skills if _fuzzy_match(token, skill)}
+
+
+def _indexed(tokens: list[str], skills: set[str]) -> set[str]:
+    return {
+        cand
+        for token in set(tokens)
+        for cand in _FUZZY_INDEX.candidates(token)
+        if cand in skills and _fuzzy_match(token, cand)
+    }
+
+
+def main() -> None:
+    vocab = _skill_vocabulary()
+    print(f"vocabulary: {len(vocab)} skills/aliases")
+    for pages in (1, 5, 20):
+        tokens = _tokenize(synthetic_resume(pages))
+        assert _pairwise(tokens, vocab) == _indexed(tokens, vocab)
+        n = 5
+        t_pw = timeit.timeit(lambda: _pairwise(tokens, vocab), number=n) / n
+        t_ix = timeit.timeit(lambda: _indexed(tokens, vocab), number=n) / n
+        print(
+            f"{pages:>2} page(s), {len(tokens):>5} tokens: "
+            f"pairwise {t_pw * 1000:8.2f} ms  indexed {t_ix * 1000:8.2f} ms  speedup x{t_pw / t_ix:.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Exercise the market data client against the fake service.
+
+Checks that a slow service stays off the request path (first sight and
+stale entries are answered at once), that the circuit breaker stops calls
+to a failing service, and compares the pooled session against a new
+connection per request.
+
+Run from ``backend/``::
+
+    python -m benchmarks.bench_market_provider
+"""
+from __future__ import annotations
+
+import time
+from datetime import timedelta
+
+import requests
+
+from app.job_market_api import (
+    CircuitBreaker,
+    HTTPMarketDataProvider,
+    JobMarketAPI,
+    MockMarketDataProvider,
+    ProviderUnavailable,
+)
+
+from .fake_market_server import MARKER, FakeMarketServer
+
+
+def _timed(fn):
+    start = time.perf_counter()
+    value = fn()
+    return value, time.perf_counter() - start
+
+
+def _wait_for(predicate, timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            raise AssertionError("timed out waiting for background refresh")
+        time.sleep(0.01)
+
+
+def main() -> None:
+    latency = 0.3
+    with FakeMarketServer(latency=latency) as server:
+        api = JobMarketAPI(
+            provider=HTTPMarketDataProvider(server.url),
+            fallback=MockMarketDataProvider(),
+            cache_duration=timedelta(seconds=0.5),
+        )
+        title = "Data Scientist"
+        data, t_first = _timed(lambda: api.get_job_market_data(title))
+        assert MARKER not in data.market_insights
+        _wait_for(lambda: MARKER in api.get_job_market_data(title).market_insights)
+        print(f"service latency {latency * 1e3:.0f} ms; first sight answered in {t_first * 1e3:.2f} ms (fallback data)")
+
+        time.sleep(0.6)  # let the entry go stale
+        before = server.requests
+        data, t_stale = _timed(lambda: api.get_job_market_data(title))
+        assert MARKER in data.market_insights
+        _wait_for(lambda: server.requests > before)
+        print(f"stale entry answered in {t_stale * 1e3:.2f} ms while it refreshed in the background")
+        print(api.cache_stats())
+
+        n = 50
+        provider = HTTPMarketDataProvider(server.url)
+        server.latency = 0.0
+        _, t_pooled = _timed(lambda: [provider.fetch(title) for _ in range(n)])
+        _, t_fresh = _timed(lambda: [requests.get(f"{server.url}/market-data", params={"title": title}) for _ in range(n)])
+        print(f"{n} fetches: pooled session {t_pooled * 1e3:7.1f} ms, new connection each {t_fresh * 1e3:7.1f} ms")
+
+    with FakeMarketServer(fail=True) as server:
+        provider = HTTPMarketDataProvider(server.url, breaker=CircuitBreaker(failure_threshold=3, reset_after=60))
+        for _ in range(10):
+            try:
+                provider.fetch("Data Scientist")
+            except ProviderUnavailable:
+                pass
+        assert server.requests == 3, server.requests
+        print(f"failing service: {server.requests} calls made out of 10 before the circuit opened ({provider.breaker.state})")
+
+
+if __name__ == "__main__":
+    main()
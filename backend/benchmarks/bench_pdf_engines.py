@@ -0,0 +1,54 @@
+"""Compare PDF text engines: latency and agreement of downstream scores.
+
+Run from ``backend/``::
+
+    python -m benchmarks.bench_pdf_engines
+"""
+from __future__ import annotations
+
+import time
+
+from app.analyzer import analyze_resume_against_job
+from app.pdf_text import _ENGINES, ENGINES, extract_text
+
+from .corpus import synthetic_pdf, synthetic_resume
+
+
+_TITLES = ["Data Scientist", "Frontend Developer", "DevOps Engineer", "Product Manager"]
+
+
+def _fixtures() -> list[tuple[str, bytes]]:
+    out = []
+    for pages in (1, 3, 10):
+        for seed in range(3):
+            out.append((f"{pages}p-s{seed}", synthetic_pdf(synthetic_resume(pages, seed=seed))))
+    return out
+
+
+def _scores(text: str) -> list[int]:
+    return [analyze_resume_against_job(text, "", t)["overall_score"] for t in _TITLES]
+
+
+def main() -> None:
+    fixtures = _fixtures()
+    reference = {name: _scores(extract_text(data, engine="pdfplumber")) for name, data in fixtures}
+
+    print(f"{len(fixtures)} documents x {len(_TITLES)} job titles; agreement is against pdfplumber scores")
+    print(f"{'engine':<18}{'mean ms':>10}{'max ms':>10}{'exact':>8}{'max |diff|':>12}")
+    runs = [(name, lambda data, e=name: "\n".join(_ENGINES[e](data, 0, None)[1]).strip()) for name in ENGINES]
+    runs += [(f"{name}+fallback", lambda data, e=name: extract_text(data, engine=e)) for name in ENGINES if name != "pdfplumber"]
+    for label, extract in runs:
+        times, exact, worst, total = [], 0, 0, 0
+        for name, data in fixtures:
+            t0 = time.perf_counter()
+            text = extract(data)
+            times.append((time.perf_counter() - t0) * 1000)
+            for got, want in zip(_scores(text), reference[name]):
+                exact += got == want
+                worst = max(worst, abs(got - want))
+                total += 1
+        print(f"{label:<18}{sum(times) / len(times):>10.1f}{max(times):>10.1f}{exact / total:>8.0%}{worst:>12}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Compare the precompiled analyzer patterns against per-call ``re`` usage.
+
+Run from ``backend/``::
+
+    python -m benchmarks.bench_regex
+"""
+from __future__ import annotations
+
+import re
+import timeit
+
+from app.analyzer import (
+    _DEGREE_PATTERNS,
+    _EXPERIENCE_LINE_RE,
+    _detect_education_level,
+)
+
+from .corpus import synthetic_resume
+
+
+def _education_level_loop(lines: list[str]) -> str:
+    # The previous implementation: one search per degree pattern per line.
+    for ln in lines:
+        ln_l = ln.lower()
+        for pat, level in _DEGREE_PATTERNS:
+            if re.search(rf"\b({pat})\b", ln_l):
+                return level
+    return "Unknown"
+
+
+def _experience_inline(lines: list[str]) -> list[str]:
+    # The previous line filter: a pattern compiled per call plus a second search.
+    date_re = re.compile(
+        r"\b(20\d{2}|19\d{2})\b.*\b(20\d{2}|present|current)\b|\b(present|current)\b",
+        re.IGNORECASE,
+    )
+    return [
+        ln for ln in lines
+        if date_re.search(ln) or re.search(r"\b(intern|engineer|developer|analyst|assistant)\b", ln, re.I)
+    ]
+
+
+def _experience_compiled(lines: list[str]) -> list[str]:
+    return [ln for ln in lines if _EXPERIENCE_LINE_RE.search(ln)]
+
+
+def main() -> None:
+    for pages in (1, 5, 20):
+        text = synthetic_resume(pages)
+        lines = text.splitlines()
+        # Worst case for the level scan: no line mentions a degree
+        plain = [ln for ln in lines if _education_level_loop([ln]) == "Unknown"]
+        assert _education_level_loop(lines) == _detect_education_level(lines)
+        assert _experience_inline(lines) == _experience_compiled(lines)
+        n = 20
+        rows = [
+            ("education level", lambda: _education_level_loop(plain), lambda: _detect_education_level(plain)),
+            ("experience lines", lambda: _experience_inline(lines), lambda: _experience_compiled(lines)),
+        ]
+        for name, old, new in rows:
+            t_old = timeit.timeit(old, number=n) / n
+            t_new = timeit.timeit(new, number=n) / n
+            print(
+                f"{pages:>2} page(s), {name:<16}: per-call {t_old * 1e3:7.2f} ms, "
+                f"precompiled {t_new * 1e3:7.2f} ms ({t_old / t_new:4.1f}x)"
+            )
+
+
+if __name__ == "__main__":
+    main()
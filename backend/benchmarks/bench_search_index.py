@@ -0,0 +1,94 @@
+"""Check candidate search against ranking every resume with ``score()``, then time it at scale.
+
+A small index is compared result for result with brute-force scoring; a
+large one (distinct resumes repeated under new ids) is timed per query.
+Run from ``backend/``::
+
+    python -m benchmarks.bench_search_index --resumes 100000
+"""
+from __future__ import annotations
+
+import argparse
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from app.analyzer import compile_job, score
+from app.roles import ROLES
+from app.search_index import CandidateIndex
+
+from .corpus import noisy_text, synthetic_resume
+
+# A posting whose skills block lists phrases outside the skill vocabulary
+_CUSTOM_JOB = (
+    "Data Platform Engineer",
+    "Build and run our data platform.\nSkills\npython, airflow, dbt, data contracts, lakehouse design, kubernetes",
+)
+
+
+def _texts(n: int) -> list[str]:
+    return [
+        noisy_text(synthetic_resume(0.5, seed=i), seed=i) if i % 4 == 0 else synthetic_resume(0.5, seed=i)
+        for i in range(n)
+    ]
+
+
+def _jobs():
+    return [compile_job(role.title) for role in ROLES.values()] + [compile_job(*_CUSTOM_JOB)]
+
+
+def check(texts: list[str], k: int = 20) -> int:
+    wrong = 0
+    with tempfile.TemporaryDirectory() as tmp:
+        index = CandidateIndex(str(Path(tmp) / "index.sqlite3"))
+        index.add_many((f"r{i}", text, None) for i, text in enumerate(texts))
+        for job in _jobs():
+            ranked = sorted(
+                ((score(text, job), i) for i, text in enumerate(texts)),
+                key=lambda item: (-item[0]["overall_score"], item[1]),
+            )[:k]
+            want = [{"id": f"r{i}", "overall_score": r["overall_score"], "scores": r["scores"]} for r, i in ranked]
+            if index.search(job, k) != want:
+                wrong += 1
+                print(f"MISMATCH {job.title!r}")
+    return wrong
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--resumes", type=int, default=100_000, help="Resumes in the timed index")
+    parser.add_argument("--distinct", type=int, default=1000, help="Distinct resume texts among them")
+    parser.add_argument("--check", type=int, default=200, help="Resumes in the brute-force comparison")
+    parser.add_argument("-k", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    wrong = check(_texts(args.check))
+    print(f"{len(_jobs()) - wrong}/{len(_jobs())} jobs ranked as by score() over {args.check} resumes")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        index = CandidateIndex(str(Path(tmp) / "index.sqlite3"))
+        started = time.perf_counter()
+        texts = _texts(args.distinct)
+        index.add_many((f"r{i}", texts[i % len(texts)], None) for i in range(args.resumes))
+        print(f"indexed {len(index)} resumes in {time.perf_counter() - started:.1f} s")
+
+        reopened = CandidateIndex(index.path)
+        started = time.perf_counter()
+        loaded = len(reopened)
+        print(f"loaded {loaded} resumes from disk in {time.perf_counter() - started:.1f} s")
+
+        for job in _jobs():
+            times = []
+            for _ in range(args.repeat):
+                started = time.perf_counter()
+                reopened.search(job, args.k)
+                times.append((time.perf_counter() - started) * 1e3)
+            print(f"{job.title:<28} {len(job.skills):>3} skills  median {statistics.median(times):7.1f} ms")
+    if wrong:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
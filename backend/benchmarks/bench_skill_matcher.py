@@ -0,0 +1,49 @@
+"""Compare the Aho-Corasick alias matcher against per-alias regex scans.
+
+Run from ``backend/``::
+
+    python -m benchmarks.bench_skill_matcher
+"""
+from __future__ import annotations
+
+import re
+import timeit
+
+from app.analyzer import _SKILL_ALIASES, _SKILL_MATCHER, _has_any_alias, _skill_vocabulary
+
+from .corpus import synthetic_resume
+
+
+def _regex_scan(text_l: str, skills: set[str]) -> set[str]:
+    # The pre-automaton implementation: one regex search per skill alias.
+    found: set[str] = set()
+    for skill in skills:
+        for alias in _SKILL_ALIASES.get(skill, {skill}):
+            if alias and re.search(rf"\b{re.escape(alias.lower())}\b", text_l):
+                found.add(skill)
+                break
+    return found
+
+
+def _automaton_scan(text_l: str, skills: set[str]) -> set[str]:
+    hits = _SKILL_MATCHER.find(text_l)
+    return {skill for skill in skills if _has_any_alias(skill, text_l, hits)}
+
+
+def main() -> None:
+    vocab = _skill_vocabulary()
+    print(f"vocabulary: {len(vocab)} skills/aliases")
+    for pages in (1, 5, 20):
+        text_l = synthetic_resume(pages).lower()
+        assert _regex_scan(text_l, vocab) == _automaton_scan(text_l, vocab)
+        n = 20
+        t_re = timeit.timeit(lambda: _regex_scan(text_l, vocab), number=n) / n
+        t_ac = timeit.timeit(lambda: _automaton_scan(text_l, vocab), number=n) / n
+        print(
+            f"{pages:>2} page(s), {len(text_l):>6} chars: "
+            f"regex {t_re * 1000:8.2f} ms  automaton {t_ac * 1000:8.2f} ms  speedup x{t_re / t_ac:.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,25 @@
+"""Time title classification over the fixture titles in ``tests/test_title_index.py``.
+
+Run from ``backend/``::
+
+    python -m benchmarks.bench_title_index
+"""
+from __future__ import annotations
+
+import timeit
+
+from app.title_index import TitleIndex, _AREA_RULES, _FAMILY_RULES, _ROLE_RULES, classify_title, normalize_title
+from tests.test_title_index import EXPECTED
+
+
+def main() -> None:
+    titles = list(EXPECTED)
+    n = 20
+    cold = TitleIndex([_ROLE_RULES, _FAMILY_RULES, _AREA_RULES])
+    t_cold = timeit.timeit(lambda: [cold._classify(normalize_title(t)) for t in titles], number=n) / n / len(titles)
+    t_memo = timeit.timeit(lambda: [classify_title(t) for t in titles], number=n) / n / len(titles)
+    print(f"per title: uncached {t_cold * 1e6:6.2f} us  memoized {t_memo * 1e6:6.2f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import random
+
+from app.roles import ROLES
+
+
+_FILLER = (
+    "Collaborated with cross-functional teams to deliver features on time and improve reliability. "
+    "Owned the design, implementation and rollout of internal services used by several product teams. "
+    "Mentored junior engineers, reviewed code and wrote documentation for onboarding. "
+)
+
+_ALL_SKILLS = sorted(
+    {s for role in ROLES.values() for s in role.required_skills | role.preferred_skills | role.keywords}
+)
+
+
+def synthetic_resume(pages: int = 1, seed: int = 0) -> str:
+    """Build a plausible resume text of roughly ``pages`` pages (~3,000 chars each)."""
+    rng = random.Random(seed)
+    out = [
+        "Jane Doe",
+        "Summary",
+        "Software engineer with 6 years of experience building data-heavy web products.",
+        "Skills",
+        ", ".join(rng.sample(_ALL_SKILLS, 25)),
+        "Education",
+        "B.Tech in Computer Science, Example Institute of Technology, 2016",
+        "Experience",
+    ]
+    while sum(len(ln) for ln in out) < pages * 3000:
+        year = rng.randint(2012, 2023)
+        out.append(f"Senior Developer, Example Corp {year} - {'Present' if rng.random() < 0.2 else year + 2}")
+        for _ in range(3):
+            used = ", ".join(rng.sample(_ALL_SKILLS, 3))
+            out.append(f"• {_FILLER[: rng.randint(80, len(_FILLER))]} Used {used}.")
+    out.append("Projects")
+    out.append("• Resume analyzer built with python, flask and react; deployed on aws with docker.")
+    return "\n".join(out)
+
+
+def noisy_text(text: str, seed: int = 0) -> str:
+    """Mimic what PDF text layers tend to return for ``text``.
+
+    Adds ligatures, words hyphenated across lines, glued and letter-spaced
+    words, stray tabs and non-breaking spaces, odd bullets, runs of blank
+    lines and a repeated page header/footer.
+    """
+    rng = random.Random(seed)
+    out: list[str] = []
+    for n, line in enumerate(text.splitlines()):
+        if n and n % 50 == 0:
+            out += ["", "", "", f"Jane Doe - Resume    Page {n // 50 + 1}", "", ""]
+        words = line.replace("fi", "\ufb01").replace("ff", "\ufb00").split(" ")
+        noisy: list[str] = []
+        for w in words:
+            r = rng.random()
+            if r < 0.02 and len(w) > 6:
+                cut = len(w) // 2
+                out.append(" ".join(noisy + [w[:cut] + "-"]))
+                noisy = [w[cut:]]
+                continue
+            if r < 0.04 and noisy:
+                noisy[-1] += w
+                continue
+            if r < 0.05:
+                w = " ".join(w)
+            elif r < 0.07:
+                w = w + "\u00a0"
+            elif r < 0.08:
+                w = "\t" + w
+            noisy.append(w)
+        line = " ".join(noisy)
+        if line.startswith("\u2022") and rng.random() < 0.5:
+            line = rng.choice(["\uf0b7", "\u25cf", "-", "\u25aa"]) + line[1:]
+        out.append(line)
+    return "\n".join(out)
+
+
+def _pdf_escape(s: str) -> bytes:
+    return s.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)").encode("latin-1", "replace")
+
+
+def synthetic_pdf(text: str, lines_per_page: int = 50) -> bytes:
+    """Write ``text`` into a minimal text-layer PDF (Helvetica, one line per text row)."""
+    lines = text.splitlines() or [""]
+    pages = [lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)]
+
+    # 1 catalog, 2 page tree, 3 font, then a (page, content stream) pair per page
+    kids = " ".join(f"{4 + 2 * i} 0 R" for i in range(len(pages)))
+    objs = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        f"<< /Type /Pages /Kids [{kids}] /Count {len(pages)} >>".encode(),
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    for i, page_lines in enumerate(pages):
+        stream = b"BT /F1 10 Tf 40 800 Td 12 TL " + b" ".join(b"(" + _pdf_escape(ln) + b") '" for ln in page_lines) + b" ET"
+        objs.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {5 + 2 * i} 0 R >>".encode()
+        )
+        objs.append(f"<< /Length {len(stream)} >>\nstream\n".encode() + stream + b"\nendstream")
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for n, obj in enumerate(objs, 1):
+        offsets.append(len(out))
+        out += f"{n} 0 obj\n".encode() + obj + b"\nendobj\n"
+    xref = len(out)
+    out += f"xref\n0 {len(objs) + 1}\n0000000000 65535 f \n".encode()
+    for off in offsets:
+        out += f"{off:010d} 00000 n \n".encode()
+    out += f"trailer\n<< /Size {len(objs) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    return bytes(out)
@@ -0,0 +1,103 @@
+"""A local stand-in for the market data service.
+
+Answers ``GET /market-data?title=...`` from the built-in mock profiles, with
+an optional delay or failure, so the HTTP provider can be exercised without
+the real service. Run it on its own for manual testing::
+
+    python -m benchmarks.fake_market_server --port 8081 --latency 0.3
+    MARKET_API_URL=http://127.0.0.1:8081 python -m app.main
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from app.job_market_api import MockMarketDataProvider
+
+MARKER = "Served by the fake market data server"
+
+
+class FakeMarketServer:
+    """Context manager running the fake service on a free local port.
+
+    ``latency`` delays every answer; set ``fail`` to answer 503 instead.
+    ``requests`` counts the calls received.
+    """
+
+    def __init__(self, latency: float = 0.0, fail: bool = False, port: int = 0):
+        self.latency = latency
+        self.fail = fail
+        self.requests = 0
+        mock = MockMarketDataProvider()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Send headers and body in one segment so keep-alive connections
+            # do not stall on delayed ACKs
+            wbufsize = 1 << 16
+            disable_nagle_algorithm = True
+
+            def do_GET(self) -> None:
+                server.requests += 1
+                url = urlparse(self.path)
+                time.sleep(server.latency)
+                if url.path != "/market-data" or server.fail:
+                    self._send(503 if server.fail else 404, {"detail": "unavailable"})
+                    return
+                title = parse_qs(url.query).get("title", [""])[0]
+                data = mock.fetch(title)
+                body = {
+                    "demand_score": data.demand_score,
+                    "salary_range": dict(data.salary_range),
+                    "trending_skills": list(data.trending_skills),
+                    "growth_rate": data.growth_rate,
+                    "market_insights": [MARKER, *data.market_insights],
+                }
+                self._send(200, body)
+
+            def _send(self, status: int, body: dict) -> None:
+                payload = json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format: str, *args) -> None:
+                pass
+
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+        self._httpd.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self._httpd.server_address[1]}"
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+
+    def __enter__(self) -> FakeMarketServer:
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Serve mock market data over HTTP.")
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds to wait before each answer")
+    parser.add_argument("--fail", action="store_true", help="Answer every request with 503")
+    args = parser.parse_args()
+    with FakeMarketServer(latency=args.latency, fail=args.fail, port=args.port) as server:
+        print(f"Fake market data server on {server.url}")
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
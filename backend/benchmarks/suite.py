@@ -0,0 +1,197 @@
+"""Per-stage benchmarks of the analysis pipeline, with regression checks.
+
+Every stage runs on a small, a typical and a 20-page synthetic resume, and
+on a noisy variant of the typical one. Results are written as JSON; given a
+baseline from an earlier run, any stage whose median slowed down by more
+than the threshold is reported and the exit status is 1.
+
+Run from ``backend/``::
+
+    python -m benchmarks.suite --out results.json
+    python -m benchmarks.suite --baseline results.json --threshold 0.25
+    python -m benchmarks.suite --filter tfidf --repeat 9
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import timeit
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable
+
+from app.analyzer import (
+    ResumeDocument,
+    _build_job_profile,
+    _extract_skills_enhanced,
+    _normalize_text,
+    _split_sections,
+    _tfidf_similarity,
+    _top_keywords,
+    analyze_resume_against_job,
+    compile_job,
+)
+from app.job_market_api import MockMarketDataProvider, job_market_api
+from app.pdf_text import extract_text
+
+from .corpus import noisy_text, synthetic_pdf, synthetic_resume
+
+
+_JOB_TITLE = "Data Scientist"
+
+# name -> (pages, noisy)
+_DOCUMENTS = {
+    "small": (0.3, False),
+    "typical": (2, False),
+    "long": (20, False),
+    "noisy": (2, True),
+}
+
+
+def _documents() -> dict[str, tuple[str, bytes]]:
+    """Raw text (as extracted from the PDF) and the PDF itself, per document."""
+    out = {}
+    for name, (pages, noisy) in _DOCUMENTS.items():
+        text = synthetic_resume(pages, seed=7)
+        if noisy:
+            text = noisy_text(text, seed=7)
+        pdf = synthetic_pdf(text)
+        out[name] = (extract_text(pdf), pdf)
+    return out
+
+
+def _stages() -> dict[str, Callable[[str, bytes], Callable[[], object]]]:
+    """Stage name -> factory building the zero-argument call to time for one document."""
+    profile = compile_job(_JOB_TITLE)
+    mock = MockMarketDataProvider()
+    job_market_api.get_job_market_data(_JOB_TITLE)
+
+    def prepared(raw: str) -> ResumeDocument:
+        return ResumeDocument.parse(raw)
+
+    return {
+        "pdf_extract": lambda raw, pdf: lambda: extract_text(pdf),
+        "normalize": lambda raw, pdf: lambda: _normalize_text(raw),
+        "split_sections": lambda raw, pdf: (lambda text: lambda: _split_sections(text))(_normalize_text(raw)),
+        "parse_document": lambda raw, pdf: lambda: ResumeDocument.parse(raw),
+        "skill_extraction": lambda raw, pdf: (
+            lambda doc: lambda: _extract_skills_enhanced(doc, profile.skills, profile.skill_index)
+        )(prepared(raw)),
+        "top_keywords": lambda raw, pdf: (lambda doc: lambda: _top_keywords(doc, limit=20))(prepared(raw)),
+        "tfidf_similarity": lambda raw, pdf: (
+            lambda doc: lambda: _tfidf_similarity(doc.text, profile.description, profile.tfidf_vector)
+        )(prepared(raw)),
+        "market_lookup": lambda raw, pdf: lambda: job_market_api.get_job_market_data(_JOB_TITLE),
+        "market_fetch": lambda raw, pdf: lambda: mock.fetch(_JOB_TITLE),
+        "compile_job": lambda raw, pdf: lambda: _build_job_profile(_JOB_TITLE, ""),
+        "end_to_end": lambda raw, pdf: lambda: analyze_resume_against_job(raw, "", _JOB_TITLE),
+    }
+
+
+# Stages that do not depend on the resume are only timed once
+_DOCUMENT_FREE = {"market_lookup", "market_fetch", "compile_job"}
+
+
+def _measure(fn: Callable[[], object], repeat: int, min_time: float) -> dict:
+    timer = timeit.Timer(fn)
+    number = 1
+    while True:
+        if timer.timeit(number) >= min_time:
+            break
+        number *= 2 if number < 1000 else 10
+    runs = [t / number for t in timer.repeat(repeat=repeat, number=number)]
+    return {
+        "median_ms": round(statistics.median(runs) * 1e3, 5),
+        "min_ms": round(min(runs) * 1e3, 5),
+        "max_ms": round(max(runs) * 1e3, 5),
+        "loops": number,
+        "repeat": repeat,
+    }
+
+
+def _git_revision() -> str | None:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=5)
+    except OSError:
+        return None
+    return out.stdout.strip() or None
+
+
+def run(filter_: str = "", repeat: int = 5, min_time: float = 0.05) -> dict:
+    docs = _documents()
+    results: dict[str, dict] = {}
+    for stage, factory in _stages().items():
+        names = ["typical"] if stage in _DOCUMENT_FREE else list(docs)
+        for doc_name in names:
+            name = stage if stage in _DOCUMENT_FREE else f"{stage}/{doc_name}"
+            if filter_ and filter_ not in name:
+                continue
+            raw, pdf = docs[doc_name]
+            results[name] = _measure(factory(raw, pdf), repeat, min_time)
+            print(f"{name:<30}{results[name]['median_ms']:>12.3f} ms", file=sys.stderr)
+    return {
+        "meta": {
+            "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "revision": _git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "documents": {name: len(raw) for name, (raw, _) in docs.items()},
+        },
+        "results": results,
+    }
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> list[str]:
+    """Names of benchmarks whose median grew by more than ``threshold`` (a fraction)."""
+    regressions = []
+    for name, result in current["results"].items():
+        before = baseline.get("results", {}).get(name)
+        if not before:
+            continue
+        ratio = result["median_ms"] / before["median_ms"] if before["median_ms"] else 1.0
+        result["baseline_ms"] = before["median_ms"]
+        result["ratio"] = round(ratio, 3)
+        if ratio > 1 + threshold:
+            regressions.append(name)
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark each stage of the resume analysis pipeline.")
+    parser.add_argument("--out", type=Path, help="Write results as JSON here (default: stdout)")
+    parser.add_argument("--baseline", type=Path, help="Earlier results to compare against")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Allowed slowdown before failing (default 0.25 = 25%%)")
+    parser.add_argument("--filter", default="", help="Only run benchmarks whose name contains this")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per benchmark (default 5)")
+    parser.add_argument("--min-time", type=float, default=0.05, help="Minimum seconds per timed run (default 0.05)")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    current = run(args.filter, args.repeat, args.min_time)
+    regressions: list[str] = []
+    if args.baseline:
+        regressions = compare(current, json.loads(args.baseline.read_text(encoding="utf-8")), args.threshold)
+        current["meta"]["baseline"] = str(args.baseline)
+        current["meta"]["threshold"] = args.threshold
+    current["regressions"] = regressions
+
+    payload = json.dumps(current, indent=2)
+    if args.out:
+        args.out.write_text(payload + "\n", encoding="utf-8")
+    else:
+        print(payload)
+    for name in regressions:
+        r = current["results"][name]
+        print(f"REGRESSION {name}: {r['baseline_ms']:.3f} ms -> {r['median_ms']:.3f} ms (x{r['ratio']})", file=sys.stderr)
+    print(f"{len(current['results'])} benchmarks in {time.perf_counter() - start:.0f} s", file=sys.stderr)
+    if regressions:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
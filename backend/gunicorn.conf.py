@@ -0,0 +1,10 @@
+# Picked up automatically when gunicorn is started from backend/
+import os
+
+
+def child_exit(server, worker):
+    # Drop a dead worker's live gauges (in-progress requests, busy job workers)
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(worker.pid)
@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+
+from app.analyzer import compile_job, score
+from app.batch_scoring import score_matrix, top_rows
+from app.roles import ROLES
+from benchmarks.corpus import noisy_text, synthetic_resume
+
+TEXTS = [
+    synthetic_resume(0.5, seed=1),
+    noisy_text(synthetic_resume(0.5, seed=2), seed=2),
+    synthetic_resume(1, seed=3),
+    "Summary\nAnalyst.\nSkills\nqlik, lookr, snowflak\nExperience\nUsed dbt at Foo 2019-2022",
+    "blorf quizzle",
+    "",
+]
+JOBS = [compile_job(role.title) for role in list(ROLES.values())[:4]] + [
+    compile_job("Analyst", "Skills\nqlik, looker, snowflake, dbt"),
+    compile_job("", "blorf quizzle"),
+]
+
+
+def test_every_entry_equals_score():
+    matrix = score_matrix(TEXTS, JOBS)
+    assert matrix.shape == (len(TEXTS), len(JOBS))
+    for i, text in enumerate(TEXTS):
+        for j, job in enumerate(JOBS):
+            result = score(text, job)
+            assert matrix.overall[i, j] == result["overall_score"], (i, j)
+            for name in ("similarity", "skills", "keywords", "sections"):
+                assert getattr(matrix, name)[i, j] == result["scores"][name], (i, j, name)
+            assert matrix.detail(i, j) == result
+
+
+def test_cached_sections_are_used():
+    sections = [{"skills": "python, sql"}] + [None] * (len(TEXTS) - 1)
+    matrix = score_matrix(TEXTS, JOBS, sections=sections)
+    assert matrix.overall[0, 0] == score(TEXTS[0], JOBS[0], resume_sections=sections[0])["overall_score"]
+
+
+@pytest.mark.parametrize("k", [0, 1, 3, 10])
+def test_top_rows_breaks_ties_by_index(k):
+    values = np.array([5, 9, 5, 9, 1, 5])
+    assert top_rows(values, k).tolist() == sorted(range(len(values)), key=lambda i: (-values[i], i))[:k]
+
+
+def test_top_returns_the_best_resumes_for_a_job():
+    matrix = score_matrix(TEXTS, JOBS)
+    column = matrix.overall[:, 0]
+    assert matrix.top(0, 2) == [(int(i), int(column[i])) for i in top_rows(column, 2)]
@@ -0,0 +1,262 @@
+import os
+import threading
+import time
+from dataclasses import replace
+from datetime import timedelta
+
+import pytest
+
+from app import job_market_api
+from app.job_market_api import (
+    _MARKET_PROFILES,
+    CircuitBreaker,
+    HTTPMarketDataProvider,
+    JobMarketAPI,
+    MockMarketDataProvider,
+    ProviderUnavailable,
+    SnapshotMarketDataProvider,
+    market_api_from_env,
+    write_snapshot,
+)
+from benchmarks.fake_market_server import MARKER, FakeMarketServer
+
+
+class CountingProvider:
+    """Mock market data, counting calls per title; ``gate`` holds every fetch until set."""
+
+    def __init__(self, gate=None, fail=False):
+        self.calls = []
+        self.gate = gate
+        self.fail = fail
+        self._mock = MockMarketDataProvider()
+
+    def fetch(self, job_title):
+        self.calls.append(job_title)
+        if self.gate is not None:
+            self.gate.wait(5)
+        if self.fail:
+            raise ConnectionError("market data service down")
+        return self._mock.fetch(job_title)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(job_market_api.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_titles_share_one_entry_once_normalized():
+    provider = CountingProvider()
+    api = JobMarketAPI(provider=provider)
+    first = api.get_job_market_data("Data Scientist")
+    assert api.get_job_market_data("  data scientist ") is first
+    assert len(provider.calls) == 1
+    stats = api.cache_stats()
+    assert (stats["hits"], stats["misses"], stats["size"]) == (1, 1, 1)
+
+
+def test_cache_is_a_bounded_lru():
+    provider = CountingProvider()
+    api = JobMarketAPI(provider=provider, max_entries=2)
+    for title in ("Data Scientist", "Web Developer", "Data Scientist", "DevOps Engineer"):
+        api.get_job_market_data(title)
+    assert list(api.cache) == ["data scientist", "devops engineer"]
+    assert api.cache_stats()["evictions"] == 1
+
+
+def test_expired_entries_go_before_live_ones(clock):
+    api = JobMarketAPI(
+        provider=CountingProvider(), max_entries=2, cache_duration=timedelta(seconds=10), stale_duration=timedelta(0)
+    )
+    api.get_job_market_data("Data Scientist")
+    clock[0] += 5
+    api.get_job_market_data("Web Developer")
+    clock[0] += 6
+    api.get_job_market_data("DevOps Engineer")
+    assert list(api.cache) == ["web developer", "devops engineer"]
+    stats = api.cache_stats()
+    assert (stats["expirations"], stats["evictions"]) == (1, 0)
+
+
+def run_while_fetch_is_held(provider, target, n):
+    """Start ``n`` threads running ``target`` and release the provider once they had time to queue up."""
+    threads = [threading.Thread(target=target) for _ in range(n)]
+    for t in threads:
+        t.start()
+    deadline = time.monotonic() + 5
+    while not provider.calls and time.monotonic() < deadline:
+        time.sleep(0.01)
+    time.sleep(0.1)
+    provider.gate.set()
+    for t in threads:
+        t.join(5)
+
+
+def test_concurrent_misses_fetch_once():
+    provider = CountingProvider(gate=threading.Event())
+    api = JobMarketAPI(provider=provider)
+    results = []
+    run_while_fetch_is_held(provider, lambda: results.append(api.get_job_market_data("Data Scientist")), 8)
+    assert len(provider.calls) == 1
+    assert len(results) == 8 and all(r is results[0] for r in results)
+
+
+def test_failed_fetch_reaches_every_waiter_and_is_not_cached():
+    provider = CountingProvider(gate=threading.Event(), fail=True)
+    api = JobMarketAPI(provider=provider)
+    errors = []
+
+    def get():
+        try:
+            api.get_job_market_data("Data Scientist")
+        except ConnectionError as e:
+            errors.append(e)
+
+    run_while_fetch_is_held(provider, get, 4)
+    assert len(errors) == 4 and len(provider.calls) == 1
+    assert api.cache_stats()["size"] == 0
+    provider.fail = False
+    assert api.get_job_market_data("Data Scientist").title == "Data Scientist"
+
+
+def wait_for_refreshes(api):
+    # perf_counter: the clock fixture freezes time.monotonic
+    deadline = time.perf_counter() + 5
+    while api._inflight and time.perf_counter() < deadline:
+        time.sleep(0.01)
+
+
+class ConstantProvider:
+    def __init__(self, demand_score):
+        self.demand_score = demand_score
+        self.fail = False
+
+    def fetch(self, job_title):
+        if self.fail:
+            raise ProviderUnavailable("down")
+        return replace(MockMarketDataProvider().fetch(job_title), demand_score=self.demand_score)
+
+
+def test_stale_data_is_served_while_it_refreshes(clock):
+    provider = ConstantProvider(1.0)
+    api = JobMarketAPI(provider=provider, cache_duration=timedelta(seconds=10), stale_duration=timedelta(seconds=60))
+    api.get_job_market_data("Data Scientist")
+    provider.demand_score = 2.0
+    clock[0] += 11
+    assert api.get_job_market_data("Data Scientist").demand_score == 1.0
+    wait_for_refreshes(api)
+    assert api.get_job_market_data("Data Scientist").demand_score == 2.0
+    stats = api.cache_stats()
+    assert (stats["hits"], stats["stale_hits"], stats["misses"]) == (1, 1, 1)
+
+    clock[0] += 11 + 60
+    provider.demand_score = 3.0
+    assert api.get_job_market_data("Data Scientist").demand_score == 3.0
+    assert api.cache_stats()["expirations"] == 1
+
+
+def test_failed_refresh_keeps_the_stale_data(clock):
+    provider = ConstantProvider(1.0)
+    api = JobMarketAPI(provider=provider, cache_duration=timedelta(seconds=10))
+    api.get_job_market_data("Data Scientist")
+    provider.fail = True
+    clock[0] += 11
+    assert api.get_job_market_data("Data Scientist").demand_score == 1.0
+    wait_for_refreshes(api)
+    assert api.get_job_market_data("Data Scientist").demand_score == 1.0
+    assert api.cache_stats()["refresh_failures"] >= 1
+
+
+def test_first_request_is_answered_from_the_fallback():
+    api = JobMarketAPI(provider=ConstantProvider(2.0), fallback=ConstantProvider(1.0))
+    assert api.get_job_market_data("Data Scientist").demand_score == 1.0
+    wait_for_refreshes(api)
+    assert api.get_job_market_data("Data Scientist").demand_score == 2.0
+
+
+def test_circuit_breaker_opens_and_lets_one_trial_through(clock):
+    breaker = CircuitBreaker(failure_threshold=2, reset_after=30)
+    breaker.record_failure()
+    assert breaker.allow() and breaker.state == "closed"
+    breaker.record_failure()
+    assert not breaker.allow() and breaker.state == "open"
+
+    clock[0] += 30
+    assert breaker.state == "half-open"
+    assert breaker.allow()
+    assert not breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open"
+
+    clock[0] += 30
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed" and breaker.allow()
+
+
+def test_http_provider_reads_the_service():
+    with FakeMarketServer() as server:
+        provider = HTTPMarketDataProvider(server.url, timeout=5)
+        data = provider.fetch("Data Scientist")
+    expected = MockMarketDataProvider().fetch("Data Scientist")
+    assert data.market_insights[0] == MARKER
+    assert (data.salary_range, data.trending_skills) == (expected.salary_range, expected.trending_skills)
+
+
+def test_http_provider_failures_open_the_circuit():
+    with FakeMarketServer(fail=True) as server:
+        provider = HTTPMarketDataProvider(server.url, timeout=5, breaker=CircuitBreaker(failure_threshold=2))
+        for _ in range(2):
+            with pytest.raises(ProviderUnavailable, match="fetch failed"):
+                provider.fetch("Data Scientist")
+        with pytest.raises(ProviderUnavailable, match="circuit is open"):
+            provider.fetch("Data Scientist")
+        assert server.requests == 2
+
+
+def test_snapshot_serves_the_profiles_it_was_written_from(tmp_path):
+    path = tmp_path / "market.bin"
+    write_snapshot(_MARKET_PROFILES, path)
+    snapshot, mock = SnapshotMarketDataProvider(path), MockMarketDataProvider()
+    assert sorted(snapshot.keys()) == sorted(_MARKET_PROFILES)
+    for title in ("AI Engineer", "Data Scientist", "Product Manager", "Business Analyst", "Florist"):
+        assert snapshot.fetch(title) == mock.fetch(title)
+
+
+def test_snapshot_is_remapped_when_replaced(tmp_path, clock):
+    path = tmp_path / "market.bin"
+    write_snapshot(_MARKET_PROFILES, path)
+    snapshot = SnapshotMarketDataProvider(path, check_interval=30)
+    write_snapshot({**_MARKET_PROFILES, "general": {**_MARKET_PROFILES["general"], "demand_score": 1.5}}, path)
+    assert snapshot.fetch("Florist").demand_score == _MARKET_PROFILES["general"]["demand_score"]
+    clock[0] += 30
+    assert snapshot.fetch("Florist").demand_score == 1.5
+
+    garbage = tmp_path / "garbage.bin"
+    garbage.write_bytes(b"garbage")
+    os.replace(garbage, path)
+    clock[0] += 30
+    assert snapshot.fetch("Florist").demand_score == 1.5
+
+
+def test_malformed_snapshots_are_rejected(tmp_path):
+    with pytest.raises(ValueError, match="general"):
+        write_snapshot({"analyst": _MARKET_PROFILES["analyst"]}, tmp_path / "market.bin")
+    with pytest.raises(ValueError, match="'general'"):
+        write_snapshot({"general": {"demand_score": 1.0}}, tmp_path / "market.bin")
+    (tmp_path / "other.bin").write_bytes(b"not a snapshot")
+    with pytest.raises(ValueError, match="not a market data snapshot"):
+        SnapshotMarketDataProvider(tmp_path / "other.bin")
+
+
+def test_unreadable_snapshot_falls_back_to_the_built_in_data(monkeypatch, tmp_path):
+    path = tmp_path / "market.bin"
+    path.write_bytes(b"garbage")
+    monkeypatch.setattr(job_market_api, "SNAPSHOT_PATH", path)
+    monkeypatch.setenv("MARKET_SNAPSHOT_PATH", str(path))
+    monkeypatch.delenv("MARKET_API_URL", raising=False)
+    assert isinstance(market_api_from_env().provider, MockMarketDataProvider)
+
+    write_snapshot(_MARKET_PROFILES, path)
+    assert isinstance(market_api_from_env().provider, SnapshotMarketDataProvider)
@@ -0,0 +1,138 @@
+import time
+
+import pytest
+
+from app import job_queue
+from app.job_queue import JobQueue, MemoryBroker, QueueFull, SQLiteBroker, backend_from_env, queue_from_env
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def make_broker(request, tmp_path):
+    if request.param == "memory":
+        return lambda **kw: MemoryBroker(**kw)
+    return lambda **kw: SQLiteBroker(str(tmp_path / "jobs.sqlite3"), poll_interval=0.01, **kw)
+
+
+def wait_for(queue, job_id, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = queue.status(job_id)
+        if job["status"] in ("done", "failed"):
+            return job
+        time.sleep(0.01)
+    raise AssertionError(f"job {job_id} still {job['status']}")
+
+
+def test_broker_lifecycle(make_broker):
+    broker = make_broker()
+    broker.enqueue("a", {"file": b"%PDF", "job_title": "Data Scientist"})
+    broker.enqueue("b", {"file": b"%PDF", "job_title": "ML Engineer"})
+    assert broker.depth() == 2
+    assert broker.get("a")["status"] == "queued"
+
+    job_id, payload = broker.claim(timeout=0)
+    assert (job_id, payload) == ("a", {"file": b"%PDF", "job_title": "Data Scientist"})
+    assert broker.get("a")["status"] == "running"
+    assert broker.depth() == 1
+
+    broker.finish("a", {"overall_score": 50}, 200)
+    job = broker.get("a")
+    assert (job["status"], job["result"], job["status_code"]) == ("done", {"overall_score": 50}, 200)
+    broker.finish("b", {"detail": "bad pdf"}, 400)
+    assert broker.get("b")["status"] == "failed"
+    assert broker.get("missing") is None
+
+
+def test_broker_rejects_jobs_past_max_depth(make_broker):
+    broker = make_broker(max_depth=1)
+    broker.enqueue("a", {"file": b""})
+    with pytest.raises(QueueFull):
+        broker.enqueue("b", {"file": b""})
+    assert broker.get("b") is None
+    assert broker.claim(timeout=0)[0] == "a"
+    broker.enqueue("b", {"file": b""})
+
+
+def test_broker_claim_times_out(make_broker):
+    assert make_broker().claim(timeout=0.05) is None
+
+
+def test_finished_jobs_expire(make_broker, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(job_queue.time, "time", lambda: now[0])
+    broker = make_broker(result_ttl=60)
+    broker.enqueue("a", {"file": b""})
+    broker.claim(timeout=0)
+    broker.finish("a", {}, 200)
+    now[0] += 61
+    broker.enqueue("b", {"file": b""})
+    assert broker.get("a") is None
+
+
+def test_sqlite_broker_is_shared_and_reclaims_stale_jobs(tmp_path, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(job_queue.time, "time", lambda: now[0])
+    path = str(tmp_path / "jobs.sqlite3")
+    accepting = SQLiteBroker(path, stale_after=300)
+    working = SQLiteBroker(path, stale_after=300)
+    accepting.enqueue("a", {"file": b"%PDF"})
+    assert working.claim(timeout=0)[0] == "a"
+    assert accepting.claim(timeout=0) is None
+    now[0] += 301
+    assert accepting.claim(timeout=0)[0] == "a"
+    accepting.finish("a", {"overall_score": 1}, 200)
+    assert working.get("a")["result"] == {"overall_score": 1}
+
+
+def test_queue_runs_jobs_and_reports_handler_errors(make_broker):
+    def handler(payload):
+        if payload["job_title"] == "boom":
+            raise RuntimeError("boom")
+        return {"title": payload["job_title"]}, 200
+
+    queue = JobQueue(make_broker(), handler, workers=2)
+    ok = queue.submit({"file": b"", "job_title": "Data Scientist"})
+    bad = queue.submit({"file": b"", "job_title": "boom"})
+    assert wait_for(queue, ok)["result"] == {"title": "Data Scientist"}
+    job = wait_for(queue, bad)
+    assert (job["status"], job["status_code"]) == ("failed", 500)
+    assert job["result"] == {"detail": "Analysis failed: boom"}
+
+
+def test_workers_drain_jobs_another_process_queued(tmp_path):
+    path = str(tmp_path / "jobs.sqlite3")
+    SQLiteBroker(path).enqueue("a", {"file": b"", "job_title": "Data Scientist"})
+    queue = JobQueue(SQLiteBroker(path, poll_interval=0.01), lambda p: ({"title": p["job_title"]}, 200), workers=1)
+    assert wait_for(queue, "a")["result"] == {"title": "Data Scientist"}
+
+
+@pytest.mark.parametrize(
+    "env, kind",
+    [
+        ({}, "memory"),
+        ({"WEB_CONCURRENCY": "1"}, "memory"),
+        ({"WEB_CONCURRENCY": "3"}, "sqlite"),
+        ({"JOB_QUEUE_BACKEND": " SQLite "}, "sqlite"),
+        ({"JOB_QUEUE_BACKEND": "memory", "WEB_CONCURRENCY": "3"}, "memory"),
+    ],
+)
+def test_backend_from_env(monkeypatch, env, kind):
+    monkeypatch.delenv("JOB_QUEUE_BACKEND", raising=False)
+    monkeypatch.delenv("WEB_CONCURRENCY", raising=False)
+    for name, value in env.items():
+        monkeypatch.setenv(name, value)
+    assert backend_from_env() == kind
+
+
+def test_queue_from_env(monkeypatch, tmp_path):
+    monkeypatch.delenv("JOB_QUEUE_BACKEND", raising=False)
+    monkeypatch.setenv("WEB_CONCURRENCY", "3")
+    monkeypatch.setenv("JOB_QUEUE_PATH", str(tmp_path / "jobs.sqlite3"))
+    monkeypatch.setenv("JOB_QUEUE_WORKERS", "1")
+    queue = queue_from_env(lambda payload: ({}, 200))
+    assert isinstance(queue.broker, SQLiteBroker)
+    assert queue.workers == 1
+
+    monkeypatch.setenv("JOB_QUEUE_BACKEND", "memory")
+    with pytest.raises(RuntimeError, match="JOB_QUEUE_BACKEND=sqlite"):
+        queue_from_env(lambda payload: ({}, 200))
@@ -0,0 +1,137 @@
+import pytest
+
+from app import result_cache
+from app.result_cache import MemoryBackend, RedisBackend, ResultCache, SQLiteBackend, cache_from_env
+
+
+class FakeRedis:
+    """The subset of the redis client RedisBackend uses."""
+
+    def __init__(self):
+        self.values = {}
+        self.scores = {}
+
+    def get(self, key):
+        return self.values.get(key)
+
+    def set(self, key, value):
+        self.values[key] = value
+
+    def delete(self, key):
+        self.values.pop(key, None)
+
+    def zadd(self, name, mapping):
+        self.scores.update(mapping)
+
+    def zcard(self, name):
+        return len(self.scores)
+
+    def zpopmin(self, name, count):
+        oldest = sorted(self.scores.items(), key=lambda kv: kv[1])[:count]
+        for key, _ in oldest:
+            del self.scores[key]
+        return [(key.encode("utf-8"), score) for key, score in oldest]
+
+
+@pytest.fixture(params=["memory", "sqlite", "redis"])
+def backend_factory(request, tmp_path):
+    if request.param == "memory":
+        return lambda size: MemoryBackend(max_entries=size)
+    if request.param == "sqlite":
+        return lambda size: SQLiteBackend(str(tmp_path / "cache.sqlite3"), max_entries=size)
+    return lambda size: RedisBackend(FakeRedis(), max_entries=size)
+
+
+def test_backends_evict_least_recently_used(backend_factory, monkeypatch):
+    clock = iter(range(1, 100))
+    monkeypatch.setattr(result_cache.time, "time", lambda: float(next(clock)))
+    backend = backend_factory(2)
+    assert backend.set("a", b"1") == 0
+    assert backend.set("b", b"2") == 0
+    assert backend.get("a") == b"1"
+    assert backend.set("c", b"3") == 1
+    assert len(backend) == 2
+    assert backend.get("b") is None
+    assert backend.get("a") == b"1"
+    assert backend.get("c") == b"3"
+
+
+def test_round_trip_and_stats(backend_factory):
+    cache = ResultCache(backend_factory(4))
+    key = ResultCache.make_key("ab" * 32, "Data Scientist", "python, sql")
+    assert cache.get(key) is None
+    cache.set(key, {"overall_score": 71.5})
+    assert cache.get(key) == {"overall_score": 71.5}
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["size"]) == (1, 1, 1)
+    assert stats["hit_ratio"] == 0.5
+
+
+def test_key_covers_file_job_and_variant():
+    key = ResultCache.make_key("ab" * 32, "Data Scientist", "python")
+    assert key == ResultCache.make_key("ab" * 32, "  data scientist ", "python\n")
+    assert key != ResultCache.make_key("cd" * 32, "Data Scientist", "python")
+    assert key != ResultCache.make_key("ab" * 32, "Data Engineer", "python")
+    assert key != ResultCache.make_key("ab" * 32, "Data Scientist", "sql")
+    assert key != ResultCache.make_key("ab" * 32, "Data Scientist", "python", variant="p20")
+
+
+def test_entries_expire_after_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(result_cache.time, "time", lambda: now[0])
+    cache = ResultCache(MemoryBackend(), ttl=60)
+    cache.set("k", {"overall_score": 1})
+    now[0] += 59
+    assert cache.get("k") == {"overall_score": 1}
+    now[0] += 2
+    assert cache.get("k") is None
+    assert cache.stats()["expirations"] == 1
+
+    forever = ResultCache(MemoryBackend(), ttl=0)
+    forever.set("k", {"overall_score": 1})
+    now[0] += 10**6
+    assert forever.get("k") == {"overall_score": 1}
+
+
+def test_corrupt_entry_is_a_miss():
+    backend = MemoryBackend()
+    backend.set("k", b"not json")
+    backend.set("old", b'{"overall_score": 1}')
+    cache = ResultCache(backend)
+    assert cache.get("k") is None
+    assert cache.get("old") is None
+    assert cache.stats()["misses"] == 2
+
+
+def test_broken_backend_never_raises():
+    class Broken:
+        def get(self, key):
+            raise ConnectionError("down")
+
+        def set(self, key, value):
+            raise ConnectionError("down")
+
+        def __len__(self):
+            raise ConnectionError("down")
+
+    cache = ResultCache(Broken())
+    cache.set("k", {"overall_score": 1})
+    assert cache.get("k") is None
+    assert cache.stats()["size"] is None
+
+
+def test_cache_from_env(monkeypatch, tmp_path):
+    monkeypatch.setenv("RESULT_CACHE_BACKEND", "none")
+    assert cache_from_env() is None
+
+    monkeypatch.setenv("RESULT_CACHE_BACKEND", "sqlite")
+    monkeypatch.setenv("RESULT_CACHE_PATH", str(tmp_path / "results.sqlite3"))
+    monkeypatch.setenv("RESULT_CACHE_SIZE", "7")
+    monkeypatch.setenv("RESULT_CACHE_TTL_SECONDS", "0")
+    cache = cache_from_env()
+    assert isinstance(cache.backend, SQLiteBackend)
+    assert (cache.backend.max_entries, cache.ttl) == (7, 0)
+
+    monkeypatch.delenv("RESULT_CACHE_BACKEND")
+    cache = cache_from_env()
+    assert isinstance(cache.backend, MemoryBackend)
@@ -0,0 +1,121 @@
+import random
+import sqlite3
+
+import pytest
+
+from app.analyzer import compile_job, score
+from app.search_index import CandidateIndex, index_from_env
+from benchmarks.corpus import noisy_text, synthetic_resume
+
+# Skills outside the vocabulary, some misspelt, exercise the text-bound path
+CUSTOM = ["airflow", "dbt", "data contracts", "lakehouse design", "qlik", "lookr", "zxqv"]
+
+JOBS = [
+    compile_job("Data Scientist"),
+    compile_job("Frontend Engineer"),
+    compile_job("Data Platform Engineer", "Build data.\nSkills\npython, airflow, dbt, data contracts, lakehouse design"),
+    compile_job("Analyst", "Skills\nqlik, lookr, sas, snowflake"),
+    compile_job("", "blorf quizzle zxqv"),
+]
+
+
+def make_text(rng, seed):
+    r = rng.random()
+    if r < 0.4:
+        return synthetic_resume(rng.choice([0.3, 0.5]), seed=seed)
+    if r < 0.55:
+        return noisy_text(synthetic_resume(0.3, seed=seed), seed=seed)
+    if r < 0.7:
+        return "blorf quizzle " * rng.randint(0, 3) + "\n" + " ".join(rng.sample(CUSTOM, 3))
+    picks = [p[:-1] if len(p) > 3 and rng.random() < 0.4 else p for p in rng.sample(CUSTOM, 4)]
+    return f"Summary\nAnalyst.\nSkills\n{', '.join(picks)}\nExperience\nUsed {rng.choice(CUSTOM)} at Foo 2019-2022"
+
+
+@pytest.fixture(scope="module")
+def texts():
+    rng = random.Random(7)
+    return {f"r{i}": make_text(rng, i) for i in range(80)}
+
+
+def expected(texts, job, k):
+    """Top ``k`` by ``score()``, ties to the earliest indexed (``texts`` is in index order)."""
+    results = [(score(text, job), n, resume_id) for n, (resume_id, text) in enumerate(texts.items())]
+    results.sort(key=lambda r: (-r[0]["overall_score"], r[1]))
+    return [(resume_id, result["overall_score"], result["scores"]) for result, _, resume_id in results[:k]]
+
+
+def ranking(index, job, k):
+    return [(r["id"], r["overall_score"], r["scores"]) for r in index.search(job, k)]
+
+
+@pytest.mark.parametrize("job", JOBS, ids=lambda job: job.title or "untitled")
+@pytest.mark.parametrize("k", [1, 10])
+def test_search_ranks_as_score_does(tmp_path, texts, job, k):
+    index = CandidateIndex(str(tmp_path / "index.sqlite3"))
+    assert index.add_many((resume_id, text, None) for resume_id, text in texts.items()) == len(texts)
+    assert ranking(index, job, k) == expected(texts, job, k)
+
+
+def test_workers_share_additions_and_deletions(tmp_path, texts):
+    path = str(tmp_path / "index.sqlite3")
+    writer, reader = CandidateIndex(path), CandidateIndex(path)
+    live = dict(texts)
+    writer.add_many((resume_id, text, None) for resume_id, text in live.items())
+    assert len(reader) == len(live)
+
+    rng = random.Random(1)
+    for resume_id in rng.sample(sorted(live), 10):
+        assert writer.delete(resume_id)
+        del live[resume_id]
+    assert not writer.delete("r-missing")
+    for resume_id in rng.sample(sorted(live), 5):
+        # A re-indexed resume counts as the most recently indexed one
+        text = live.pop(resume_id)
+        live[resume_id] = text
+        writer.add(resume_id, text)
+
+    assert "r-missing" not in reader and len(reader) == len(live)
+    for job in JOBS:
+        assert ranking(reader, job, 10) == expected(live, job, 10)
+
+
+def test_dead_rows_are_purged(tmp_path, texts):
+    index = CandidateIndex(str(tmp_path / "index.sqlite3"))
+    index.add_many((resume_id, text, None) for resume_id, text in texts.items())
+    live = dict(texts)
+    for resume_id in sorted(live)[: len(live) // 2]:
+        index.delete(resume_id)
+        del live[resume_id]
+    stats = index.stats()
+    assert stats["resumes"] == len(live)
+    assert stats["rows_in_memory"] < len(texts)
+    assert ranking(index, JOBS[0], 10) == expected(live, JOBS[0], 10)
+
+
+def test_add_many_indexes_identical_resumes_under_each_id(tmp_path, texts):
+    index = CandidateIndex(str(tmp_path / "index.sqlite3"))
+    text = texts["r0"]
+    assert index.add_many([("a", text, None), ("b", text, None), ("c", text, {"skills": "python"})]) == 3
+    results = {r["id"]: r for r in index.search(JOBS[0], 10)}
+    assert set(results) == {"a", "b", "c"}
+    assert results["a"]["scores"] == results["b"]["scores"] == score(text, JOBS[0])["scores"]
+    assert results["c"]["scores"] == score(text, JOBS[0], resume_sections={"skills": "python"})["scores"]
+
+
+def test_features_from_another_model_are_stale_until_rebuilt(tmp_path, texts):
+    path = str(tmp_path / "index.sqlite3")
+    CandidateIndex(path).add("r0", texts["r0"])
+    with sqlite3.connect(path) as conn:
+        conn.execute("UPDATE meta SET value = 'old' WHERE key = 'features'")
+    index = CandidateIndex(path)
+    assert index.stats()["stale"]
+    assert index.rebuild() == 1
+    assert not index.stats()["stale"]
+    assert not CandidateIndex(path).stale
+
+
+def test_index_from_env(monkeypatch, tmp_path):
+    monkeypatch.delenv("SEARCH_INDEX_PATH", raising=False)
+    assert index_from_env() is None
+    monkeypatch.setenv("SEARCH_INDEX_PATH", str(tmp_path / "index.sqlite3"))
+    assert index_from_env().path == str(tmp_path / "index.sqlite3")
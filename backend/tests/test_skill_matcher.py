@@ -0,0 +1,87 @@
+import random
+import re
+
+import pytest
+
+from app.analyzer import _fuzzy_match, _skill_vocabulary
+from app.skill_matcher import AliasMatcher, FuzzyIndex
+
+VOCABULARY = sorted({skill.lower() for skill in _skill_vocabulary()})
+
+
+def regex_find(patterns, text):
+    return {p for p in patterns if re.search(rf"\b{re.escape(p)}\b", text)}
+
+
+@pytest.mark.parametrize(
+    "text, found",
+    [
+        ("python and sql", {"python", "sql"}),
+        ("pythonic code, mysql", set()),
+        # As with \b, a pattern ending in a symbol needs a word character after it
+        ("c++ and c# on .net", set()),
+        ("c++x, x.net", {"c++", ".net"}),
+        ("node.js/react.js", {"node.js", "react.js"}),
+        ("machine learning engineer", {"machine learning"}),
+    ],
+)
+def test_find_uses_regex_word_boundaries(text, found):
+    matcher = AliasMatcher(["python", "sql", "c++", "c#", ".net", "node.js", "react.js", "machine learning", "java"])
+    assert matcher.find(text) == found
+
+
+def test_find_matches_regex_over_the_skill_vocabulary():
+    matcher = AliasMatcher(VOCABULARY)
+    rng = random.Random(0)
+    fillers = ["and", "with", "-", "/", ",", "(", ")", "x", "ing", "\n"]
+    for _ in range(300):
+        words = rng.sample(VOCABULARY, 4) + rng.sample(fillers, 4)
+        rng.shuffle(words)
+        text = rng.choice(["", " "]).join(words)
+        assert matcher.find(text) == regex_find(VOCABULARY, text), text
+
+
+def test_patterns_are_lowercased_and_deduplicated():
+    matcher = AliasMatcher(["Python", "python", "", None, "SQL"])
+    assert len(matcher) == 2
+    assert "PYTHON" in matcher and "sql" in matcher and 3 not in matcher
+
+
+def levenshtein(a, b):
+    row = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        prev, row[0] = row[0], i
+        for j, cb in enumerate(b, 1):
+            prev, row[j] = row[j], min(row[j] + 1, row[j - 1] + 1, prev + (ca != cb))
+    return row[-1]
+
+
+def typos(word, rng):
+    i = rng.randrange(len(word) + 1)
+    ch = rng.choice("abcdefghijklmnopqrstuvwxyz")
+    return {word, word[:i] + ch + word[i:], word[:i] + ch + word[i + 1 :], word[:i] + word[i + 1 :]} - {""}
+
+
+def test_fuzzy_candidates_cover_every_term_within_one_edit():
+    index = FuzzyIndex(VOCABULARY)
+    rng = random.Random(0)
+    for term in rng.sample(VOCABULARY, 40):
+        for word in typos(term, rng):
+            near = {t for t in VOCABULARY if levenshtein(word, t) <= 1}
+            assert near <= index.candidates(word), word
+            assert {t for t in VOCABULARY if _fuzzy_match(word, t)} <= index.candidates(word), word
+
+
+def test_fuzzy_candidates_exclude_distant_terms():
+    index = FuzzyIndex(["python", "java", "sql"])
+    assert index.candidates("pythonista") == set()
+    assert index.candidates("pythn") == {"python"}
+    assert index.candidates("mysql") == set()
+    assert index.candidates("sqls") == {"sql"}
+
+
+def test_frozen_fuzzy_index_rejects_new_terms():
+    index = FuzzyIndex(["python"]).freeze()
+    with pytest.raises(TypeError):
+        index.add("java")
+    assert "python" in index and len(index) == 1
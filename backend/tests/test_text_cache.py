@@ -0,0 +1,89 @@
+import json
+
+from app.text_cache import TextCache, cache_from_env
+
+DIGEST = TextCache.digest(b"%PDF-1.4 resume")
+
+
+def test_memory_round_trip_and_stats():
+    cache = TextCache()
+    assert cache.get(DIGEST) is None
+    cache.put(DIGEST, "Skills\npython", {"skills": "python"}, {"engine": "pypdf"})
+    assert cache.get(DIGEST) == {"text": "Skills\npython", "sections": {"skills": "python"}, "extraction": {"engine": "pypdf"}}
+    stats = cache.stats()
+    assert (stats["entries"], stats["hits"], stats["misses"]) == (1, 1, 1)
+
+
+def test_memory_budget_evicts_oldest():
+    size = len(json.dumps({"text": "x" * 100, "sections": None, "extraction": None}, separators=(",", ":")))
+    cache = TextCache(max_memory_bytes=2 * size)
+    for n in range(3):
+        cache.put(str(n), "x" * 100)
+    assert cache.get("0") is None
+    assert cache.get("1") is not None and cache.get("2") is not None
+    assert cache.stats()["evictions"] == 1
+
+    cache.put("huge", "x" * 10 * size)
+    assert cache.get("huge") is None
+
+
+def test_disk_tier_is_shared_between_instances(tmp_path):
+    TextCache(disk_dir=str(tmp_path)).put(DIGEST, "Skills\npython")
+    other = TextCache(disk_dir=str(tmp_path))
+    assert other.stats()["disk_bytes"] > 0
+    assert other.get(DIGEST)["text"] == "Skills\npython"
+    assert other.stats()["disk_hits"] == 1
+    assert other.get(DIGEST)["text"] == "Skills\npython"
+    assert other.stats()["disk_hits"] == 1
+
+
+def test_disk_budget_evicts_oldest(tmp_path):
+    size = len(json.dumps({"text": "x" * 50, "sections": None, "extraction": None}, separators=(",", ":")))
+    cache = TextCache(disk_dir=str(tmp_path), max_disk_bytes=2 * size)
+    for n in range(3):
+        cache.put(str(n), "x" * 50)
+    assert sorted(p.name for p in tmp_path.glob("*.json")) == ["1.json", "2.json"]
+    assert cache.stats()["disk_bytes"] == 2 * size
+
+
+def test_corrupt_disk_entry_is_a_miss(tmp_path):
+    (tmp_path / f"{DIGEST}.json").write_text("{not json", encoding="utf-8")
+    assert TextCache(disk_dir=str(tmp_path)).get(DIGEST) is None
+
+
+def test_variants_do_not_share_entries(tmp_path):
+    full = TextCache(disk_dir=str(tmp_path))
+    budget = TextCache(disk_dir=str(tmp_path), variant="p20")
+    full.put(DIGEST, "every page")
+    assert budget.get(DIGEST) is None
+    budget.put(DIGEST, "first pages")
+    assert full.get(DIGEST)["text"] == "every page"
+    assert TextCache(disk_dir=str(tmp_path), variant="p20").get(DIGEST)["text"] == "first pages"
+
+
+def test_warm_extracts_each_pdf_once(tmp_path):
+    (tmp_path / "a.pdf").write_bytes(b"a")
+    (tmp_path / "b.pdf").write_bytes(b"b")
+    (tmp_path / "bad.pdf").write_bytes(b"bad")
+    calls = []
+
+    def extract(data):
+        calls.append(data)
+        if data == b"bad":
+            raise ValueError("no text")
+        return data.decode()
+
+    cache = TextCache()
+    assert cache.warm(str(tmp_path), extract) == 2
+    assert cache.warm(str(tmp_path), extract) == 0
+    assert calls.count(b"a") == 1
+    assert cache.get(TextCache.digest(b"b"))["text"] == "b"
+
+
+def test_cache_from_env(monkeypatch, tmp_path):
+    monkeypatch.setenv("TEXT_CACHE_MEMORY_BYTES", "0")
+    assert cache_from_env() is None
+    monkeypatch.setenv("TEXT_CACHE_MEMORY_BYTES", "1000")
+    monkeypatch.setenv("TEXT_CACHE_DIR", str(tmp_path))
+    cache = cache_from_env(variant="p20")
+    assert (cache.max_memory_bytes, cache.disk_dir, cache.variant) == (1000, tmp_path, "p20")
@@ -0,0 +1,151 @@
+import pytest
+
+from app.analyzer import job_description_from_title
+from app.title_index import _CACHE_SIZE, TitleIndex, _AREA_RULES, _FAMILY_RULES, _ROLE_RULES, classify_title
+
+# Title -> slug. Each of these titles gets the same job description from
+# job_description_from_title as it did under the old if/elif chains.
+EXPECTED = {
+    'AI Engineer': 'ai_engineer',
+    'Senior AI Engineer': 'ai_engineer',
+    'AI Developer': 'ai_engineer',
+    'Generative AI Engineer': 'ai_engineer',
+    'Machine Learning Engineer': 'machine_learning_engineer',
+    'ML Engineer': 'machine_learning_engineer',
+    'Senior ML Engineer': 'machine_learning_engineer',
+    'Machine Learning Scientist': 'machine_learning_engineer',
+    'MLOps Engineer': 'machine_learning_engineer',
+    'Data Scientist': 'data_scientist',
+    'Senior Data Scientist': 'data_scientist',
+    'Lead Data Scientist': 'data_scientist',
+    'Data Science Manager': 'data_scientist',
+    'DevOps Engineer': 'devops_engineer',
+    'Senior DevOps Engineer': 'devops_engineer',
+    'Azure DevOps Engineer': 'devops_engineer',
+    'Cloud Architect': 'cloud_architect',
+    'AWS Cloud Architect': 'cloud_architect',
+    'Cloud Solutions Architect': 'cloud_architect',
+    'Site Reliability Engineer': 'site_reliability_engineer',
+    'SRE': 'site_reliability_engineer',
+    'Senior SRE': 'site_reliability_engineer',
+    'Cybersecurity Analyst': 'cybersecurity_analyst',
+    'Cyber Security Analyst': 'cybersecurity_analyst',
+    'Cybersecurity Engineer': 'cybersecurity_analyst',
+    'Security Engineer': 'security_engineer',
+    'Application Security Engineer': 'security_engineer',
+    'Network Security Engineer': 'security_engineer',
+    'Data Engineer': 'data_engineer',
+    'Senior Data Engineer': 'data_engineer',
+    'Big Data Engineer': 'data_engineer',
+    'Frontend Engineer': 'frontend_engineer',
+    'Frontend Developer': 'frontend_engineer',
+    'Senior Frontend Developer': 'frontend_engineer',
+    'Backend Engineer': 'backend_engineer',
+    'Backend Developer': 'backend_engineer',
+    'Python Backend Developer': 'backend_engineer',
+    'Product Manager': 'product_manager',
+    'Senior Product Manager': 'product_manager',
+    'Technical Product Manager': 'product_manager',
+    'Data Product Manager': 'product_manager',
+    'Data Analyst': 'data_analyst',
+    'Senior Data Analyst': 'data_analyst',
+    'Marketing Data Analyst': 'data_analyst',
+    'Web Developer': 'web_developer',
+    'Junior Web Developer': 'web_developer',
+    'WordPress Web Developer': 'web_developer',
+    'Software Developer': 'software_developer',
+    'Software Engineer': 'software_developer',
+    'Senior Software Engineer': 'software_developer',
+    'Software Engineer II': 'software_developer',
+    'Java Developer': 'software_developer',
+    'Python Developer': 'software_developer',
+    'Full Stack Developer': 'software_developer',
+    'Mobile Developer': 'software_developer',
+    'iOS Engineer': 'software_developer',
+    'Mechanical Engineer': 'software_developer',
+    'QA Engineer': 'software_developer',
+    'Sales Executive': 'sales_executive',
+    'Sales Manager': 'sales_executive',
+    'Sales Representative': 'sales_executive',
+    'Sales Associate': 'sales',
+    'Marketing Manager': 'marketing_manager',
+    'Marketing Specialist': 'marketing_manager',
+    'Marketing Coordinator': 'marketing_manager',
+    'Digital Marketing Lead': 'marketing',
+    'Product Owner': 'product_owner',
+    'Product Lead': 'product',
+    'Project Manager': 'project_manager',
+    'Project Coordinator': 'project_manager',
+    'IT Project Lead': 'project',
+    'Human Resources Manager': 'hr_manager',
+    'Human Resources Generalist': 'hr_manager',
+    'HR Generalist': 'hr',
+    'HR Business Partner': 'hr',
+    'Consultant': 'consultant',
+    'Management Consultant': 'consultant',
+    'Financial Advisor': 'consultant',
+    'UX Designer': 'ux_designer',
+    'UI Designer': 'ux_designer',
+    'Graphic Designer': 'designer',
+    'Business Analyst': 'analyst',
+    'Financial Analyst': 'analyst',
+    'Operations Analyst': 'analyst',
+    'React Specialist': 'frontend',
+    'Front-End Lead': 'frontend',
+    'Back-End Lead': 'backend',
+    'Full Stack Lead': 'full_stack',
+    # Role rules keep the old if/elif order even when a later rule covers more words
+    'ML Software Engineer': 'machine_learning_engineer',
+    'ML Product Manager': 'machine_learning_engineer',
+    'Senior ML Data Engineer': 'machine_learning_engineer',
+    'ML Backend Engineer': 'machine_learning_engineer',
+    'DevOps Data Engineer': 'devops_engineer',
+    'Operations Manager': None,
+    'Office Manager': None,
+    'General Manager': None,
+    'Chef': None,
+    'Teacher': None,
+    'Nurse': None,
+    'Accountant': None,
+    'Intern': None,
+}
+
+
+# Titles the old substring checks misread: "ai" inside "maintenance" or
+# "chain", "ml" inside "html". Rules now match whole words.
+WHOLE_WORD_CHANGES = {
+    "HTML": None,
+    "HTML Developer": "software_developer",
+    "Maintenance Engineer": "software_developer",
+    "Supply Chain Engineer": "software_developer",
+}
+
+
+@pytest.mark.parametrize("title, slug", sorted(EXPECTED.items()))
+def test_fixture_titles_keep_their_slug(title, slug):
+    assert classify_title(title).slug == slug
+
+
+@pytest.mark.parametrize("title, slug", sorted(WHOLE_WORD_CHANGES.items()))
+def test_rules_match_whole_words(title, slug):
+    assert classify_title(title).slug == slug
+    assert classify_title(title).slug not in ("ai_engineer", "machine_learning_engineer")
+
+
+@pytest.mark.parametrize("title", ["HTML", "Maintenance Engineer", "Supply Chain Engineer"])
+def test_whole_word_changes_reach_the_job_description(title):
+    assert job_description_from_title(title) != job_description_from_title("AI Engineer")
+    assert job_description_from_title(title) != job_description_from_title("ML Engineer")
+
+
+def test_titles_are_normalized_before_matching():
+    assert classify_title("  senior   AI-engineer!! ").slug == classify_title("Senior AI Engineer").slug
+    assert classify_title("Senior AI Engineer").words == frozenset({"senior", "ai", "engineer"})
+
+
+def test_memo_is_bounded():
+    index = TitleIndex([_ROLE_RULES, _FAMILY_RULES, _AREA_RULES])
+    for n in range(_CACHE_SIZE + 10):
+        index.classify(f"Data Scientist {n}")
+    assert len(index._cache) == _CACHE_SIZE
+    assert index.classify("Data Scientist 5").slug == "data_scientist"
@@ -30,35 +30,24 @@ export async function analyzeResume({ jobTitle, jobDescription, file }) {
 }
 
 export async function analyzeCompare({ jobTitle, jobDescription, file1, file2 }) {
-  const fd1 = new FormData()
-  fd1.append('file', file1)
-  fd1.append('job_title', jobTitle)
-  if (jobDescription && jobDescription.trim()) {
-    fd1.append('job_description', jobDescription)
-  }
-
-  const fd2 = new FormData()
-  fd2.append('file', file2)
-  fd2.append('job_title', jobTitle)
+  // One batch request so the job-side analysis is done once for both resumes
+  const fd = new FormData()
+  fd.append('files', file1)
+  fd.append('files', file2)
+  fd.append('job_title', jobTitle)
   if (jobDescription && jobDescription.trim()) {
-    fd2.append('job_description', jobDescription)
+    fd.append('job_description', jobDescription)
   }
 
-  const [res1, res2] = await Promise.all([
-    fetch(`${API_BASE_URL}/analyze`, {
-      method: 'POST',
-      body: fd1
-    }),
-    fetch(`${API_BASE_URL}/analyze`, {
-      method: 'POST',
-      body: fd2
-    })
-  ])
+  const res = await fetch(`${API_BASE_URL}/analyze/batch`, {
+    method: 'POST',
+    body: fd
+  })
 
-  if (!res1.ok) {
-    let msg = 'First resume analysis failed'
+  if (!res.ok) {
+    let msg = 'Comparison failed'
     try {
-      const data = await res1.json()
+      const data = await res.json()
       msg = data?.detail || msg
     } catch {
       // ignore
@@ -66,17 +55,15 @@ export async function analyzeCompare({ jobTitle, jobDescription, file1, file2 })
     throw new Error(msg)
   }
 
-  if (!res2.ok) {
-    let msg = 'Second resume analysis failed'
-    try {
-      const data = await res2.json()
-      msg = data?.detail || msg
-    } catch {
-      // ignore
-    }
-    throw new Error(msg)
+  const { results = [], errors = [] } = await res.json()
+  if (errors.length) {
+    const err = errors[0]
+    throw new Error(err.detail || `${err.index === 0 ? 'First' : 'Second'} resume analysis failed`)
   }
 
-  const [data1, data2] = await Promise.all([res1.json(), res2.json()])
+  const data1 = results.find((r) => r.index === 0)?.result
+  const data2 = results.find((r) => r.index === 1)?.result
+  if (!data1) throw new Error('First resume analysis failed')
+  if (!data2) throw new Error('Second resume analysis failed')
   return { data1, data2 }
 }